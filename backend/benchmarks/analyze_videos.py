@@ -0,0 +1,376 @@
+"""
+Análisis offline de vídeos grabados: línea de tiempo de gestos y rendimiento.
+
+Cada vídeo se divide en tramos de `--chunk-frames` frames que se procesan
+en paralelo en un ProcessPoolExecutor. Cada proceso crea un solo grafo de
+MediaPipe (HandDetector) y un GestureClassifier al arrancar, y por tramo
+devuelve solo arrays compactos (landmarks, lateralidad y la clasificación
+vectorizada de la primera mano). El proceso principal recibe los tramos en
+orden y los pasa por un GestureProcessor por vídeo con el tiempo del vídeo,
+así que la estabilización es la misma que en una sesión en vivo.
+
+Con --record cada vídeo se guarda además como grabación .gesrec para
+probar otros umbrales con replay_session sin volver a ejecutar MediaPipe.
+
+Uso (desde backend/):
+    python -m benchmarks.analyze_videos VIDEO [VIDEO ...] [--workers N] [--chunk-frames 300]
+        [--max-hands 1] [--threshold gesto=valor ...] [--record DIR] [--output resultados.json] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from services.gesture_classifier import GestureClassifier
+from services.gesture_processor import GestureProcessor
+from services.landmarks import NUM_LANDMARKS, DetectedHands
+from services.session_recording import HANDEDNESS_CODES, HANDEDNESS_NAMES, RECORDING_SUFFIX, SessionRecorder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FPS = 30.0
+
+# Estado de cada proceso de trabajo (se crea una vez en _init_worker)
+_detector = None
+_classifier: Optional[GestureClassifier] = None
+_max_hands = 1
+
+
+def probe(path: str) -> Tuple[int, float]:
+    """Número de frames y FPS de un vídeo (FPS por defecto si el contenedor no lo indica)."""
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise RuntimeError(f"No se pudo abrir el vídeo {path!r}")
+    frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = capture.get(cv2.CAP_PROP_FPS) or DEFAULT_FPS
+    capture.release()
+    return max(frames, 0), fps
+
+
+def plan_chunks(paths: Sequence[str], chunk_frames: int,
+                overlap: int = 0) -> Tuple[List[Tuple[int, str, int, Optional[int], int]], List[float]]:
+    """
+    Divide los vídeos en tramos.
+
+    Args:
+        overlap: Frames anteriores al tramo que se detectan sin contarlos,
+            para que el seguimiento de MediaPipe llegue al tramo ya asentado
+
+    Returns:
+        (tramos (vídeo, ruta, primer frame, fin exclusivo o None = hasta el
+        final, frames de solape), FPS de cada vídeo)
+    """
+    chunks = []
+    fps_by_video = []
+    for index, path in enumerate(paths):
+        frames, fps = probe(path)
+        fps_by_video.append(fps)
+        starts = list(range(0, frames, chunk_frames)) or [0]
+        for start in starts:
+            # El último tramo lee hasta el final: el recuento del contenedor puede ser aproximado
+            end = start + chunk_frames if start + chunk_frames < frames else None
+            chunks.append((index, path, start, end, min(overlap, start)))
+    return chunks, fps_by_video
+
+
+def _init_worker(max_hands: int, thresholds: Optional[Dict[str, float]]):
+    """Un grafo de MediaPipe y un clasificador por proceso."""
+    global _detector, _classifier, _max_hands
+    from services.hand_detector import HandDetector  # MediaPipe solo se carga en los procesos de trabajo
+
+    cv2.setNumThreads(1)  # El paralelismo lo dan los procesos
+    logging.basicConfig(level=logging.WARNING)
+    _max_hands = max_hands
+    _detector = HandDetector(max_num_hands=max_hands)
+    _classifier = GestureClassifier(confidence_thresholds=thresholds)
+
+
+def _open_at(path: str, start: int) -> cv2.VideoCapture:
+    capture = cv2.VideoCapture(path)
+    if start:
+        capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+        if int(capture.get(cv2.CAP_PROP_POS_FRAMES)) != start:
+            # El backend no posiciona con exactitud: avanzar frame a frame
+            capture.release()
+            capture = cv2.VideoCapture(path)
+            for _ in range(start):
+                if not capture.grab():
+                    break
+    return capture
+
+
+def process_chunk(chunk: Tuple[int, str, int, Optional[int], int]) -> Dict:
+    """
+    Detecta y clasifica un tramo (se ejecuta en un proceso de trabajo).
+
+    Returns:
+        Diccionario con el vídeo, el primer frame, num_hands (n,), landmarks
+        (n, max_hands, 21, 3) con NaN en manos ausentes, handedness y
+        hand_confidence (n, max_hands), las columnas de `classify_batch` de
+        la primera mano de los frames con manos y el tiempo de proceso
+    """
+    video, path, start, end, overlap = chunk
+    started = time.perf_counter()
+    # Cada tramo empieza sin estado de seguimiento del anterior
+    _detector.reset()
+
+    capture = _open_at(path, start - overlap)
+    frame = None
+    for _ in range(overlap):
+        ok, frame = capture.read(frame)
+        if not ok:
+            break
+        _detector.detect_landmarks(frame)
+
+    landmarks: List[np.ndarray] = []
+    handedness: List[List[int]] = []
+    confidences: List[List[float]] = []
+    num_hands: List[int] = []
+    empty = np.full((_max_hands, NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+
+    position = start
+    while end is None or position < end:
+        ok, frame = capture.read(frame)
+        if not ok:
+            break
+        position += 1
+        hands = _detector.detect_landmarks(frame)
+        count = min(len(hands), _max_hands) if hands else 0
+        num_hands.append(count)
+        row = empty.copy()
+        codes = [-1] * _max_hands
+        scores = [0.0] * _max_hands
+        if count:
+            row[:count] = hands.landmarks[:count]
+            for i in range(count):
+                codes[i] = HANDEDNESS_CODES.get(hands[i].handedness, -1)
+                scores[i] = hands[i].confidence
+        landmarks.append(row)
+        handedness.append(codes)
+        confidences.append(scores)
+    capture.release()
+
+    num_hands_array = np.array(num_hands, dtype=np.uint8)
+    landmarks_array = np.stack(landmarks) if landmarks else empty[np.newaxis][:0]
+    rows = np.flatnonzero(num_hands_array)
+    return {
+        'video': video,
+        'start': start,
+        'num_hands': num_hands_array,
+        'landmarks': landmarks_array,
+        'handedness': np.array(handedness, dtype=np.int8).reshape(-1, _max_hands),
+        'hand_confidence': np.array(confidences, dtype=np.float32).reshape(-1, _max_hands),
+        'rows': rows,
+        'batch': _classifier.classify_batch(landmarks_array[rows, 0]),
+        'seconds': time.perf_counter() - started,
+        'worker': os.getpid()
+    }
+
+
+class TimelineBuilder:
+    """
+    Pasa los frames de un vídeo, en orden, por un GestureProcessor y agrupa
+    los gestos estables en segmentos.
+    """
+
+    def __init__(self, video: str, fps: float, classifier: GestureClassifier,
+                 recorder: Optional[SessionRecorder] = None):
+        self.video = video
+        self.fps = fps
+        self.classifier = classifier
+        self.processor = GestureProcessor()
+        self.recorder = recorder
+        self.segments: List[Dict] = []
+        self._open: Optional[Dict] = None
+        self.frames = 0
+        self.frames_with_hands = 0
+
+    def add_chunk(self, chunk: Dict):
+        """Añade un tramo; los tramos deben llegar en orden."""
+        batch_rows = np.full(len(chunk['num_hands']), -1)
+        batch_rows[chunk['rows']] = np.arange(len(chunk['rows']))
+
+        for i, count in enumerate(chunk['num_hands'].tolist()):
+            frame_index = chunk['start'] + i
+            # Tiempo del vídeo, no del proceso: el resultado no depende de la velocidad
+            timestamp = frame_index / self.fps
+            processed = None
+            classification = None
+            if count:
+                self.frames_with_hands += 1
+                classification = self.classifier.batch_result(chunk['batch'], batch_rows[i])
+                processed = self.processor.process(classification, timestamp=timestamp)
+            self._update(processed, timestamp)
+            if self.recorder:
+                self.recorder.record(timestamp * 1000, frame_index, self._hands(chunk, i, count), classification)
+            self.frames += 1
+
+    @staticmethod
+    def _hands(chunk: Dict, i: int, count: int) -> Optional[DetectedHands]:
+        if not count:
+            return None
+        return DetectedHands(
+            np.ascontiguousarray(chunk['landmarks'][i, :count]),
+            [HANDEDNESS_NAMES.get(int(code), 'Unknown') for code in chunk['handedness'][i, :count]],
+            [float(c) for c in chunk['hand_confidence'][i, :count]]
+        )
+
+    def _update(self, processed: Optional[Dict], timestamp: float):
+        gesture = processed['gesture'] if processed and processed['stable'] else None
+        segment = self._open
+        if segment and segment['gesture'] != gesture:
+            self._close()
+            segment = None
+        if gesture and segment is None:
+            segment = self._open = {'video': self.video, 'gesture': gesture, 'action': processed['action'],
+                                    'start_s': timestamp, 'frames': 0, '_confidence': 0.0}
+        if segment:
+            segment['end_s'] = timestamp + 1 / self.fps
+            segment['frames'] += 1
+            segment['_confidence'] += processed['confidence']
+
+    def _close(self):
+        segment, self._open = self._open, None
+        confidence = segment.pop('_confidence')
+        segment['mean_confidence'] = round(confidence / segment['frames'], 4)
+        segment['start_s'] = round(segment['start_s'], 3)
+        segment['end_s'] = round(segment['end_s'], 3)
+        self.segments.append(segment)
+
+    def finish(self) -> List[Dict]:
+        """Cierra el segmento abierto y devuelve la línea de tiempo."""
+        if self._open:
+            self._close()
+        if self.recorder:
+            self.recorder.close()
+        return self.segments
+
+
+def _map_chunks(chunks, workers: int, max_hands: int, thresholds: Optional[Dict[str, float]]) -> Iterator[Dict]:
+    """Resultados de los tramos en orden (en paralelo salvo con workers=0)."""
+    if workers == 0:
+        _init_worker(max_hands, thresholds)
+        for chunk in chunks:
+            yield process_chunk(chunk)
+        return
+    # spawn: cada proceso carga su propio MediaPipe, sin heredar estado nativo del padre
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                             initializer=_init_worker, initargs=(max_hands, thresholds)) as executor:
+        yield from executor.map(process_chunk, chunks)
+
+
+def run(paths: Sequence[str], workers: Optional[int] = None, chunk_frames: int = 300, max_hands: int = 1,
+        thresholds: Optional[Dict[str, float]] = None, record_dir: Optional[str] = None,
+        overlap: int = 5) -> Dict:
+    """
+    Analiza los vídeos y devuelve la línea de tiempo y el rendimiento.
+
+    Args:
+        paths: Rutas de los vídeos
+        workers: Procesos de trabajo (None = uno por núcleo; 0 = sin pool, en este proceso)
+        chunk_frames: Frames por tramo
+        max_hands: Manos detectadas por frame
+        thresholds: Umbrales del clasificador que se sobrescriben
+        record_dir: Si se indica, guarda una grabación .gesrec por vídeo
+        overlap: Frames de solape entre tramos (ver plan_chunks)
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    classifier = GestureClassifier()
+    if thresholds:
+        classifier.thresholds.update(thresholds)
+
+    start = time.perf_counter()
+    chunks, fps_by_video = plan_chunks(paths, max(1, chunk_frames), max(0, overlap))
+
+    builders = []
+    for index, path in enumerate(paths):
+        recorder = None
+        if record_dir:
+            recorder = SessionRecorder(Path(record_dir) / f"{Path(path).stem}{RECORDING_SUFFIX}", max_hands=max_hands,
+                                       metadata={'video': str(path), 'thresholds': classifier.thresholds})
+        builders.append(TimelineBuilder(str(path), fps_by_video[index], classifier, recorder))
+
+    worker_seconds: Dict[int, float] = {}
+    worker_frames: Dict[int, int] = {}
+    for chunk in _map_chunks(chunks, workers, max_hands, classifier.thresholds):
+        builders[chunk['video']].add_chunk(chunk)
+        worker_seconds[chunk['worker']] = worker_seconds.get(chunk['worker'], 0.0) + chunk['seconds']
+        worker_frames[chunk['worker']] = worker_frames.get(chunk['worker'], 0) + len(chunk['num_hands'])
+
+    timeline = [segment for builder in builders for segment in builder.finish()]
+    elapsed = time.perf_counter() - start
+
+    frames = sum(builder.frames for builder in builders)
+    video_seconds = sum(builder.frames / builder.fps for builder in builders)
+    busy = sum(worker_seconds.values())
+    return {
+        'benchmark': 'analyze_videos',
+        'videos': [{'path': builder.video, 'frames': builder.frames, 'frames_with_hands': builder.frames_with_hands,
+                    'fps': builder.fps, 'segments': len(builder.segments)} for builder in builders],
+        'timeline': timeline,
+        'throughput': {
+            'workers': max(workers, 1),
+            'chunks': len(chunks),
+            'frames': frames,
+            'seconds': round(elapsed, 3),
+            'fps': round(frames / elapsed, 1) if elapsed else 0.0,
+            'video_seconds': round(video_seconds, 3),
+            'realtime_factor': round(video_seconds / elapsed, 2) if elapsed else 0.0,
+            # Fracción del tiempo total que los procesos estuvieron detectando (1.0 = sin esperas)
+            'worker_utilization': round(busy / (elapsed * max(workers, 1)), 3) if elapsed else 0.0,
+            'frames_per_worker': list(worker_frames.values())
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('videos', nargs='+', help='Vídeos a analizar')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos de trabajo (por defecto, uno por núcleo)')
+    parser.add_argument('--chunk-frames', type=int, default=300, help='Frames por tramo')
+    parser.add_argument('--overlap', type=int, default=5,
+                        help='Frames previos que cada tramo detecta sin contarlos (seguimiento asentado)')
+    parser.add_argument('--max-hands', type=int, default=1, help='Manos detectadas por frame')
+    parser.add_argument('--threshold', action='append', default=[], metavar='GESTO=VALOR',
+                        help='Sobrescribe el umbral de un gesto')
+    parser.add_argument('--record', metavar='DIR', help='Guardar una grabación .gesrec por vídeo')
+    parser.add_argument('--output', help='Guardar los resultados JSON en este fichero')
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    thresholds = {}
+    for item in args.threshold:
+        name, value = item.split('=', 1)
+        thresholds[name] = float(value)
+
+    results = run(args.videos, args.workers, args.chunk_frames, args.max_hands, thresholds, args.record, args.overlap)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    for segment in results['timeline']:
+        print(f"{segment['video']}  {segment['start_s']:9.2f}s - {segment['end_s']:9.2f}s  "
+              f"{segment['gesture']:12} {segment['action']:12} conf {segment['mean_confidence']:.2f}")
+    throughput = results['throughput']
+    print(f"\nFrames:            {throughput['frames']} en {throughput['seconds']:.1f} s "
+          f"({throughput['fps']:.0f} frames/s, {throughput['realtime_factor']:.1f}x tiempo real)")
+    print(f"Procesos:          {throughput['workers']} ({throughput['chunks']} tramos, "
+          f"utilización {throughput['worker_utilization']:.0%})")
+
+
+if __name__ == '__main__':
+    main()
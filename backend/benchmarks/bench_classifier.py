@@ -0,0 +1,113 @@
+"""
+Micro-benchmark de GestureClassifier.classify frente al de otra revisión
+del repositorio, y del rendimiento por lotes de classify_batch.
+
+La línea base se lee de git (`git show REV:backend/services/gesture_classifier.py`)
+sin tocar el árbol de trabajo; por defecto es el primer commit, con la
+implementación original (una llamada a np.linalg.norm por dedo y gesto).
+
+Uso (desde backend/):
+    python -m benchmarks.bench_classifier [--hands 2000] [--repeat 5] [--baseline REV] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import time
+import types
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic_hands import random_hands, to_landmark_dicts
+from services.gesture_classifier import GestureClassifier
+
+# Ruta del clasificador respecto a la raíz del repositorio
+CLASSIFIER_PATH = 'backend/services/gesture_classifier.py'
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True, check=True, timeout=10,
+                              cwd=os.path.dirname(__file__)).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        raise RuntimeError(f"No se pudo ejecutar git {' '.join(args)}: {e}")
+
+
+def load_baseline(rev: Optional[str] = None) -> type:
+    """
+    Clase GestureClassifier de la revisión `rev` (por defecto, el primer commit).
+
+    Returns:
+        La clase, cargada en un módulo aparte; sus importaciones relativas
+        se resuelven contra los servicios actuales
+    """
+    rev = rev or _git('rev-list', '--max-parents=0', 'HEAD').split()[-1]
+    source = _git('show', f"{rev}:{CLASSIFIER_PATH}")
+    module = types.ModuleType('baseline_gesture_classifier')
+    module.__package__ = 'services'
+    exec(compile(source, f"{rev}:{CLASSIFIER_PATH}", 'exec'), module.__dict__)
+    return module.GestureClassifier
+
+
+def _best_time(func: Callable, inputs: List, repeat: int) -> float:
+    """Mejor tiempo por llamada (µs) de `func` sobre todas las entradas."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(inputs) * 1e6
+
+
+def run(hands: int = 2000, repeat: int = 5, seed: int = 0, baseline: Optional[str] = None) -> Dict:
+    """Ejecuta el benchmark y devuelve los resultados."""
+    landmarks = [to_landmark_dicts(hand) for hand in random_hands(hands, seed=seed)]
+
+    legacy = load_baseline(baseline)()
+    current = GestureClassifier()
+
+    legacy_us = _best_time(legacy.classify, landmarks, repeat)
+    current_us = _best_time(current.classify, landmarks, repeat)
+    # Lote completo en una sola llamada
+    batch_us = _best_time(current.classify_batch, [random_hands(hands, seed=seed)], repeat) / hands
+
+    return {
+        'benchmark': 'classifier',
+        'hands': hands,
+        'baseline': baseline or 'primer commit',
+        'legacy_us_per_hand': round(legacy_us, 2),
+        'classify_us_per_hand': round(current_us, 2),
+        'speedup': round(legacy_us / current_us, 2),
+        'batch_us_per_hand': round(batch_us, 3),
+        'batch_hands_per_second': round(1e6 / batch_us),
+        'batch_speedup': round(current_us / batch_us, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hands', type=int, default=2000, help='Número de manos sintéticas')
+    parser.add_argument('--repeat', type=int, default=5, help='Repeticiones (se toma la mejor)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline',
+                        help='Revisión de git del clasificador de referencia (por defecto, el primer commit)')
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = run(args.hands, args.repeat, args.seed, args.baseline)
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print(f"Manos: {results['hands']}")
+        print(f"  Base ({results['baseline']}):".ljust(27) + f"{results['legacy_us_per_hand']:8.2f} µs/mano")
+        print(f"  classify vectorizado:    {results['classify_us_per_hand']:8.2f} µs/mano")
+        print(f"  Aceleración:             {results['speedup']:8.2f}x")
+        print(f"  classify_batch:          {results['batch_us_per_hand']:8.3f} µs/mano "
+              f"({results['batch_hands_per_second']} manos/s, {results['batch_speedup']:.1f}x sobre classify)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+"""
+Benchmark de extremo a extremo del pipeline de gestos, por etapas.
+
+Cada frame pasa por GesturePipeline.process_frame, construido con las
+mismas opciones que el servidor (--roi, --keyframes, --motion-gate,
+--max-hands, --dynamic), y las duraciones salen de sus propias marcas
+(`timings`), así que se mide el código que se despliega:
+
+- decode:   decode_image del JPEG recibido
+- gate:     miniatura y comparación del MotionGate (--motion-gate)
+- detect:   MediaPipe vía DetectorPool (sobre el recorte de RoiPreprocessor con --roi)
+- track:    flujo óptico entre frames clave (--keyframes)
+- classify: GestureClassifier (todas las manos en una pasada con --max-hands > 1)
+- process:  GestureProcessor (suavizado y estabilidad) y gestos dinámicos (--dynamic)
+- action:   GesturePipeline.dispatch_action con un controlador simulado
+            (no mueve el ratón, así que funciona en servidores sin pantalla)
+
+Escenarios:
+- frames:    secuencia de manos en movimiento dibujadas (benchmarks.sample_frames)
+             o imágenes propias (--images), a cada resolución indicada
+- landmarks: secuencia de landmarks grabada (--recording) o sintética que
+             sustituye a MediaPipe; solo las etapas posteriores a la detección
+
+Para cada etapa y en total informa p50/p95/p99, media y frames por
+segundo. La salida JSON incluye el entorno y el commit para comparar
+ejecuciones (--compare).
+
+Uso (desde backend/):
+    python -m benchmarks.bench_pipeline [--resolutions 320x240,640x480,1280x720]
+        [--frames 120] [--images DIR] [--recording RUTA.gesrec]
+        [--roi] [--keyframes] [--motion-gate] [--max-hands N] [--dynamic]
+        [--output resultados.json] [--compare base.json] [--json]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from benchmarks.sample_frames import load_images, sample_sequence
+from benchmarks.synthetic_hands import synthetic_sequence
+from services.detector_pool import DetectorPool
+from services.frame_protocol import FramePacket
+from services.gesture_classifier import GestureClassifier
+from services.gesture_pipeline import GesturePipeline
+from services.gesture_processor import GestureProcessor
+from services.landmarks import DetectedHands
+from services.roi_preprocessor import RoiPreprocessor
+from services.keyframe_tracker import KeyframeTracker
+from services.multi_hand import MultiHandProcessor
+from services.dynamic_gestures import DynamicGestureRecognizer
+from services.motion_gate import MotionGate
+from services.session_recording import SessionRecording
+
+# Etapas de GesturePipeline (pipeline_metrics.STAGES) salvo la lectura del mensaje
+STAGES = ('decode', 'gate', 'detect', 'track', 'classify', 'process', 'action')
+LANDMARK_STAGES = ('classify', 'process', 'action')
+DEFAULT_RESOLUTIONS = ((320, 240), (640, 480), (1280, 720))
+
+
+class DryRunController:
+    """Sustituto de SystemController que solo cuenta las acciones (sin pyautogui)."""
+
+    def __init__(self):
+        self.actions = Counter()
+
+    def execute_action(self, action: str, details: Optional[Dict] = None) -> Dict:
+        self.actions[action] += 1
+        return {"success": True, "message": "Simulado"}
+
+
+def summarize(samples_ms: Sequence[float]) -> Dict:
+    """Percentiles, media y FPS equivalentes de una lista de latencias en ms."""
+    if not samples_ms:
+        return {'count': 0}
+    samples = np.asarray(samples_ms)
+    p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+    mean = samples.mean()
+    return {
+        'count': len(samples),
+        'mean_ms': round(float(mean), 4),
+        'p50_ms': round(float(p50), 4),
+        'p95_ms': round(float(p95), 4),
+        'p99_ms': round(float(p99), 4),
+        'max_ms': round(float(samples.max()), 4),
+        'fps': round(1000.0 / mean, 1) if mean > 0 else None
+    }
+
+
+class SequencePool:
+    """Sustituto de DetectorPool que entrega manos ya detectadas, una entrada por frame."""
+
+    def __init__(self, sequence: Sequence[Optional[DetectedHands]]):
+        self._hands = iter(sequence)
+
+    @contextmanager
+    def lease(self, session):
+        yield self
+
+    def detect_landmarks(self, image: np.ndarray) -> Optional[DetectedHands]:
+        return next(self._hands)
+
+    def release_session(self, session):
+        pass
+
+
+def _new_pipeline(pool, roi: bool = False, keyframes: bool = False, motion_gate: bool = False,
+                  max_hands: int = 1, dynamic: bool = False) -> GesturePipeline:
+    """Pipeline con las opciones del servidor (valores por defecto de cada componente)."""
+    processor = GestureProcessor()
+    return GesturePipeline(pool, GestureClassifier(), processor, DryRunController(), include_timings=True,
+                           roi_preprocessor=RoiPreprocessor() if roi else None,
+                           keyframe_tracker=KeyframeTracker() if keyframes else None,
+                           multi_hand=MultiHandProcessor(processor) if max_hands > 1 else None,
+                           dynamic_gestures=DynamicGestureRecognizer() if dynamic else None,
+                           motion_gate=MotionGate() if motion_gate else None)
+
+
+def _scenario(pipeline: GesturePipeline, results: List[Dict], stages: Sequence[str], elapsed: float) -> Dict:
+    """Resumen de un escenario a partir de los `timings` de cada resultado."""
+    timings: Dict[str, List[float]] = {stage: [] for stage in stages + ('total',)}
+    for result in results:
+        for stage, ms in result.get('timings', {}).items():
+            if stage in timings:
+                timings[stage].append(ms)
+    summary = {
+        'frames': len(results),
+        'frames_with_hands': sum(1 for result in results if result.get('hands_detected')),
+        'wall_fps': round(len(results) / elapsed, 1),
+        'actions': dict(pipeline.system_controller.actions),
+        'stages': {stage: summarize(samples) for stage, samples in timings.items()}
+    }
+    components = (('roi', pipeline.roi_preprocessor), ('keyframes', pipeline.keyframe_tracker),
+                  ('motion_gate', pipeline.motion_gate), ('dynamic', pipeline.dynamic_gestures))
+    for name, component in components:
+        if component:
+            summary[name] = component.get_statistics()
+    return summary
+
+
+def bench_frames(pool: DetectorPool, frames: List[bytes], warmup: int = 10, **options) -> Dict:
+    """
+    Ejecuta el pipeline completo sobre frames JPEG.
+
+    Args:
+        options: Opciones de `_new_pipeline` (roi, keyframes, motion_gate, max_hands, dynamic)
+    """
+    # Calentamiento en una sesión aparte: el primer frame activa la detección de palma de
+    # MediaPipe, y así el estado de la sesión medida (gate, frames clave) empieza limpio
+    warm = _new_pipeline(pool, **options)
+    for i, payload in enumerate(frames[:warmup]):
+        warm.process_frame(FramePacket(payload, frame_id=i))
+    warm.close()
+
+    pipeline = _new_pipeline(pool, **options)
+    start = time.perf_counter()
+    results = [pipeline.process_frame(FramePacket(payload, frame_id=i)) for i, payload in enumerate(frames)]
+    elapsed = time.perf_counter() - start
+    pipeline.close()
+    return _scenario(pipeline, results, STAGES, elapsed)
+
+
+def bench_landmarks(sequence: List[Optional[DetectedHands]], max_hands: int = 1, dynamic: bool = False) -> Dict:
+    """Ejecuta el pipeline con landmarks ya detectados en lugar de MediaPipe."""
+    pipeline = _new_pipeline(SequencePool(sequence), max_hands=max_hands, dynamic=dynamic)
+    image = np.zeros((48, 64, 3), np.uint8)
+
+    start = time.perf_counter()
+    results = [pipeline.process_image(image, i) for i in range(len(sequence))]
+    elapsed = time.perf_counter() - start
+    return _scenario(pipeline, results, LANDMARK_STAGES, elapsed)
+
+
+def _landmark_sequence(recording: Optional[str], frames: int, seed: int) -> Tuple[str, List[Optional[DetectedHands]]]:
+    if recording:
+        session = SessionRecording(recording)
+        return str(recording), [session.hands(i) for i in range(len(session))]
+    hands = synthetic_sequence(frames, seed=seed).astype(np.float32)
+    return 'synthetic', [DetectedHands(hand[None], ['Right'], [1.0]) for hand in hands]
+
+
+def environment() -> Dict:
+    """Datos del entorno para comparar ejecuciones entre máquinas y commits."""
+    try:
+        commit = subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True,
+                                text=True, timeout=5, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__,
+        'mediapipe': mp.__version__
+    }
+
+
+def run(resolutions: Sequence[Tuple[int, int]] = DEFAULT_RESOLUTIONS, frames: int = 120, warmup: int = 10,
+        images: Optional[str] = None, recording: Optional[str] = None, seed: int = 0,
+        roi: bool = False, keyframes: bool = False, motion_gate: bool = False, max_hands: int = 1,
+        dynamic: bool = False) -> Dict:
+    """Ejecuta todos los escenarios y devuelve los resultados."""
+    options = {'roi': roi, 'keyframes': keyframes, 'motion_gate': motion_gate, 'max_hands': max_hands,
+               'dynamic': dynamic}
+    results = {
+        'benchmark': 'pipeline',
+        'created_at': time.time(),
+        'environment': environment(),
+        'config': {'frames': frames, 'warmup': warmup, 'images': images, 'recording': recording, 'seed': seed,
+                   **options},
+        'frames': {},
+        'landmarks': None
+    }
+
+    # Mismo pool que el servidor: un detector con GESTURE_MAX_HANDS manos
+    pool = DetectorPool(size=1, max_num_hands=max_hands, min_detection_confidence=0.5)
+    try:
+        for width, height in resolutions:
+            if images:
+                source = load_images(images, (width, height))
+            else:
+                source = sample_sequence(frames, width, height, seed=seed)
+            if not source:
+                raise ValueError(f"No hay imágenes en {images}")
+            results['frames'][f"{width}x{height}"] = bench_frames(pool, source, warmup, **options)
+    finally:
+        pool.close()
+
+    name, sequence = _landmark_sequence(recording, frames * 10, seed)
+    results['landmarks'] = dict(source=name, **bench_landmarks(sequence, max_hands, dynamic))
+    return results
+
+
+def compare(current: Dict, baseline: Dict) -> List[str]:
+    """Líneas con la variación de p50/p95 de cada etapa respecto a una ejecución base."""
+    lines = [f"Base: {baseline['environment'].get('commit')}  Actual: {current['environment'].get('commit')}"]
+    scenarios = [(f"frames {key}", current['frames'][key], baseline['frames'].get(key)) for key in current['frames']]
+    scenarios.append(('landmarks', current['landmarks'], baseline.get('landmarks')))
+
+    for label, now, base in scenarios:
+        if not base:
+            continue
+        for stage, stats in now['stages'].items():
+            before = base['stages'].get(stage, {})
+            if not stats.get('count') or not before.get('count'):
+                continue
+            deltas = [f"{key[:3]} {(stats[key] / before[key] - 1) * 100:+6.1f}%"
+                      for key in ('p50_ms', 'p95_ms') if before[key] > 0]
+            lines.append(f"  {label:20s} {stage:9s} {'  '.join(deltas)}")
+    return lines
+
+
+def _print_scenario(title: str, result: Dict):
+    print(f"{title}: {result['frames']} frames ({result['frames_with_hands']} con mano), "
+          f"{result['wall_fps']:.1f} FPS reales")
+    print(f"  {'etapa':9s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'FPS':>9s}")
+    for stage, stats in result['stages'].items():
+        if stats.get('count'):
+            print(f"  {stage:9s} {stats['p50_ms']:9.3f} {stats['p95_ms']:9.3f} {stats['p99_ms']:9.3f} "
+                  f"{stats['fps']:9.1f}")
+
+
+def _parse_resolution(value: str) -> Tuple[int, int]:
+    width, height = value.lower().split('x')
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resolutions', default=','.join(f"{w}x{h}" for w, h in DEFAULT_RESOLUTIONS),
+                        help='Lista ANCHOxALTO separada por comas')
+    parser.add_argument('--frames', type=int, default=120, help='Frames por resolución')
+    parser.add_argument('--warmup', type=int, default=10, help='Frames de calentamiento (no cuentan)')
+    parser.add_argument('--images', help='Directorio con imágenes propias en lugar de las sintéticas')
+    parser.add_argument('--recording', help='Grabación .gesrec para el escenario de landmarks')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--roi', action='store_true', help='Detectar con RoiPreprocessor (recorte / frame reducido)')
+    parser.add_argument('--keyframes', action='store_true',
+                        help='MediaPipe solo en frames clave, flujo óptico entre ellos (KeyframeTracker)')
+    parser.add_argument('--motion-gate', action='store_true',
+                        help='Omitir la detección en frames sin cambios (MotionGate)')
+    parser.add_argument('--max-hands', type=int, default=1, help='Manos por frame (más de 1: modo multi-mano)')
+    parser.add_argument('--dynamic', action='store_true', help='Reconocer gestos dinámicos (deslizamientos, círculos)')
+    parser.add_argument('--output', help='Guardar los resultados JSON en este fichero')
+    parser.add_argument('--compare', help='Resultados JSON de una ejecución base')
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    resolutions = [_parse_resolution(value) for value in args.resolutions.split(',')]
+    results = run(resolutions, args.frames, args.warmup, args.images, args.recording, args.seed, args.roi,
+                  args.keyframes, args.motion_gate, max(1, args.max_hands), args.dynamic)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for resolution, result in results['frames'].items():
+            _print_scenario(f"Frames {resolution}", result)
+        _print_scenario(f"Landmarks ({results['landmarks']['source']})", results['landmarks'])
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print('\n'.join(compare(results, baseline)), file=sys.stderr if args.json else sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
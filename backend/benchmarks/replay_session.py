@@ -0,0 +1,84 @@
+"""
+Reproduce una grabación de sesión (ver services.session_recording) a través
+de GestureClassifier y GestureProcessor, sin cámara ni MediaPipe.
+
+Informa del rendimiento de la reproducción y de los frames cuya
+clasificación difiere de la grabada (regresiones del clasificador o
+efecto de otros umbrales).
+
+Uso (desde backend/):
+    python -m benchmarks.replay_session RUTA.gesrec [--threshold gesto=valor ...] [--json]
+"""
+import argparse
+import json
+import logging
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from services.gesture_classifier import GestureClassifier
+from services.gesture_processor import GestureProcessor
+from services.session_recording import SessionRecording, replay
+
+
+def run(path: str, thresholds: Optional[Dict[str, float]] = None) -> Dict:
+    """Reproduce la grabación y devuelve el resumen."""
+    recording = SessionRecording(path)
+
+    classifier = GestureClassifier()
+    if thresholds:
+        classifier.thresholds.update(thresholds)
+
+    start = time.perf_counter()
+    mismatches = 0
+    stable_gestures = Counter()
+    for frame in replay(recording, classifier, GestureProcessor()):
+        if frame['classification'] is None:
+            continue
+        if frame['classification']['gesture'] != frame['recorded_gesture']:
+            mismatches += 1
+        if frame['processed']['stable']:
+            stable_gestures[frame['processed']['gesture']] += 1
+    elapsed = time.perf_counter() - start
+
+    frames = len(recording)
+    return {
+        'benchmark': 'replay',
+        'recording': str(path),
+        'frames': frames,
+        'frames_with_hands': int((recording['num_hands'] > 0).sum()),
+        'mismatches': mismatches,
+        'stable_gestures': dict(stable_gestures),
+        'seconds': round(elapsed, 4),
+        'fps': round(frames / elapsed, 1) if elapsed else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='Directorio de la grabación')
+    parser.add_argument('--threshold', action='append', default=[], metavar='GESTO=VALOR',
+                        help='Sobrescribe el umbral de un gesto')
+    parser.add_argument('--json', action='store_true', help='Salida en JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    thresholds = {}
+    for item in args.threshold:
+        name, value = item.split('=', 1)
+        thresholds[name] = float(value)
+
+    results = run(args.path, thresholds)
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print(f"Grabación: {results['recording']}")
+        print(f"  Frames:            {results['frames']} ({results['frames_with_hands']} con manos)")
+        print(f"  Reproducción:      {results['fps']:.0f} frames/s")
+        print(f"  Diferencias:       {results['mismatches']} frames clasificados distinto a la grabación")
+        print(f"  Gestos estables:   {results['stable_gestures']}")
+
+
+if __name__ == '__main__':
+    main()
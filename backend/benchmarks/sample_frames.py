@@ -0,0 +1,90 @@
+"""
+Frames de muestra para benchmarks: manos sintéticas dibujadas como siluetas
+de color piel sobre un fondo liso, a cualquier resolución.
+
+MediaPipe las detecta como manos reales, por lo que sirven para medir la
+detección sin cámara ni imágenes externas. También se pueden cargar
+imágenes propias de un directorio.
+"""
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic_hands import synthetic_sequence
+
+# Pares de landmarks unidos por el dibujo (mismas conexiones que MediaPipe)
+_BONES = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+_PALM = (0, 1, 5, 9, 13, 17)
+
+BACKGROUND_COLOR = (90, 110, 120)   # BGR
+SKIN_COLOR = (140, 170, 220)
+JOINT_COLOR = (130, 160, 210)
+
+
+def render_hand_image(hand: np.ndarray, width: int = 640, height: int = 480) -> np.ndarray:
+    """
+    Dibuja una mano (21, 3) normalizada como imagen BGR.
+
+    Args:
+        hand: Landmarks normalizados de MediaPipe
+        width, height: Resolución de la imagen
+
+    Returns:
+        Imagen BGR uint8
+    """
+    image = np.full((height, width, 3), BACKGROUND_COLOR, dtype=np.uint8)
+    points = (hand[:, :2] * (width, height)).astype(np.int32)
+    # Grosor proporcional a la resolución (referencia: 640 px)
+    thickness = max(2, round(22 * width / 640))
+
+    cv2.fillPoly(image, [points[list(_PALM)]], SKIN_COLOR)
+    for start, end in _BONES:
+        cv2.line(image, tuple(points[start].tolist()), tuple(points[end].tolist()), SKIN_COLOR, thickness)
+    for point in points.tolist():
+        cv2.circle(image, tuple(point), thickness // 2, JOINT_COLOR, -1)
+
+    return cv2.GaussianBlur(image, (5, 5), 0)
+
+
+def encode_jpeg(image: np.ndarray, quality: int = 80) -> bytes:
+    """Comprime una imagen como JPEG (lo que envía el cliente)."""
+    ok, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("No se pudo codificar la imagen")
+    return buffer.tobytes()
+
+
+def sample_sequence(frames: int, width: int, height: int, seed: Optional[int] = 0) -> List[bytes]:
+    """
+    Secuencia de frames JPEG de una mano en movimiento que cambia de gesto.
+
+    Returns:
+        Lista de JPEG, uno por frame
+    """
+    return [encode_jpeg(render_hand_image(hand, width, height))
+            for hand in synthetic_sequence(frames, seed=seed)]
+
+
+def load_images(directory: str, size: Optional[Tuple[int, int]] = None) -> List[bytes]:
+    """
+    Carga imágenes .jpg/.png de un directorio como JPEG, opcionalmente
+    redimensionadas a `size` (ancho, alto).
+    """
+    paths = sorted(p for p in Path(directory).iterdir() if p.suffix.lower() in ('.jpg', '.jpeg', '.png'))
+    images = []
+    for path in paths:
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        if size:
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        images.append(encode_jpeg(image))
+    return images
@@ -0,0 +1,128 @@
+"""
+Generador de poses de mano sintéticas (21 landmarks normalizados de MediaPipe).
+
+Produce manos para cada gesto soportado con ruido, traslación y escala
+aleatorios, además de poses completamente aleatorias. Se usa en pruebas
+y benchmarks donde no hay cámara ni MediaPipe.
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+GESTURE_NAMES = ('index_point', 'fist', 'thumbs_up', 'open_hand', 'pinch')
+
+# Esqueleto de referencia (coordenadas de imagen, Y hacia abajo)
+_WRIST = np.array([0.50, 0.80, 0.0])
+_MCPS = {
+    'index': np.array([0.45, 0.62, -0.02]),
+    'middle': np.array([0.50, 0.60, -0.02]),
+    'ring': np.array([0.55, 0.61, -0.02]),
+    'pinky': np.array([0.59, 0.64, -0.02]),
+}
+_SPREAD = {'index': -0.02, 'middle': 0.0, 'ring': 0.02, 'pinky': 0.04}
+_FINGER_ORDER = ('index', 'middle', 'ring', 'pinky')
+
+
+def _finger(name: str, extended: bool) -> List[np.ndarray]:
+    """Puntos MCP, PIP, DIP y TIP de un dedo extendido o doblado."""
+    mcp = _MCPS[name]
+    if extended:
+        spread = _SPREAD[name]
+        offsets = [(0.0, 0.0), (spread * 0.4, -0.06), (spread * 0.7, -0.10), (spread, -0.14)]
+    else:
+        offsets = [(0.0, 0.0), (0.0, -0.03), (0.0, 0.0), (0.0, 0.03)]
+    return [mcp + np.array([dx, dy, 0.0]) for dx, dy in offsets]
+
+
+def _thumb(pose: str) -> List[np.ndarray]:
+    """Puntos CMC, MCP, IP y TIP del pulgar."""
+    cmc = np.array([0.44, 0.76, -0.01])
+    mcp = np.array([0.40, 0.71, -0.02])
+    if pose == 'up':
+        ip, tip = np.array([0.39, 0.63, -0.02]), np.array([0.38, 0.55, -0.02])
+    elif pose == 'out':
+        ip, tip = np.array([0.36, 0.67, -0.02]), np.array([0.32, 0.63, -0.02])
+    elif pose == 'pinch':
+        ip, tip = np.array([0.41, 0.63, -0.02]), np.array([0.42, 0.49, -0.02])
+    else:  # doblado sobre la palma
+        ip, tip = np.array([0.43, 0.70, -0.02]), np.array([0.47, 0.69, -0.02])
+    return [cmc, mcp, ip, tip]
+
+
+def canonical_hand(gesture: str) -> np.ndarray:
+    """Pose sin ruido de un gesto, como array (21, 3)."""
+    extended = {
+        'index_point': (True, False, False, False),
+        'fist': (False, False, False, False),
+        'thumbs_up': (False, False, False, True),
+        'open_hand': (True, True, True, True),
+        'pinch': (True, True, True, True),
+    }[gesture]
+    thumb_pose = {'thumbs_up': 'up', 'open_hand': 'out', 'pinch': 'pinch'}.get(gesture, 'folded')
+
+    points = [_WRIST] + _thumb(thumb_pose)
+    for name, is_extended in zip(_FINGER_ORDER, extended):
+        points.extend(_finger(name, is_extended))
+
+    hand = np.array(points)
+    if gesture == 'pinch':
+        # Índice curvado hacia el pulgar y el resto de dedos juntos
+        hand[8] = hand[4] + np.array([0.01, 0.0, 0.0])
+        hand[7] = (hand[6] + hand[8]) / 2
+        hand[16] = hand[12] + np.array([0.02, 0.0, 0.0])
+        hand[20] = hand[16] + np.array([0.02, 0.01, 0.0])
+    return hand
+
+
+def random_hands(count: int, seed: Optional[int] = 0, noise: float = 0.01,
+                 random_ratio: float = 0.2) -> np.ndarray:
+    """
+    Genera un lote de manos sintéticas.
+
+    Args:
+        count: Número de manos
+        seed: Semilla del generador aleatorio
+        noise: Desviación del ruido gaussiano por punto
+        random_ratio: Fracción de poses completamente aleatorias
+
+    Returns:
+        Array float64 de forma (count, 21, 3)
+    """
+    rng = np.random.default_rng(seed)
+    hands = np.empty((count, 21, 3))
+    for i in range(count):
+        if rng.random() < random_ratio:
+            hands[i] = rng.random((21, 3))
+            continue
+        hand = canonical_hand(GESTURE_NAMES[rng.integers(len(GESTURE_NAMES))])
+        scale = rng.uniform(0.7, 1.3)
+        shift = np.array([rng.uniform(-0.2, 0.2), rng.uniform(-0.2, 0.1), 0.0])
+        hands[i] = (hand - _WRIST) * scale + _WRIST + shift + rng.normal(0.0, noise, (21, 3))
+    return hands
+
+
+def to_landmark_dicts(hand: np.ndarray) -> List[Dict]:
+    """Convierte una mano (21, 3) al formato de lista de diccionarios de HandDetector."""
+    return [{'x': float(x), 'y': float(y), 'z': float(z)} for x, y, z in hand]
+
+
+def synthetic_sequence(frames: int, seed: Optional[int] = 0, segment: int = 30,
+                       noise: float = 0.004) -> np.ndarray:
+    """
+    Genera una secuencia temporal de una mano: tramos de `segment` frames
+    con el mismo gesto mientras la mano se desplaza suavemente.
+
+    Returns:
+        Array float64 de forma (frames, 21, 3)
+    """
+    rng = np.random.default_rng(seed)
+    hands = np.empty((frames, 21, 3))
+    position = np.zeros(3)
+    velocity = np.zeros(3)
+    for start in range(0, frames, segment):
+        base = canonical_hand(GESTURE_NAMES[rng.integers(len(GESTURE_NAMES))])
+        for i in range(start, min(start + segment, frames)):
+            velocity = 0.9 * velocity + np.array([rng.normal(0.0, 0.002), rng.normal(0.0, 0.002), 0.0])
+            position = np.clip(position + velocity, -0.15, 0.15)
+            hands[i] = base + position + rng.normal(0.0, noise, (21, 3))
+    return hands
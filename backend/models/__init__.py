@@ -5,6 +5,7 @@ from .profile import (
     GestureSettings,
     ActionMapping,
     CalibrationData,
+    CalibrationSamples,
     GestureLog
 )
 
@@ -15,5 +16,6 @@ __all__ = [
     'GestureSettings',
     'ActionMapping',
     'CalibrationData',
+    'CalibrationSamples',
     'GestureLog'
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Dict, Optional
+from typing import Dict, List, Literal, Optional
 from datetime import datetime, timezone
 import uuid
 
@@ -15,6 +15,19 @@ class GestureSettings(BaseModel):
     cursor_sensitivity: float = Field(default=1.0, ge=0.1, le=3.0)
     scroll_sensitivity: float = Field(default=1.0, ge=0.1, le=3.0)
     smoothing_factor: float = Field(default=0.5, ge=0.0, le=1.0)
+    
+    # Filtro de posición del cursor y la pinza (ver services/position_filters.py)
+    position_filter: Literal['ema', 'one_euro', 'kalman'] = Field(default='one_euro')
+    filter_min_cutoff: float = Field(default=1.0, gt=0.0, le=10.0)        # one_euro: corte en reposo (Hz)
+    filter_beta: float = Field(default=20.0, ge=0.0, le=200.0)            # one_euro: aumento del corte con la velocidad
+    filter_process_noise: float = Field(default=1.0, gt=0.0, le=1000.0)   # kalman: ruido de aceleración
+    filter_measurement_noise: float = Field(default=1e-5, gt=0.0, le=0.01)  # kalman: varianza de la medida
+    filter_prediction_ms: float = Field(default=30.0, ge=0.0, le=200.0)   # kalman: horizonte de predicción
+    
+    # Clasificador: reglas geométricas o plantillas calibradas (ver services/template_classifier.py)
+    classifier: Literal['rules', 'templates'] = Field(default='rules')
+    template_max_distance: float = Field(default=1.0, gt=0.0, le=10.0)    # templates: distancia a partir de la cual no vota
+    template_neighbors: int = Field(default=3, ge=1, le=25)               # templates: vecinos que votan
 
 class ActionMapping(BaseModel):
     """Mapeo personalizado de gestos a acciones."""
@@ -71,6 +84,13 @@ class CalibrationData(BaseModel):
     
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class CalibrationSamples(BaseModel):
+    """Muestras de calibración de un gesto (landmarks de 21 puntos por muestra)."""
+    gesture_name: str = Field(min_length=1, max_length=64)
+    action: Optional[str] = None
+    samples: List[List[List[float]]] = Field(min_length=1)
+    confidence: Optional[float] = Field(default=None, ge=0.0, le=1.0)
+
 class GestureLog(BaseModel):
     """Registro de gestos detectados para análisis."""
     model_config = ConfigDict(extra="ignore")
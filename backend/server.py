@@ -1,18 +1,16 @@
 from fastapi import FastAPI, APIRouter, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 import os
 import logging
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 import uuid
 from datetime import datetime, timezone
 import json
-import base64
-import cv2
-import numpy as np
 import asyncio
+import time
 from contextlib import asynccontextmanager
 
 # Importar modelos y servicios
@@ -21,12 +19,38 @@ from models import (
     UserProfileCreate,
     UserProfileUpdate,
     CalibrationData,
+    CalibrationSamples,
     GestureLog
 )
-from services.hand_detector import HandDetector
 from services.gesture_classifier import GestureClassifier
 from services.gesture_processor import GestureProcessor
 from services.system_controller import SystemController
+from services.action_actuator import ActionActuator, ACTIONS
+from services.gesture_pipeline import GesturePipeline
+from services.frame_executor import FrameExecutor
+from services.detector_pool import DetectorPool
+from services.frame_mailbox import FrameMailbox
+from services.overlay_renderer import OverlayRenderer
+from services.session_recording import SessionRecorder, RECORDING_SUFFIX
+from services.pipeline_metrics import StageMetrics, render_prometheus
+from services.roi_preprocessor import RoiPreprocessor
+from services.keyframe_tracker import KeyframeTracker
+from services.multi_hand import MultiHandProcessor, ZoomCombo
+from services.dynamic_gestures import DynamicGestureRecognizer
+from services.motion_gate import MotionGate
+from services.camera_capture import CameraCapture
+from services.position_filters import filter_from_settings
+from services.gesture_log_sink import GestureLogSink, MongoLogBackend, SqliteLogBackend
+from services.profile_cache import ProfileCache
+from services.template_classifier import TemplateClassifier, TemplateLibrary
+from services.frame_protocol import (
+    FramePacket,
+    FrameProtocolError,
+    BINARY_SUBPROTOCOL,
+    negotiate_subprotocol,
+    parse_binary_frame,
+    parse_json_frame
+)
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -37,11 +61,24 @@ MONGODB_AVAILABLE = False
 client = None
 db = None
 
+# Perfiles en caché delante de la colección (TTL + LRU, write-through)
+profile_cache = ProfileCache(db.profiles if db is not None else None,
+                             ttl=float(os.environ.get('GESTURE_PROFILE_CACHE_TTL', 60)),
+                             max_entries=int(os.environ.get('GESTURE_PROFILE_CACHE_SIZE', 256)))
+
+# Plantillas de gestos calibrados por perfil (compartidas por sus sesiones)
+template_library = TemplateLibrary(db.calibrations if db is not None else None)
+
 @asynccontextmanager
 async def lifespan(app):
     # Código que se ejecuta al iniciar
+    await manager.start()
+    if CAPTURE_SOURCE:
+        # Modo quiosco: cámara local desde el arranque
+        await manager.start_capture(CAPTURE_SOURCE, CAPTURE_PROFILE_ID or None)
     yield
-    # Código que se ejecuta al apagar
+    # Código que se ejecuta al apagar (vuelca los registros pendientes)
+    await manager.shutdown()
     logger.info("Servidor apagado")
 
 # Create the main app without a prefix
@@ -92,84 +129,113 @@ async def create_profile(profile_data: UserProfileCreate):
 @api_router.get("/profiles/{profile_id}", response_model=UserProfile)
 async def get_profile(profile_id: str):
     """Obtiene un perfil específico por ID."""
-    profile = await db.profiles.find_one({"id": profile_id}, {"_id": 0})
+    entry = await profile_cache.get(profile_id)
     
-    if not profile:
+    if not entry:
         raise HTTPException(status_code=404, detail="Perfil no encontrado")
     
-    # Convertir timestamps
-    if isinstance(profile.get('created_at'), str):
-        profile['created_at'] = datetime.fromisoformat(profile['created_at'])
-    if isinstance(profile.get('updated_at'), str):
-        profile['updated_at'] = datetime.fromisoformat(profile['updated_at'])
-    
-    return profile
+    # Timestamps ya convertidos al cargar en caché
+    return entry.profile
 
 @api_router.put("/profiles/{profile_id}", response_model=UserProfile)
 async def update_profile(profile_id: str, update_data: UserProfileUpdate):
     """Actualiza un perfil existente."""
-    existing = await db.profiles.find_one({"id": profile_id}, {"_id": 0})
-    
-    if not existing:
-        raise HTTPException(status_code=404, detail="Perfil no encontrado")
-    
     # Actualizar campos
     update_dict = update_data.model_dump(exclude_unset=True)
     update_dict['updated_at'] = datetime.now(timezone.utc).isoformat()
     
-    await db.profiles.update_one(
-        {"id": profile_id},
-        {"$set": update_dict}
-    )
+    # Escritura y lectura del perfil actualizado en un solo viaje; la caché queda al día
+    entry = await profile_cache.update(profile_id, update_dict)
     
-    # Obtener perfil actualizado
-    updated_profile = await db.profiles.find_one({"id": profile_id}, {"_id": 0})
-    
-    # Convertir timestamps
-    if isinstance(updated_profile.get('created_at'), str):
-        updated_profile['created_at'] = datetime.fromisoformat(updated_profile['created_at'])
-    if isinstance(updated_profile.get('updated_at'), str):
-        updated_profile['updated_at'] = datetime.fromisoformat(updated_profile['updated_at'])
+    if not entry:
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
     
-    return updated_profile
+    return entry.profile
 
 @api_router.delete("/profiles/{profile_id}")
 async def delete_profile(profile_id: str):
     """Elimina un perfil."""
-    result = await db.profiles.delete_one({"id": profile_id})
-    
-    if result.deleted_count == 0:
+    if not await profile_cache.delete(profile_id):
         raise HTTPException(status_code=404, detail="Perfil no encontrado")
     
     return {"message": "Perfil eliminado exitosamente"}
 
+@api_router.get("/profiles/{profile_id}/calibration")
+async def get_calibrations(profile_id: str):
+    """Gestos calibrados del perfil (sin las muestras)."""
+    return await template_library.calibrations(profile_id)
+
+@api_router.post("/profiles/{profile_id}/calibration")
+async def add_calibration(profile_id: str, calibration: CalibrationSamples):
+    """
+    Añade muestras de un gesto calibrado. Las sesiones del perfil que usan
+    el clasificador por plantillas lo reconocen desde el siguiente frame.
+    """
+    if calibration.action is not None and calibration.action not in ACTIONS + ('none',):
+        raise HTTPException(status_code=400, detail=f"Acción desconocida: {calibration.action}")
+    if any(len(sample) != 21 or any(len(point) != 3 for point in sample) for sample in calibration.samples):
+        raise HTTPException(status_code=400, detail="Cada muestra debe tener 21 puntos (x, y, z)")
+    
+    return await template_library.add_samples(profile_id, calibration.gesture_name, calibration.samples,
+                                              calibration.action, calibration.confidence)
+
 # ============================================================================
 # ENDPOINTS DE GESTOS Y ESTADÍSTICAS
 # ============================================================================
 
 @api_router.get("/gestures/stats")
-async def get_gesture_stats(profile_id: str = None):
-    """Obtiene estadísticas de gestos detectados."""
-    query = {}
-    if profile_id:
-        query["profile_id"] = profile_id
-    
-    logs = await db.gesture_logs.find(query, {"_id": 0}).to_list(1000)
-    
-    # Calcular estadísticas
-    gesture_counts = {}
-    total_count = len(logs)
-    
-    for log in logs:
-        gesture = log.get('gesture', 'unknown')
-        gesture_counts[gesture] = gesture_counts.get(gesture, 0) + 1
-    
+async def get_gesture_stats(profile_id: str = None, start: datetime = None, end: datetime = None):
+    """
+    Obtiene estadísticas de gestos detectados en [start, end) a partir de los
+    agregados por minuto y hora (los registros aún en el buffer no cuentan).
+    """
+    backend = manager.log_sink.backend
+    stats = await backend.stats(profile_id,
+                                start.timestamp() if start else None,
+                                end.timestamp() if end else None)
+    stats["recent_logs"] = await backend.recent(profile_id, 20)  # Últimos 20
+    return stats
+
+@api_router.get("/pipeline/status")
+async def get_pipeline_status():
+    """Estado del pool de procesamiento de frames."""
     return {
-        "total_gestures": total_count,
-        "gesture_counts": gesture_counts,
-        "recent_logs": logs[-20:]  # Últimos 20
+        "active_connections": len(manager.active_connections),
+        "executor": manager.executor.get_statistics(),
+        "detector_pool": manager.detector_pool.get_statistics() if manager.detector_pool else None,
+        "sessions": manager.get_session_statistics(),
+        "stages": manager.metrics.get_statistics(),
+        "actuator": manager.actuator.get_statistics() if manager.actuator else None,
+        "gesture_logs": manager.log_sink.get_statistics() if manager.log_sink else None,
+        "profile_cache": profile_cache.get_statistics(),
+        "capture": manager.capture.get_statistics() if manager.capture else None
     }
 
+@api_router.post("/capture/start")
+async def start_capture(source: str = "0", profile_id: str = None):
+    """
+    Inicia la captura local en el servidor (índice de cámara o ruta de
+    vídeo). Los frames no pasan por el navegador ni el WebSocket.
+    """
+    try:
+        capture = await manager.start_capture(source, profile_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return capture.get_statistics()
+
+@api_router.post("/capture/stop")
+async def stop_capture():
+    """Detiene la captura local."""
+    stats = await manager.stop_capture()
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No hay captura local activa")
+    return stats
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Métricas del pipeline en formato de exposición de Prometheus."""
+    return PlainTextResponse(manager.render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @api_router.get("/")
 async def root():
     """Endpoint de salud de la API."""
@@ -186,165 +252,426 @@ async def root():
 class ConnectionManager:
     """Gestiona las conexiones WebSocket activas."""
     
-    def __init__(self):
+    def __init__(self, executor: FrameExecutor):
         self.active_connections: List[WebSocket] = []
-        self.detectors: dict = {}  # websocket -> (detector, classifier, processor, system_controller)
+        self.pipelines: dict = {}  # websocket -> GesturePipeline
+        self.mailboxes: dict = {}  # websocket -> FrameMailbox
+        self.send_locks: dict = {}  # websocket -> asyncio.Lock
+        self.executor = executor
+        
+        # Métricas globales; los contadores de frames acumulan las sesiones ya cerradas
+        self.metrics = StageMetrics()
+        self.closed_frame_counts = {'received': 0, 'processed': 0, 'dropped_superseded': 0, 'dropped_stale': 0}
+        
+        # Recursos compartidos por todas las sesiones (se crean en start)
+        self.detector_pool: DetectorPool = None
+        self.system_controller: SystemController = None
+        self.actuator: ActionActuator = None
+        self.log_sink: GestureLogSink = None
+        self.capture: Optional[CameraCapture] = None
     
-    async def connect(self, websocket: WebSocket, profile_id: str = None):
-        await websocket.accept()
+    async def start(self):
+        """Crea y precalienta el pool de detectores antes de aceptar conexiones."""
+        pool_size = DETECTOR_POOL_SIZE or self.executor.max_workers
+        loop = asyncio.get_running_loop()
+        
+        def build_pool():
+            pool = DetectorPool(size=pool_size, max_num_hands=MAX_HANDS, min_detection_confidence=0.5)
+            pool.warm_up()
+            return pool
+        
+        self.detector_pool = await loop.run_in_executor(None, build_pool)
+        self.system_controller = SystemController()
+        # Las acciones se ejecutan en el hilo del actuador, no en los de trabajo
+        self.actuator = ActionActuator(self.system_controller, max_queue=ACTUATOR_MAX_QUEUE)
+        
+        # Registros de gestos: MongoDB si está disponible, si no SQLite local
+        backend = MongoLogBackend(db.gesture_logs) if MONGODB_AVAILABLE else SqliteLogBackend(LOG_DB_PATH)
+        self.log_sink = GestureLogSink(backend, max_buffer=LOG_MAX_BUFFER, batch_size=LOG_BATCH_SIZE,
+                                       flush_interval=LOG_FLUSH_INTERVAL)
+        self.log_sink.start()
+    
+    async def shutdown(self):
+        """Libera los recursos compartidos."""
+        await self.stop_capture()
+        self.executor.shutdown()
+        if self.log_sink:
+            await self.log_sink.close()
+        if self.actuator:
+            self.actuator.close()
+        if self.detector_pool:
+            self.detector_pool.close()
+    
+    async def connect(self, websocket: WebSocket, profile_id: str = None, subprotocol: str = None,
+                      overlay_fps: float = 0.0, include_landmarks: bool = False, record: bool = False,
+                      include_timings: bool = False):
+        await websocket.accept(subprotocol=subprotocol)
         self.active_connections.append(websocket)
         
-        # Cargar configuración del perfil si existe
-        thresholds = None
-        smoothing = 0.5
+        overlay_renderer = OverlayRenderer(max_fps=min(overlay_fps, MAX_OVERLAY_FPS)) if overlay_fps > 0 else None
+        pipeline = await self.create_pipeline(profile_id, overlay_renderer=overlay_renderer,
+                                              include_landmarks=include_landmarks,
+                                              include_timings=include_timings)
+        
+        if record:
+            if RECORDINGS_DIR:
+                name = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}_{pipeline.session_id}{RECORDING_SUFFIX}"
+                pipeline.recorder = SessionRecorder(Path(RECORDINGS_DIR) / name,
+                                                    metadata={'profile_id': profile_id,
+                                                              'thresholds': pipeline.classifier.thresholds})
+            else:
+                logger.warning("Grabación solicitada pero GESTURE_RECORDINGS_DIR no está configurado")
+        
+        self.pipelines[websocket] = pipeline
+        self.mailboxes[websocket] = FrameMailbox(max_age_ms=MAX_FRAME_AGE_MS)
+        self.send_locks[websocket] = asyncio.Lock()
         
-        if profile_id:
-            profile = await db.profiles.find_one({"id": profile_id}, {"_id": 0})
-            if profile and 'gesture_settings' in profile:
-                settings = profile['gesture_settings']
-                thresholds = {
-                    'index_point': settings.get('index_point_threshold', 0.85),
-                    'fist': settings.get('fist_threshold', 0.80),
-                    'thumbs_up': settings.get('thumbs_up_threshold', 0.75),
-                    'open_hand': settings.get('open_hand_threshold', 0.70),
-                    'pinch': settings.get('pinch_threshold', 0.65)
-                }
-                smoothing = settings.get('smoothing_factor', 0.5)
+        protocol_name = 'binario' if subprotocol == BINARY_SUBPROTOCOL else 'JSON'
+        logger.info(f"Cliente conectado (protocolo {protocol_name}). Total: {len(self.active_connections)}")
+    
+    async def create_pipeline(self, profile_id: str = None, **options) -> GesturePipeline:
+        """
+        Crea el pipeline de una sesión con la configuración del perfil.
+        
+        Args:
+            profile_id: Perfil cuyos umbrales y filtros se usan (opcional)
+            **options: Argumentos adicionales de GesturePipeline (overlay, landmarks...)
+        """
+        # Configuración del perfil (umbrales ya extraídos) desde la caché
+        entry = await profile_cache.get(profile_id) if profile_id else None
+        thresholds = entry.thresholds if entry else None
+        settings = entry.settings if entry else None
         
-        # Crear instancias de los servicios
-        detector = HandDetector(max_num_hands=1, min_detection_confidence=0.5)
+        # Estado ligero de la sesión; el detector y el controlador son compartidos
         classifier = GestureClassifier(confidence_thresholds=thresholds)
-        processor = GestureProcessor(smoothing_factor=smoothing)
-        system_controller = SystemController()
+        if settings and settings.get('classifier') == 'templates':
+            # Gestos calibrados del perfil; las manos sin plantilla cercana usan las reglas
+            classifier = TemplateClassifier(await template_library.get(profile_id), classifier,
+                                            k=settings.get('template_neighbors', 3),
+                                            max_distance=settings.get('template_max_distance', 1.0))
+        processor = GestureProcessor(position_filter=filter_from_settings(settings))
+        
+        return GesturePipeline(self.detector_pool, classifier, processor,
+                               self.actuator, profile_id,
+                               global_metrics=self.metrics,
+                               session_id=uuid.uuid4().hex[:8],
+                               roi_preprocessor=RoiPreprocessor(search_size=ROI_SEARCH_SIZE) if ROI_ENABLED else None,
+                               keyframe_tracker=KeyframeTracker(max_interval=KEYFRAME_MAX_INTERVAL) if KEYFRAMES_ENABLED else None,
+                               multi_hand=MultiHandProcessor(processor, ZoomCombo(step=ZOOM_STEP)) if MAX_HANDS > 1 else None,
+                               dynamic_gestures=DynamicGestureRecognizer() if DYNAMIC_GESTURES_ENABLED else None,
+                               motion_gate=MotionGate(motion_threshold=MOTION_GATE_THRESHOLD,
+                                                      idle_after=MOTION_GATE_IDLE_AFTER,
+                                                      idle_probe_ms=MOTION_GATE_IDLE_PROBE_MS,
+                                                      max_staleness_ms=MOTION_GATE_MAX_STALENESS_MS) if MOTION_GATE_ENABLED else None,
+                               **options)
+    
+    async def start_capture(self, source, profile_id: str = None) -> CameraCapture:
+        """
+        Inicia la captura local (sustituye a la que hubiera). Los resultados
+        no se envían a ningún cliente: ejecutan las acciones y se registran.
+        """
+        await self.stop_capture()
+        pipeline = await self.create_pipeline(profile_id)
+        loop = asyncio.get_running_loop()
+        
+        def on_result(result: dict):
+            # Hilo de procesamiento de la captura: el registro se hace en el event loop
+            if should_log(result):
+                asyncio.run_coroutine_threadsafe(self.log_result(pipeline, result), loop)
         
-        self.detectors[websocket] = (detector, classifier, processor, system_controller, profile_id)
+        def open_capture():
+            return CameraCapture(source, pipeline, on_result=on_result, slots=CAPTURE_SLOTS,
+                                 width=CAPTURE_WIDTH or None, height=CAPTURE_HEIGHT or None)
         
-        logger.info(f"Cliente conectado. Total: {len(self.active_connections)}")
+        try:
+            # Abrir la cámara puede tardar; no bloquear el event loop
+            self.capture = await loop.run_in_executor(None, open_capture)
+        except Exception:
+            pipeline.close()
+            raise
+        self.capture.start()
+        return self.capture
+    
+    async def stop_capture(self) -> Optional[dict]:
+        """Detiene la captura local. Devuelve sus estadísticas finales, o None si no había."""
+        capture, self.capture = self.capture, None
+        if capture is None:
+            return None
+        await asyncio.get_running_loop().run_in_executor(None, capture.stop)
+        return capture.get_statistics()
     
-    def disconnect(self, websocket: WebSocket):
+    async def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
         
-        if websocket in self.detectors:
-            detector, _, _, _, _ = self.detectors[websocket]
-            detector.close()
-            del self.detectors[websocket]
+        mailbox = self.mailboxes.pop(websocket, None)
+        if mailbox:
+            mailbox.close()
+            stats = mailbox.get_statistics()
+            for key in self.closed_frame_counts:
+                self.closed_frame_counts[key] += stats[key]
+            logger.info(f"Frames de la sesión: {stats['received']} recibidos, {stats['processed']} procesados, "
+                        f"{stats['dropped_superseded']} sustituidos, {stats['dropped_stale']} caducados")
+        self.send_locks.pop(websocket, None)
+        
+        if websocket in self.pipelines:
+            pipeline = self.pipelines.pop(websocket)
+            # Cerrar en el pool, después de cualquier frame pendiente de la sesión
+            await self.executor.submit(websocket, pipeline.close)
+        self.executor.release_session(websocket)
         
         logger.info(f"Cliente desconectado. Total: {len(self.active_connections)}")
     
-    async def process_frame(self, websocket: WebSocket, frame_data: dict):
+    async def receive_frames(self, websocket: WebSocket):
+        """Lee mensajes del socket sin esperar al procesamiento y los deja en el buzón."""
+        mailbox = self.mailboxes[websocket]
+        pipeline = self.pipelines[websocket]
+        try:
+            while True:
+                # Recibir datos del cliente (texto o binario)
+                message = await websocket.receive()
+                if message['type'] == 'websocket.disconnect':
+                    break
+                
+                start = time.perf_counter()
+                try:
+                    if message.get('bytes') is not None:
+                        packet = parse_binary_frame(message['bytes'])
+                    else:
+                        packet = parse_json_frame(json.loads(message['text']))
+                except (FrameProtocolError, ValueError) as e:
+                    await self.send_json(websocket, {"error": f"Mensaje inválido: {e}"})
+                    continue
+                pipeline.observe({'parse': time.perf_counter() - start})
+                
+                mailbox.put(packet)
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.error(f"Error recibiendo frames: {e}")
+        finally:
+            mailbox.close()
+    
+    async def send_json(self, websocket: WebSocket, data: dict):
+        """Envía un mensaje serializando los envíos de la sesión."""
+        lock = self.send_locks.get(websocket)
+        if lock is None:
+            return
+        async with lock:
+            await websocket.send_json(data)
+    
+    def get_session_statistics(self) -> List[dict]:
+        """Contadores de frames por sesión activa."""
+        sessions = []
+        for ws, mailbox in self.mailboxes.items():
+            pipeline = self.pipelines.get(ws)
+            stats = {"session_id": pipeline.session_id if pipeline else None,
+                     "profile_id": pipeline.profile_id if pipeline else None,
+                     **mailbox.get_statistics()}
+            if pipeline and pipeline.roi_preprocessor:
+                stats["roi"] = pipeline.roi_preprocessor.get_statistics()
+            if pipeline and pipeline.keyframe_tracker:
+                stats["keyframes"] = pipeline.keyframe_tracker.get_statistics()
+            if pipeline and pipeline.multi_hand:
+                stats["hands"] = pipeline.multi_hand.get_statistics()
+            if pipeline and pipeline.dynamic_gestures:
+                stats["dynamic_gestures"] = pipeline.dynamic_gestures.get_statistics()
+            if pipeline and pipeline.motion_gate:
+                stats["motion_gate"] = pipeline.motion_gate.get_statistics()
+            sessions.append(stats)
+        return sessions
+    
+    def render_metrics(self) -> str:
+        """Histogramas por etapa (globales y por sesión), sesiones, colas y frames descartados."""
+        sessions = [(ws, self.pipelines[ws], mailbox) for ws, mailbox in self.mailboxes.items() if ws in self.pipelines]
+        
+        frame_counts = dict(self.closed_frame_counts)
+        for _, _, mailbox in sessions:
+            for key in frame_counts:
+                frame_counts[key] += getattr(mailbox, key)
+        
+        executor_stats = self.executor.get_statistics()
+        gauges = [
+            ('gesture_active_sessions', 'gauge', 'Sesiones WebSocket activas', len(self.active_connections), None),
+            ('gesture_executor_workers', 'gauge', 'Hilos de trabajo', executor_stats['workers'], None),
+            ('gesture_executor_queue_depth', 'gauge', 'Frames esperando un hilo de trabajo', executor_stats['queue_depth'], None),
+            ('gesture_executor_in_flight', 'gauge', 'Frames admitidos en el pool', executor_stats['in_flight'], None),
+            ('gesture_executor_failed_total', 'counter', 'Tareas del pool con error', executor_stats['failed'], None),
+            ('gesture_frames_received_total', 'counter', 'Frames recibidos', frame_counts['received'], None),
+            ('gesture_frames_processed_total', 'counter', 'Frames procesados', frame_counts['processed'], None),
+            ('gesture_frames_dropped_total', 'counter', 'Frames descartados sin procesar',
+             frame_counts['dropped_superseded'], {'reason': 'superseded'}),
+            ('gesture_frames_dropped_total', 'counter', 'Frames descartados sin procesar',
+             frame_counts['dropped_stale'], {'reason': 'stale'}),
+        ]
+        for _, pipeline, mailbox in sessions:
+            gauges.append(('gesture_session_pending_frames', 'gauge', 'Frames pendientes en el buzón de la sesión',
+                           mailbox.pending, {'session': pipeline.session_id}))
+        for _, pipeline, mailbox in sessions:
+            gauges.append(('gesture_session_frames_dropped_total', 'counter', 'Frames descartados por sesión',
+                           mailbox.dropped, {'session': pipeline.session_id}))
+        for _, pipeline, _ in sessions:
+            if pipeline.motion_gate:
+                gauges.append(('gesture_session_detection_skip_ratio', 'gauge',
+                               'Fracción de frames que no pasaron por MediaPipe (MotionGate)',
+                               pipeline.motion_gate.get_statistics()['skip_ratio'], {'session': pipeline.session_id}))
+        if self.detector_pool:
+            pool_stats = self.detector_pool.get_statistics()
+            gauges.append(('gesture_detector_pool_size', 'gauge', 'Detectores MediaPipe del pool', pool_stats['size'], None))
+            gauges.append(('gesture_detector_pool_available', 'gauge', 'Detectores libres', pool_stats['available'], None))
+        
+        histograms = []
+        if self.actuator:
+            gauges.append(('gesture_actuator_pending', 'gauge', 'Acciones en la cola del actuador', self.actuator.pending, None))
+            gauges.append(('gesture_actuator_coalesced_total', 'counter', 'Movimientos del cursor fusionados',
+                           self.actuator.coalesced, None))
+            gauges.append(('gesture_actuator_dropped_total', 'counter', 'Acciones descartadas con la cola llena',
+                           self.actuator.dropped, None))
+            histograms = self.actuator.histograms()
+        
+        session_metrics = [({'session': pipeline.session_id}, pipeline.stage_metrics) for _, pipeline, _ in sessions]
+        return render_prometheus(self.metrics, session_metrics, gauges, histograms)
+    
+    async def process_frame(self, websocket: WebSocket, packet: FramePacket):
         """Procesa un frame y detecta gestos."""
-        if websocket not in self.detectors:
+        if websocket not in self.pipelines:
             return {"error": "Detector no inicializado"}
         
-        detector, classifier, processor, system_controller, profile_id = self.detectors[websocket]
+        pipeline = self.pipelines[websocket]
         
         try:
-            # Decodificar imagen base64
-            image_data = base64.b64decode(frame_data['image'].split(',')[1] if ',' in frame_data['image'] else frame_data['image'])
-            nparr = np.frombuffer(image_data, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if image is None:
-                return {"error": "No se pudo decodificar la imagen"}
-            
-            # Detectar manos
-            hands_data, annotated_image = detector.detect(image)
-            
-            if not hands_data:
-                return {
-                    "gesture": "none",
-                    "action": "none",
-                    "confidence": 0.0,
-                    "hands_detected": 0
-                }
-            
-            # Clasificar gesto de la primera mano
-            hand = hands_data[0]
-            gesture_result = classifier.classify(hand['landmarks'])
-            
-            # Procesar con suavizado
-            processed = processor.process(gesture_result)
-            
-            # Ejecutar acción del sistema si el gesto es estable
-            if processed['stable'] and processed['action'] != 'none':
-                action_details = {}
-                
-                # Preparar detalles según el tipo de acción
-                if processed['action'] == 'move_cursor':
-                    # Normalizar la posición del índice para mover el cursor
-                    index_tip = hand['landmarks'][8]  # Punta del índice
-                    # Convertir coordenadas de la imagen a coordenadas normalizadas (0-1)
-                    h, w, _ = image.shape
-                    action_details['position'] = (index_tip[0] / w, index_tip[1] / h)
-                elif processed['action'] == 'scroll':
-                    # Determinar dirección del scroll basado en la posición de la mano
-                    palm_y = hand['landmarks'][0][1]  # Centro de la palma
-                    prev_y = processor.get_previous_position()[1] if processor.get_previous_position() else palm_y
-                    action_details['direction'] = 'up' if palm_y < prev_y else 'down'
-                
-                # Ejecutar la acción correspondiente
-                system_controller.execute_action(processed['action'], action_details)
+            # Decodificación, detección y clasificación fuera del event loop
+            result = await self.executor.submit(websocket, pipeline.process_frame, packet)
             
             # Guardar log si es un gesto válido y cambió
-            if processed['stable'] and processed['gesture_changed'] and processed['gesture'] != 'unknown':
-                log = GestureLog(
-                    profile_id=profile_id,
-                    gesture=processed['gesture'],
-                    confidence=processed['confidence'],
-                    action=processed['action']
-                )
-                
-                log_doc = log.model_dump()
-                log_doc['timestamp'] = log_doc['timestamp'].isoformat()
-                
-                # Guardar de forma asíncrona sin bloquear
-                asyncio.create_task(db.gesture_logs.insert_one(log_doc))
+            if should_log(result):
+                await self.log_result(pipeline, result)
             
-            return {
-                "gesture": processed['gesture'],
-                "action": processed['action'],
-                "confidence": processed['confidence'],
-                "stable": processed['stable'],
-                "gesture_changed": processed['gesture_changed'],
-                "duration": processed['duration'],
-                "details": processed.get('details', {}),
-                "hands_detected": len(hands_data),
-                "handedness": hand['handedness']
-            }
+            return result
             
         except Exception as e:
             logger.error(f"Error procesando frame: {e}")
             return {"error": str(e)}
+    
+    async def log_result(self, pipeline: GesturePipeline, result: dict):
+        """Registra un gesto confirmado."""
+        log = GestureLog(
+            profile_id=pipeline.profile_id,
+            gesture=result['gesture'],
+            confidence=result['confidence'],
+            action=result['action'],
+            session_id=pipeline.session_id
+        )
+        
+        log_doc = log.model_dump()
+        log_doc['timestamp'] = log_doc['timestamp'].isoformat()
+        
+        # Escritura diferida por lotes; solo espera si el buffer está lleno
+        await self.log_sink.put(log_doc)
+
+def should_log(result: dict) -> bool:
+    """Solo se registran los gestos válidos y estables en el frame en que cambian."""
+    return bool(result.get('stable') and result.get('gesture_changed') and result['gesture'] != 'unknown')
 
-manager = ConnectionManager()
+# Antigüedad máxima (ms) de un frame antes de descartarlo sin procesarlo
+MAX_FRAME_AGE_MS = float(os.environ.get('GESTURE_MAX_FRAME_AGE_MS', 500))
+# Detectores de MediaPipe compartidos (0 = uno por hilo de trabajo)
+DETECTOR_POOL_SIZE = int(os.environ.get('GESTURE_DETECTORS', 0))
+# Frecuencia máxima de la imagen anotada para clientes de depuración
+MAX_OVERLAY_FPS = 5.0
+# Acciones del sistema pendientes como máximo en la cola del actuador
+ACTUATOR_MAX_QUEUE = int(os.environ.get('GESTURE_ACTUATOR_MAX_QUEUE', 32))
+# Recorte alrededor de la mano seguida y reducción del frame antes de MediaPipe
+ROI_ENABLED = os.environ.get('GESTURE_ROI', '0').lower() in ('1', 'true', 'yes')
+# Lado mayor (px) del frame reducido cuando no hay mano seguida
+ROI_SEARCH_SIZE = int(os.environ.get('GESTURE_ROI_SEARCH_SIZE', 480))
+# MediaPipe solo en frames clave; entre ellos los landmarks se propagan con flujo óptico
+KEYFRAMES_ENABLED = os.environ.get('GESTURE_KEYFRAMES', '0').lower() in ('1', 'true', 'yes')
+# Máximo de frames entre dos detecciones de MediaPipe
+KEYFRAME_MAX_INTERVAL = int(os.environ.get('GESTURE_KEYFRAME_MAX_INTERVAL', 4))
+# Manos detectadas por frame (más de una activa el modo multi-mano y los combos de dos manos)
+MAX_HANDS = max(1, int(os.environ.get('GESTURE_MAX_HANDS', 1)))
+# Cambio relativo de distancia entre las dos pinzas que produce un paso de zoom
+ZOOM_STEP = float(os.environ.get('GESTURE_ZOOM_STEP', 0.15))
+# Gestos dinámicos (deslizamientos y círculos) sobre la trayectoria de la mano principal
+DYNAMIC_GESTURES_ENABLED = os.environ.get('GESTURE_DYNAMIC', '1').lower() in ('1', 'true', 'yes')
+# Omitir MediaPipe en frames sin cambios y sondear a baja frecuencia sin nadie delante de la cámara
+MOTION_GATE_ENABLED = os.environ.get('GESTURE_MOTION_GATE', '0').lower() in ('1', 'true', 'yes')
+# Cambio de una celda de la miniatura (niveles de gris) que cuenta como movimiento
+MOTION_GATE_THRESHOLD = float(os.environ.get('GESTURE_MOTION_GATE_THRESHOLD', 8.0))
+# Detecciones seguidas sin mano antes del modo de sondeo e intervalo entre sondeos (ms)
+MOTION_GATE_IDLE_AFTER = int(os.environ.get('GESTURE_MOTION_GATE_IDLE_AFTER', 15))
+MOTION_GATE_IDLE_PROBE_MS = float(os.environ.get('GESTURE_MOTION_GATE_IDLE_PROBE_MS', 250))
+# Antigüedad máxima (ms) de unas manos reutilizadas
+MOTION_GATE_MAX_STALENESS_MS = float(os.environ.get('GESTURE_MOTION_GATE_MAX_STALENESS_MS', 500))
+# Base SQLite de registros de gestos cuando no hay MongoDB
+LOG_DB_PATH = os.environ.get('GESTURE_LOG_DB', str(ROOT_DIR / 'data' / 'gesture_logs.db'))
+# Registros pendientes como máximo, registros por lote y segundos máximos entre volcados
+LOG_MAX_BUFFER = int(os.environ.get('GESTURE_LOG_MAX_BUFFER', 1000))
+LOG_BATCH_SIZE = int(os.environ.get('GESTURE_LOG_BATCH_SIZE', 100))
+LOG_FLUSH_INTERVAL = float(os.environ.get('GESTURE_LOG_FLUSH_INTERVAL', 1.0))
+# Captura local en el servidor al arrancar: índice de cámara o ruta de vídeo (vacío = deshabilitada)
+CAPTURE_SOURCE = os.environ.get('GESTURE_CAPTURE_SOURCE', '')
+CAPTURE_PROFILE_ID = os.environ.get('GESTURE_CAPTURE_PROFILE_ID', '')
+# Frames preasignados del anillo de captura y resolución pedida a la cámara (0 = la de la cámara)
+CAPTURE_SLOTS = int(os.environ.get('GESTURE_CAPTURE_SLOTS', 4))
+CAPTURE_WIDTH = int(os.environ.get('GESTURE_CAPTURE_WIDTH', 0))
+CAPTURE_HEIGHT = int(os.environ.get('GESTURE_CAPTURE_HEIGHT', 0))
+# Directorio de grabaciones de sesión (vacío = grabación deshabilitada)
+RECORDINGS_DIR = os.environ.get('GESTURE_RECORDINGS_DIR', '')
+
+manager = ConnectionManager(FrameExecutor(
+    max_workers=int(os.environ.get('GESTURE_WORKERS', 0)) or None,
+    max_queue=int(os.environ.get('GESTURE_MAX_QUEUE', 0)) or None
+))
 
 @app.websocket("/ws/gestures")
-async def websocket_gesture_detection(websocket: WebSocket, profile_id: str = None):
+async def websocket_gesture_detection(websocket: WebSocket, profile_id: str = None, overlay_fps: float = 0.0,
+                                      landmarks: bool = False, record: bool = False, timings: bool = False):
     """
     WebSocket para detección de gestos en tiempo real.
     
-    El cliente envía frames en base64 y recibe resultados de detección.
+    El formato se negocia en el handshake mediante Sec-WebSocket-Protocol:
+    con el subprotocolo binario el cliente envía mensajes binarios
+    (cabecera fija + bytes JPEG/PNG); sin subprotocolo se mantiene el
+    formato JSON heredado con la imagen en base64. Las respuestas son JSON.
+    
+    Los clientes de depuración pueden pedir la imagen anotada con
+    `overlay_fps` (> 0); se adjunta como data URL en el campo `overlay`.
+    Con `landmarks=true` el resultado incluye los puntos de cada mano.
+    Con `record=true` (y GESTURE_RECORDINGS_DIR configurado) la sesión se
+    graba en disco para reproducirla después sin cámara. Con `timings=true`
+    el resultado incluye la duración de cada etapa en ms.
     """
-    await manager.connect(websocket, profile_id)
+    subprotocol = negotiate_subprotocol(websocket.scope.get('subprotocols', []))
+    await manager.connect(websocket, profile_id, subprotocol=subprotocol, overlay_fps=overlay_fps,
+                          include_landmarks=landmarks, record=record, include_timings=timings)
+    
+    # La recepción corre en paralelo y deja solo el último frame en el buzón
+    mailbox = manager.mailboxes[websocket]
+    receiver = asyncio.create_task(manager.receive_frames(websocket))
     
     try:
         while True:
-            # Recibir datos del cliente
-            data = await websocket.receive_text()
-            frame_data = json.loads(data)
+            # Tomar el frame más reciente (None cuando el cliente se desconecta)
+            packet = await mailbox.get()
+            if packet is None:
+                break
             
             # Procesar frame
-            result = await manager.process_frame(websocket, frame_data)
+            result = await manager.process_frame(websocket, packet)
+            result['frames_dropped'] = mailbox.dropped
             
             # Enviar resultado
-            await websocket.send_json(result)
+            await manager.send_json(websocket, result)
             
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
+        pass
     except Exception as e:
         logger.error(f"Error en WebSocket: {e}")
-        manager.disconnect(websocket)
+    finally:
+        receiver.cancel()
+        await manager.disconnect(websocket)
 
 @app.websocket("/ws/{profile_id}")
 async def websocket_endpoint(websocket: WebSocket, profile_id: str):
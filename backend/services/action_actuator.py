@@ -0,0 +1,164 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+
+from .pipeline_metrics import StageMetrics
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ('move_cursor', 'left_click', 'right_click', 'scroll', 'drag_drop', 'zoom')
+
+
+class ActionActuator:
+    """
+    Ejecuta las acciones del sistema en un hilo propio.
+
+    Los hilos de trabajo del pipeline solo encolan la acción (`execute_action`
+    tiene la misma firma que SystemController) y siguen con el siguiente
+    frame; la inyección de eventos del sistema operativo nunca retrasa el
+    procesamiento.
+
+    - Cola acotada a `max_queue` comandos; si está llena, la acción nueva
+      se descarta (y se cuenta).
+    - Movimientos del cursor consecutivos se fusionan: si el último comando
+      pendiente es `move_cursor`, se sustituye su destino en lugar de
+      encolar otro, así que el cursor siempre va al objetivo más reciente.
+    - Por tipo de acción se miden la espera en cola y la ejecución.
+    """
+
+    def __init__(self, controller, max_queue: int = 32):
+        """
+        Args:
+            controller: SystemController (o cualquier objeto con `execute_action`)
+            max_queue: Comandos pendientes como máximo
+        """
+        self.controller = controller
+        self.max_queue = max(1, max_queue)
+
+        self._queue: Deque[List] = deque()  # [acción, detalles, instante de encolado]
+        self._condition = threading.Condition()
+        self._closed = False
+        self._busy = False
+
+        # Métricas por tipo de acción (segundos)
+        self.queue_wait = StageMetrics(stages=ACTIONS)
+        self.execution = StageMetrics(stages=ACTIONS)
+        self.submitted = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._thread = threading.Thread(target=self._run, name='gesture-actuator', daemon=True)
+        self._thread.start()
+        logger.info(f"ActionActuator iniciado (max_queue={self.max_queue})")
+
+    def execute_action(self, action: str, details: Optional[Dict] = None) -> Dict:
+        """
+        Encola una acción sin esperar a que se ejecute.
+
+        Returns:
+            Diccionario con `success` (False si la acción se descartó) y `queued`
+        """
+        now = time.perf_counter()
+        with self._condition:
+            if self._closed:
+                return {"success": False, "queued": False, "message": "Actuador cerrado"}
+            self.submitted += 1
+
+            queue = self._queue
+            if action == 'move_cursor' and queue and queue[-1][0] == 'move_cursor':
+                # Solo importa el destino más reciente
+                queue[-1][1] = details
+                queue[-1][2] = now
+                self.coalesced += 1
+                return {"success": True, "queued": True, "message": "Movimiento fusionado"}
+
+            if len(queue) >= self.max_queue:
+                self.dropped += 1
+                logger.warning(f"Cola del actuador llena; acción {action} descartada")
+                return {"success": False, "queued": False, "message": "Cola de acciones llena"}
+
+            queue.append([action, details, now])
+            self._condition.notify()
+        return {"success": True, "queued": True, "message": "Acción encolada"}
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                action, details, enqueued = self._queue.popleft()
+                self._busy = True
+
+            start = time.perf_counter()
+            try:
+                result = self.controller.execute_action(action, details)
+            except Exception as e:
+                # SystemController ya captura sus errores; esto protege el hilo de otros controladores
+                logger.error(f"Error en el actuador al ejecutar {action}: {str(e)}")
+                result = {"success": False}
+            end = time.perf_counter()
+
+            self.queue_wait.observe({action: start - enqueued})
+            self.execution.observe({action: end - start})
+            with self._condition:
+                self.executed += 1
+                self._busy = False
+                if not result or not result.get('success', False):
+                    self.failed += 1
+                self._condition.notify_all()
+
+    @property
+    def pending(self) -> int:
+        """Comandos en cola."""
+        return len(self._queue)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que se ejecuten las acciones pendientes (para pruebas)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while (self._queue or self._busy) and not self._closed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return not (self._queue or self._busy)
+
+    def close(self, timeout: float = 1.0):
+        """Detiene el hilo; las acciones pendientes se descartan (ya no son actuales)."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            discarded = len(self._queue)
+            self._queue.clear()
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        if discarded:
+            logger.info(f"ActionActuator cerrado; {discarded} acciones pendientes descartadas")
+
+    def histograms(self) -> List[Tuple[str, str, StageMetrics, str]]:
+        """Histogramas para render_prometheus."""
+        return [
+            ('gesture_action_queue_wait_seconds', 'Espera de cada acción en la cola del actuador',
+             self.queue_wait, 'action'),
+            ('gesture_action_duration_seconds', 'Ejecución de cada acción del sistema', self.execution, 'action'),
+        ]
+
+    def get_statistics(self) -> Dict:
+        """Contadores y latencias por tipo de acción (ms)."""
+        return {
+            'pending': self.pending,
+            'submitted': self.submitted,
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'queue_wait': self.queue_wait.get_statistics(),
+            'execution': self.execution.get_statistics()
+        }
@@ -0,0 +1,345 @@
+"""
+Captura local de cámara (o vídeo) en el servidor.
+
+Para quioscos en los que la cámara está en la misma máquina que el
+backend: los frames no pasan por el navegador, JPEG, base64 ni el
+WebSocket. Un hilo de captura escribe cada frame directamente en un
+anillo de buffers preasignados y otro hilo los entrega al mismo
+GesturePipeline que usan las sesiones WebSocket.
+"""
+from typing import Callable, Dict, Optional, Tuple, Union
+import logging
+import threading
+import time
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FrameRing:
+    """
+    Anillo de `slots` frames preasignados con un hueco reservado por el
+    consumidor.
+
+    El productor escribe siempre en un hueco libre distinto del que se está
+    procesando, así que el frame prestado al consumidor no se sobrescribe
+    mientras lo usa y no se asigna memoria por frame. `acquire` entrega el
+    frame más reciente; los frames escritos entre dos `acquire` se pierden
+    (se cuentan en `dropped`) salvo que el productor espere (`block`).
+    """
+
+    def __init__(self, slots: int, shape: Tuple[int, ...], dtype=np.uint8):
+        """
+        Args:
+            slots: Huecos del anillo (mínimo 3: escritura, último y prestado)
+            shape: Forma de cada frame (alto, ancho, canales)
+        """
+        self.frames = np.empty((max(3, slots),) + tuple(shape), dtype=dtype)
+        self._condition = threading.Condition()
+        self._next = 0
+        self._latest: Optional[int] = None  # Hueco del último frame escrito y no leído
+        self._latest_meta: Tuple[int, float] = (0, 0.0)
+        self._leased: Optional[int] = None
+        self._closed = False
+
+        # Estadísticas
+        self.written = 0
+        self.dropped = 0
+
+    def writable(self, block: bool = False) -> Optional[np.ndarray]:
+        """
+        Hueco donde escribir el siguiente frame.
+
+        Args:
+            block: Esperar a que el consumidor tome el último frame antes de
+                ofrecer otro hueco (sin pérdidas, para vídeos)
+
+        Returns:
+            Vista del hueco, o None si el anillo se cerró
+        """
+        with self._condition:
+            while block and self._latest is not None and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                return None
+            slot = self._next
+            while slot == self._leased or slot == self._latest:
+                slot = (slot + 1) % len(self.frames)
+            self._next = slot
+            return self.frames[slot]
+
+    def commit(self, frame_id: int, timestamp: float):
+        """Publica el hueco devuelto por el último `writable`."""
+        with self._condition:
+            if self._latest is not None:
+                self.dropped += 1
+            self._latest = self._next
+            self._latest_meta = (frame_id, timestamp)
+            self._next = (self._next + 1) % len(self.frames)
+            self.written += 1
+            self._condition.notify_all()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[Tuple[np.ndarray, int, float]]:
+        """
+        Presta el frame más reciente hasta el siguiente `acquire` o `release`.
+
+        Returns:
+            (frame, frame_id, timestamp en ms), o None si se agotó la espera
+            o el anillo se cerró sin frames pendientes
+        """
+        with self._condition:
+            self._leased = None
+            if not self._condition.wait_for(lambda: self._latest is not None or self._closed, timeout):
+                return None
+            if self._latest is None:
+                return None
+            self._leased, self._latest = self._latest, None
+            self._condition.notify_all()
+            frame_id, timestamp = self._latest_meta
+            return self.frames[self._leased], frame_id, timestamp
+
+    def release(self):
+        """Devuelve el frame prestado."""
+        with self._condition:
+            self._leased = None
+
+    def close(self):
+        """Despierta a productor y consumidor; el último frame aún puede leerse."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+def parse_source(source: Union[int, str]) -> Union[int, str]:
+    """Índice de dispositivo ('0' → 0) o ruta/URL de vídeo."""
+    if isinstance(source, str) and source.strip().isdigit():
+        return int(source)
+    return source
+
+
+class CameraCapture:
+    """
+    Fuente de frames local sobre `cv2.VideoCapture`.
+
+    - Hilo de captura: `read` escribe directamente en el hueco libre del
+      anillo (sin asignar un array por frame).
+    - Hilo de procesamiento: toma el frame más reciente y lo pasa a
+      `pipeline.process_image`; el resultado se entrega a `on_result`.
+
+    Con una cámara los frames que llegan mientras se procesa otro se
+    descartan (siempre se procesa el más reciente); con un archivo de vídeo
+    la captura espera al procesamiento, así que se procesan todos los frames
+    y el resultado es reproducible (pruebas sin cámara).
+    """
+
+    def __init__(self,
+                 source: Union[int, str],
+                 pipeline,
+                 on_result: Optional[Callable[[Dict], None]] = None,
+                 slots: int = 4,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None,
+                 fps: Optional[float] = None,
+                 drop_frames: Optional[bool] = None):
+        """
+        Args:
+            source: Índice del dispositivo o ruta del vídeo
+            pipeline: GesturePipeline de la sesión local
+            on_result: Se llama (en el hilo de procesamiento) con cada resultado
+            slots: Frames preasignados en el anillo
+            width, height, fps: Formato pedido a la cámara (se ignora en vídeos)
+            drop_frames: Descartar frames atrasados; por defecto, sí en
+                dispositivos y no en archivos
+        """
+        self.source = parse_source(source)
+        self.pipeline = pipeline
+        self.on_result = on_result
+        self.slots = slots
+        self.is_device = isinstance(self.source, int)
+        self.drop_frames = self.is_device if drop_frames is None else drop_frames
+
+        self.capture = cv2.VideoCapture(self.source)
+        if not self.capture.isOpened():
+            raise RuntimeError(f"No se pudo abrir la fuente de vídeo {self.source!r}")
+        if self.is_device:
+            if width:
+                self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            if height:
+                self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            if fps:
+                self.capture.set(cv2.CAP_PROP_FPS, fps)
+
+        # El primer frame fija el formato del anillo
+        ok, first = self.capture.read()
+        if not ok:
+            self.capture.release()
+            raise RuntimeError(f"La fuente de vídeo {self.source!r} no entregó ningún frame")
+        self.ring = FrameRing(slots, first.shape, first.dtype)
+        self._first = first
+
+        self._stop = threading.Event()
+        self._capture_thread: Optional[threading.Thread] = None
+        self._process_thread: Optional[threading.Thread] = None
+        # La fuente y el pipeline se liberan cuando no queda ningún hilo que los use
+        self._cleanup_lock = threading.Lock()
+        self._active_threads = 0
+        self._cleanup_pending = False
+        self._released = False
+        self.last_result: Optional[Dict] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        # Estadísticas
+        self.captured = 0
+        self.processed = 0
+        self.read_failures = 0
+        self.errors = 0
+
+        logger.info(f"CameraCapture abierta: {self.source!r} {first.shape[1]}x{first.shape[0]} "
+                    f"(descartar frames={self.drop_frames})")
+
+    def start(self):
+        """Arranca los hilos de captura y procesamiento."""
+        self.started_at = time.monotonic()
+        self._capture_thread = threading.Thread(target=self._capture_loop, name='gesture-capture', daemon=True)
+        self._process_thread = threading.Thread(target=self._process_loop, name='gesture-capture-process', daemon=True)
+        self._active_threads = 2
+        self._process_thread.start()
+        self._capture_thread.start()
+
+    def _capture_loop(self):
+        block = not self.drop_frames
+        frame_id = 0
+        try:
+            # El primer frame ya está leído
+            slot = self.ring.writable(block)
+            if slot is not None:
+                slot[...] = self._first
+                self._first = None
+                self._publish(frame_id)
+
+            while not self._stop.is_set():
+                slot = self.ring.writable(block)
+                if slot is None:
+                    break
+                ok, frame = self.capture.read(slot)
+                if not ok:
+                    if self.is_device:
+                        # Fallo transitorio de la cámara: reintentar sin girar en vacío
+                        self.read_failures += 1
+                        time.sleep(0.01)
+                        continue
+                    break  # Fin del vídeo
+                if frame is not slot and frame.shape == slot.shape:
+                    # Algunos backends no reutilizan el buffer indicado
+                    slot[...] = frame
+                elif frame is not slot:
+                    logger.warning(f"Cambio de formato en la fuente de vídeo: {frame.shape}; frame descartado")
+                    continue
+                frame_id += 1
+                self._publish(frame_id)
+        finally:
+            self.ring.close()
+            self._thread_exited()
+
+    def _publish(self, frame_id: int):
+        self.captured += 1
+        self.ring.commit(frame_id, time.time() * 1000)
+
+    def _process_loop(self):
+        try:
+            while True:
+                leased = self.ring.acquire()
+                if leased is None:
+                    break
+                image, frame_id, timestamp = leased
+                try:
+                    result = self.pipeline.process_image(image, frame_id, timestamp)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Error procesando frame {frame_id} de la captura: {e}")
+                    continue
+                result['frames_dropped'] = self.ring.dropped
+                self.last_result = result
+                self.processed += 1
+                if self.on_result:
+                    try:
+                        self.on_result(result)
+                    except Exception as e:
+                        logger.error(f"Error entregando el resultado de la captura: {e}")
+        finally:
+            self.ring.release()
+            self.finished_at = time.monotonic()
+            self._thread_exited()
+
+    @property
+    def running(self) -> bool:
+        return self._process_thread is not None and self._process_thread.is_alive()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que termine la fuente (fin del vídeo o `stop`). True si terminó."""
+        if self._process_thread is None:
+            return True
+        self._process_thread.join(timeout)
+        return not self._process_thread.is_alive()
+
+    def stop(self, timeout: float = 2.0):
+        """
+        Detiene la captura, espera a los hilos y libera la fuente y el pipeline.
+
+        Un hilo bloqueado en `capture.read()` o en `process_image` puede
+        superar `timeout`; en ese caso la liberación la hace el último hilo
+        al salir, nunca mientras alguno siga usando la fuente o el pipeline.
+        """
+        self._stop.set()
+        self.ring.close()
+        threads = [thread for thread in (self._capture_thread, self._process_thread) if thread is not None]
+        for thread in threads:
+            thread.join(timeout)
+
+        with self._cleanup_lock:
+            self._cleanup_pending = True
+            release = self._claim_release()
+        if release:
+            self._release()
+        else:
+            alive = [thread.name for thread in threads if thread.is_alive()]
+            logger.warning(f"CameraCapture: hilos sin terminar tras {timeout}s ({', '.join(alive)}); "
+                           f"la fuente y el pipeline se liberarán al salir")
+
+    def _thread_exited(self):
+        with self._cleanup_lock:
+            self._active_threads -= 1
+            release = self._claim_release()
+        if release:
+            self._release()
+
+    def _claim_release(self) -> bool:
+        """True (una sola vez) si se pidió parar y ya no queda ningún hilo; con `_cleanup_lock` tomado."""
+        if self._released or not self._cleanup_pending or self._active_threads > 0:
+            return False
+        self._released = True
+        return True
+
+    def _release(self):
+        self.capture.release()
+        self.pipeline.close()
+        logger.info(f"CameraCapture detenida: {self.processed} frames procesados, {self.ring.dropped} descartados")
+
+    def get_statistics(self) -> Dict:
+        """Frames capturados, procesados y descartados, y FPS de procesamiento."""
+        end = self.finished_at or time.monotonic()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            'source': self.source,
+            'running': self.running,
+            'captured': self.captured,
+            'processed': self.processed,
+            'dropped': self.ring.dropped,
+            'read_failures': self.read_failures,
+            'errors': self.errors,
+            'fps': round(self.processed / elapsed, 1) if elapsed > 0 else 0.0,
+            'last_gesture': self.last_result.get('gesture') if self.last_result else None
+        }
@@ -0,0 +1,140 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterator, List, Optional
+import logging
+
+import numpy as np
+
+from .hand_detector import HandDetector
+
+logger = logging.getLogger(__name__)
+
+
+class DetectorPool:
+    """
+    Conjunto fijo de HandDetector compartido por todas las sesiones.
+
+    Los grafos de MediaPipe se crean y precalientan una sola vez (al
+    arrancar el servidor), de modo que conectar un cliente no carga modelos
+    y la memoria no crece con el número de sesiones.
+
+    Cada frame toma prestado un detector con `lease`. El pool intenta
+    devolver a cada sesión el mismo detector que usó la vez anterior para
+    conservar el seguimiento de MediaPipe entre frames; si un detector pasa
+    a otra sesión se reinicia su grafo para no arrastrar el estado ajeno.
+    """
+
+    def __init__(self, size: int = 1, **detector_kwargs):
+        """
+        Args:
+            size: Número de detectores del pool
+            **detector_kwargs: Parámetros para cada HandDetector
+        """
+        self.size = max(1, size)
+        self._detectors: List[HandDetector] = [HandDetector(**detector_kwargs) for _ in range(self.size)]
+        self._idle: List[HandDetector] = list(self._detectors)
+        self._last_session: Dict[int, Optional[Hashable]] = {id(d): None for d in self._detectors}
+        self._affinity: Dict[Hashable, HandDetector] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+
+        # Estadísticas
+        self.leases = 0
+        self.affinity_hits = 0
+        self.resets = 0
+        self.wait_time = 0.0
+
+        logger.info(f"DetectorPool inicializado con {self.size} detectores")
+
+    def warm_up(self, width: int = 640, height: int = 480):
+        """Ejecuta un frame vacío en cada detector para inicializar los grafos."""
+        blank = np.zeros((height, width, 3), dtype=np.uint8)
+        start = time.perf_counter()
+        for detector in self._detectors:
+            detector.detect_landmarks(blank)
+            detector.reset()
+        logger.info(f"DetectorPool precalentado en {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    @contextmanager
+    def lease(self, session_key: Hashable, timeout: Optional[float] = None) -> Iterator[HandDetector]:
+        """
+        Presta un detector a una sesión durante un frame.
+
+        Args:
+            session_key: Identificador de la sesión
+            timeout: Segundos máximos de espera (None = sin límite)
+
+        Raises:
+            TimeoutError: Si no queda ningún detector libre a tiempo
+        """
+        detector = self._acquire(session_key, timeout)
+        try:
+            yield detector
+        finally:
+            self._release(detector)
+
+    def release_session(self, session_key: Hashable):
+        """Olvida la afinidad de una sesión cerrada."""
+        with self._condition:
+            self._affinity.pop(session_key, None)
+
+    def _acquire(self, session_key: Hashable, timeout: Optional[float]) -> HandDetector:
+        start = time.perf_counter()
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._idle or self._closed, timeout):
+                raise TimeoutError("No hay detectores libres en el pool")
+            if self._closed:
+                raise RuntimeError("DetectorPool cerrado")
+
+            preferred = self._affinity.get(session_key)
+            if preferred is not None and preferred in self._idle:
+                detector = preferred
+                self.affinity_hits += 1
+            else:
+                # Preferir detectores sin sesión asignada para no romper el seguimiento de otra
+                owned = set(map(id, self._affinity.values()))
+                detector = next((d for d in self._idle if id(d) not in owned), self._idle[0])
+
+            self._idle.remove(detector)
+            needs_reset = self._last_session[id(detector)] not in (None, session_key)
+            if needs_reset:
+                self.resets += 1
+            self._last_session[id(detector)] = session_key
+            self._affinity[session_key] = detector
+            self.leases += 1
+            self.wait_time += time.perf_counter() - start
+
+        if needs_reset:
+            detector.reset()
+        return detector
+
+    def _release(self, detector: HandDetector):
+        with self._condition:
+            self._idle.append(detector)
+            self._condition.notify()
+
+    @property
+    def available(self) -> int:
+        """Detectores libres en este momento."""
+        return len(self._idle)
+
+    def get_statistics(self) -> Dict:
+        """Obtiene el estado del pool."""
+        return {
+            'size': self.size,
+            'available': self.available,
+            'leases': self.leases,
+            'affinity_hits': self.affinity_hits,
+            'resets': self.resets,
+            'avg_wait_ms': self.wait_time / self.leases * 1000 if self.leases else 0.0
+        }
+
+    def close(self):
+        """Cierra todos los detectores del pool."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for detector in self._detectors:
+            detector.close()
+        logger.info("DetectorPool cerrado")
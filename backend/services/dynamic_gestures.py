@@ -0,0 +1,227 @@
+"""
+Reconocimiento de gestos dinámicos (deslizamientos y círculos).
+
+Los gestos estáticos se clasifican frame a frame; estos dependen de la
+trayectoria de la mano. Cada sesión guarda los landmarks recientes en un
+anillo de tamaño fijo junto con el centro de la palma y la longitud de
+arco acumulada, que se calculan una sola vez al añadir el frame. En cada
+frame, la trayectoria de las últimas ventanas de tiempo se remuestrea por
+longitud de arco a un número fijo de puntos (O(ventana)) y se compara con
+plantillas de forma: los tramos en los que la mano está quieta no cuentan
+y la velocidad del gesto no importa.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+import logging
+import time
+
+import numpy as np
+
+from .gesture_classifier import GestureClassifier
+from .landmarks import NUM_LANDMARKS
+
+logger = logging.getLogger(__name__)
+
+# Puntos cuya media es el centro de la palma (muñeca y bases de los dedos)
+PALM_POINTS = (GestureClassifier.WRIST, GestureClassifier.INDEX_FINGER_MCP, GestureClassifier.MIDDLE_FINGER_MCP,
+               GestureClassifier.RING_FINGER_MCP, GestureClassifier.PINKY_MCP)
+
+
+def _shape_templates(samples: int) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """
+    Trayectorias de referencia centradas y con extensión 1, en coordenadas
+    de imagen (Y hacia abajo).
+
+    Returns:
+        (nombre de cada plantilla, array (plantillas, samples, 2))
+    """
+    t = np.linspace(0.0, 1.0, samples)
+    names, shapes = [], []
+    for name, (dx, dy) in (('swipe_right', (1, 0)), ('swipe_left', (-1, 0)),
+                           ('swipe_down', (0, 1)), ('swipe_up', (0, -1))):
+        names.append(name)
+        shapes.append(np.stack([(t - 0.5) * dx, (t - 0.5) * dy], axis=1))
+    # Un círculo puede empezar en cualquier punto: una plantilla por fase inicial
+    for name, sign in (('circle_cw', 1.0), ('circle_ccw', -1.0)):
+        for phase in np.arange(16) * (np.pi / 8):
+            angle = phase + sign * 2 * np.pi * t
+            names.append(name)
+            shapes.append(0.5 * np.stack([np.cos(angle), np.sin(angle)], axis=1))
+    return tuple(names), np.array(shapes)
+
+
+class LandmarkHistory:
+    """
+    Anillo con los landmarks de los últimos `capacity` frames de una mano,
+    su instante, el centro de la palma, el tamaño de la palma y la longitud
+    de arco acumulada del centro de la palma.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.landmarks = np.zeros((capacity, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.timestamps = np.zeros(capacity)
+        self.centers = np.zeros((capacity, 2))
+        self.palm_sizes = np.zeros(capacity)
+        self.arc_lengths = np.zeros(capacity)
+        self._next = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def push(self, landmarks: np.ndarray, timestamp: float):
+        """Añade un frame (sobrescribe el más antiguo si el anillo está lleno)."""
+        slot = self._next
+        self.landmarks[slot] = landmarks
+        center = landmarks[PALM_POINTS, :2].mean(axis=0)
+        self.centers[slot] = center
+        palm = landmarks[GestureClassifier.MIDDLE_FINGER_MCP, :2] - landmarks[GestureClassifier.WRIST, :2]
+        self.palm_sizes[slot] = np.hypot(palm[0], palm[1])
+        if self.count:
+            previous = (slot - 1) % self.capacity
+            step = center - self.centers[previous]
+            self.arc_lengths[slot] = self.arc_lengths[previous] + np.hypot(step[0], step[1])
+        else:
+            self.arc_lengths[slot] = 0.0
+        self.timestamps[slot] = timestamp
+        self._next = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def clear(self):
+        self.count = 0
+
+    def window(self, since: float) -> np.ndarray:
+        """Índices del anillo, del más antiguo al más reciente, de los frames con instante >= `since`."""
+        order = (self._next - self.count + np.arange(self.count)) % self.capacity
+        first = np.searchsorted(self.timestamps[order], since)
+        return order[first:]
+
+
+class DynamicGestureRecognizer:
+    """
+    Reconoce deslizamientos (swipe_left/right/up/down) y círculos
+    (circle_cw/ccw, en el sentido visto en la imagen) de la mano principal.
+
+    En cada frame se prueban varias ventanas de tiempo que terminan en el
+    frame actual: la trayectoria del centro de la palma se remuestrea a
+    `samples` puntos equiespaciados en longitud de arco, se centra y se
+    escala a extensión 1, y se compara con cada plantilla por la distancia
+    media entre puntos. Solo se evalúan ventanas en las que la mano ha
+    recorrido al menos `min_travel` veces el tamaño de su palma. Tras
+    reconocer un gesto se vacía el historial y se espera `cooldown_ms`, de
+    modo que cada movimiento produce un solo evento.
+    """
+
+    def __init__(self,
+                 windows_ms: Sequence[float] = (400.0, 700.0, 1000.0),
+                 samples: int = 32,
+                 min_travel: float = 1.5,
+                 max_distance: float = 0.3,
+                 min_confidence: float = 0.75,
+                 cooldown_ms: float = 400.0,
+                 capacity: int = 64):
+        """
+        Args:
+            windows_ms: Duraciones de las ventanas evaluadas (la mayor limita la duración del gesto)
+            samples: Puntos de la trayectoria remuestreada
+            min_travel: Recorrido mínimo, en tamaños de palma
+            max_distance: Distancia media a la plantilla con confianza 0
+            min_confidence: Confianza mínima para emitir un gesto
+            cooldown_ms: Pausa tras un gesto reconocido
+            capacity: Frames guardados (debe cubrir la ventana mayor a los FPS de la sesión)
+        """
+        self.windows = tuple(sorted(w / 1000.0 for w in windows_ms))
+        self.samples = samples
+        self.min_travel = min_travel
+        self.max_distance = max_distance
+        self.min_confidence = min_confidence
+        self.cooldown = cooldown_ms / 1000.0
+        self.history = LandmarkHistory(capacity)
+        self.template_names, self.templates = _shape_templates(samples)
+        self._arc_positions = np.linspace(0.0, 1.0, samples)
+        self._cooldown_until = float('-inf')
+
+        # Estadísticas
+        self.frames = 0
+        self.evaluations = 0
+        self.gesture_counts: Dict[str, int] = {}
+
+    def update(self, landmarks: Optional[np.ndarray], timestamp: Optional[float] = None) -> Optional[Dict]:
+        """
+        Añade el frame de la mano principal y busca un gesto que termine en él.
+
+        Args:
+            landmarks: Array (21, 3) de la mano, o None si no hay mano (corta la trayectoria)
+            timestamp: Instante del frame en segundos (por defecto, time.monotonic())
+
+        Returns:
+            None, o diccionario con gesture, confidence, duration_ms y
+            travel (recorrido en tamaños de palma)
+        """
+        self.frames += 1
+        if landmarks is None:
+            self.history.clear()
+            return None
+
+        now = time.monotonic() if timestamp is None else timestamp
+        self.history.push(landmarks, now)
+        if now < self._cooldown_until:
+            return None
+
+        best = None
+        for window in self.windows:
+            match = self._match(self.history.window(now - window))
+            if match and (best is None or match[1] > best[1]):
+                best = match
+        if best is None or best[1] < self.min_confidence:
+            return None
+
+        template, confidence, indices, travel = best
+        gesture = self.template_names[template]
+        self.gesture_counts[gesture] = self.gesture_counts.get(gesture, 0) + 1
+        duration = self.history.timestamps[indices[-1]] - self.history.timestamps[indices[0]]
+        self.history.clear()
+        self._cooldown_until = now + self.cooldown
+        return {
+            'gesture': gesture,
+            'confidence': confidence,
+            'duration_ms': duration * 1000,
+            'travel': travel
+        }
+
+    def _match(self, indices: np.ndarray) -> Optional[Tuple[int, float, np.ndarray, float]]:
+        """Mejor plantilla para la trayectoria de los frames `indices`: (plantilla, confianza, índices, recorrido)."""
+        if len(indices) < 4:
+            return None
+        history = self.history
+        arc = history.arc_lengths[indices] - history.arc_lengths[indices[0]]
+        palm = float(np.median(history.palm_sizes[indices]))
+        travel = arc[-1] / max(palm, 1e-6)
+        if travel < self.min_travel:
+            return None
+
+        # Remuestreo por longitud de arco: los frames con la mano quieta no aportan puntos
+        centers = history.centers[indices]
+        positions = self._arc_positions * arc[-1]
+        path = np.stack([np.interp(positions, arc, centers[:, 0]),
+                         np.interp(positions, arc, centers[:, 1])], axis=1)
+        path -= path.mean(axis=0)
+        path /= max(float((path.max(axis=0) - path.min(axis=0)).max()), 1e-6)
+
+        self.evaluations += 1
+        distances = np.sqrt(((self.templates - path) ** 2).sum(axis=2)).mean(axis=1)
+        template = int(distances.argmin())
+        confidence = max(0.0, 1.0 - float(distances[template]) / self.max_distance)
+        return template, confidence, indices, float(travel)
+
+    def reset(self):
+        self.history.clear()
+        self._cooldown_until = float('-inf')
+
+    def get_statistics(self) -> Dict:
+        """Frames recibidos, ventanas evaluadas y gestos reconocidos."""
+        return {
+            'frames': self.frames,
+            'evaluations': self.evaluations,
+            'gestures': dict(self.gesture_counts)
+        }
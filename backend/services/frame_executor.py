@@ -0,0 +1,108 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FrameExecutor:
+    """
+    Ejecuta el trabajo de CPU del pipeline (decodificación, MediaPipe,
+    clasificación) en un pool de hilos acotado para que el event loop
+    solo atienda E/S.
+
+    Garantías:
+        - Orden por sesión: los trabajos de una misma sesión se ejecutan
+          uno tras otro en el orden en que se enviaron.
+        - Cola acotada: como mucho `max_queue` trabajos admitidos a la vez;
+          el resto espera en `submit` (contrapresión hacia el receptor).
+
+    Se usan hilos y no procesos porque los grafos de MediaPipe y el estado
+    de cada sesión no son serializables, y tanto OpenCV como MediaPipe
+    liberan el GIL durante el cómputo pesado.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        """
+        Args:
+            max_workers: Número de hilos de trabajo (por defecto según CPUs)
+            max_queue: Máximo de trabajos admitidos simultáneamente
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue or self.max_workers * 4
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='gesture-worker')
+        self._slots = asyncio.Semaphore(self.max_queue)
+        self._session_locks: Dict[Hashable, asyncio.Lock] = {}
+
+        # Contadores (solo se modifican desde el event loop)
+        self._waiting = 0
+        self._in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+        logger.info(f"FrameExecutor inicializado (workers={self.max_workers}, max_queue={self.max_queue})")
+
+    async def submit(self, session_key: Hashable, func: Callable, *args) -> Any:
+        """
+        Ejecuta `func(*args)` en el pool respetando el orden de la sesión.
+
+        Args:
+            session_key: Identificador de la sesión (p. ej. el WebSocket)
+            func: Función síncrona a ejecutar
+            *args: Argumentos de la función
+
+        Returns:
+            El valor devuelto por `func`
+        """
+        lock = self._session_locks.setdefault(session_key, asyncio.Lock())
+
+        self._waiting += 1
+        waiting = True
+        try:
+            async with self._slots, lock:
+                self._waiting -= 1
+                waiting = False
+                self._in_flight += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(self._executor, func, *args)
+                except Exception:
+                    self.failed += 1
+                    raise
+                finally:
+                    self._in_flight -= 1
+                self.completed += 1
+                return result
+        finally:
+            if waiting:
+                self._waiting -= 1
+
+    def release_session(self, session_key: Hashable):
+        """Olvida el estado de orden de una sesión que se ha cerrado."""
+        self._session_locks.pop(session_key, None)
+
+    @property
+    def queue_depth(self) -> int:
+        """Trabajos admitidos o en espera que todavía no ocupan un hilo."""
+        return self._waiting + max(0, self._in_flight - self.max_workers)
+
+    def get_statistics(self) -> Dict:
+        """Obtiene el estado actual del pool."""
+        return {
+            'workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'queue_depth': self.queue_depth,
+            'in_flight': self._in_flight,
+            'sessions': len(self._session_locks),
+            'completed': self.completed,
+            'failed': self.failed
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Detiene el pool de hilos."""
+        self._executor.shutdown(wait=wait)
+        logger.info("FrameExecutor detenido")
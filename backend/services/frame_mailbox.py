@@ -0,0 +1,129 @@
+import asyncio
+import time
+from typing import Dict, Optional
+import logging
+
+from .frame_protocol import FramePacket
+
+logger = logging.getLogger(__name__)
+
+
+class FrameMailbox:
+    """
+    Buzón de un solo hueco por sesión: el último frame recibido gana.
+
+    El receptor deposita frames con `put` en cuanto llegan del socket y el
+    procesador toma el más reciente con `get`. Un frame que se sustituye
+    antes de procesarse se descarta (superseded), y uno cuya antigüedad
+    supera `max_age_ms` al tomarlo también (stale).
+
+    La antigüedad se mide con el timestamp de captura del cliente, restando
+    el retardo mínimo observado en la sesión: así un desfase constante entre
+    relojes o una latencia de red estable no cuentan, solo el retraso extra.
+    Los frames sin timestamp usan la hora de llegada al servidor.
+    """
+
+    def __init__(self, max_age_ms: float = 500.0):
+        """
+        Args:
+            max_age_ms: Antigüedad máxima de un frame antes de descartarlo (0 = sin límite)
+        """
+        self.max_age_ms = max_age_ms
+
+        self._packet: Optional[FramePacket] = None
+        self._received_at: float = 0.0
+        self._delay_ms: Optional[float] = None
+        self._min_delay_ms: Optional[float] = None
+        self._last_start: float = 0.0
+        self._ready = asyncio.Event()
+        self._closed = False
+
+        # Estadísticas
+        self.received = 0
+        self.processed = 0
+        self.dropped_superseded = 0
+        self.dropped_stale = 0
+
+    def put(self, packet: FramePacket):
+        """Deposita un frame, sustituyendo al pendiente si lo hay."""
+        if self._closed:
+            return
+
+        self.received += 1
+        if self._packet is not None:
+            self.dropped_superseded += 1
+
+        self._packet = packet
+        self._received_at = time.monotonic()
+
+        # Retardo captura → llegada en el reloj del servidor
+        self._delay_ms = None
+        if packet.timestamp:
+            self._delay_ms = time.time() * 1000.0 - packet.timestamp
+            if self._min_delay_ms is None or self._delay_ms < self._min_delay_ms:
+                self._min_delay_ms = self._delay_ms
+
+        self._ready.set()
+
+    async def get(self) -> Optional[FramePacket]:
+        """
+        Espera y devuelve el frame más reciente que no esté caducado.
+
+        Returns:
+            El frame a procesar, o None si el buzón se ha cerrado
+        """
+        while True:
+            await self._ready.wait()
+            if self._closed:
+                return None
+
+            packet = self._packet
+            age_ms = self._age_ms()
+            self._packet = None
+            self._ready.clear()
+
+            now = time.monotonic()
+            # Un frame caducado se descarta salvo que el procesador lleve más
+            # del presupuesto sin arrancar: así un pipeline lento nunca se queda sin frames
+            starving = (now - self._last_start) * 1000.0 >= self.max_age_ms
+            if self.max_age_ms and age_ms > self.max_age_ms and not starving:
+                self.dropped_stale += 1
+                logger.debug(f"Frame {packet.frame_id} descartado por antigüedad ({age_ms:.0f} ms)")
+                continue
+
+            self._last_start = now
+            self.processed += 1
+            return packet
+
+    def close(self):
+        """Cierra el buzón y despierta al procesador que esté esperando."""
+        self._closed = True
+        self._packet = None
+        self._ready.set()
+
+    def _age_ms(self) -> float:
+        """Retraso extra del frame pendiente respecto al mejor caso observado."""
+        waited_ms = (time.monotonic() - self._received_at) * 1000.0
+        if self._delay_ms is None:
+            return waited_ms
+        return self._delay_ms - self._min_delay_ms + waited_ms
+
+    @property
+    def dropped(self) -> int:
+        """Total de frames descartados."""
+        return self.dropped_superseded + self.dropped_stale
+
+    @property
+    def pending(self) -> int:
+        """Frames esperando a procesarse (0 o 1)."""
+        return int(self._packet is not None)
+
+    def get_statistics(self) -> Dict:
+        """Obtiene los contadores del buzón."""
+        return {
+            'received': self.received,
+            'processed': self.processed,
+            'dropped_superseded': self.dropped_superseded,
+            'dropped_stale': self.dropped_stale,
+            'drop_ratio': self.dropped / self.received if self.received else 0.0
+        }
@@ -0,0 +1,155 @@
+import base64
+import math
+import struct
+from typing import Dict, List, Optional
+import logging
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Subprotocolos negociados en el handshake del WebSocket (Sec-WebSocket-Protocol)
+BINARY_SUBPROTOCOL = "gestures.binary.v1"
+JSON_SUBPROTOCOL = "gestures.json.v1"
+SUPPORTED_SUBPROTOCOLS = (BINARY_SUBPROTOCOL, JSON_SUBPROTOCOL)
+
+# Códecs de imagen admitidos en el formato binario
+CODEC_JPEG = 1
+CODEC_PNG = 2
+CODEC_NAMES = {CODEC_JPEG: 'jpeg', CODEC_PNG: 'png'}
+
+# Cabecera fija little-endian de 16 bytes:
+#   magic (2s) | version (B) | codec (B) | frame_id (I) | capture_ts en ms (d)
+FRAME_MAGIC = b'GF'
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct('<2sBBId')
+
+
+class FrameProtocolError(ValueError):
+    """Mensaje de frame mal formado o con un formato no soportado."""
+
+
+class FramePacket:
+    """
+    Frame recibido del cliente, independiente del formato de transporte.
+
+    El payload son los bytes comprimidos (JPEG/PNG) tal como llegaron,
+    sin copias intermedias en el caso binario.
+    """
+
+    __slots__ = ('frame_id', 'timestamp', 'codec', 'payload')
+
+    def __init__(self, payload, frame_id: int = 0,
+                 timestamp: Optional[float] = None, codec: int = CODEC_JPEG):
+        """
+        Args:
+            payload: Bytes de la imagen comprimida (bytes o memoryview)
+            frame_id: Identificador del frame asignado por el cliente
+            timestamp: Momento de captura en milisegundos (epoch) o None
+            codec: Códec de la imagen (CODEC_JPEG o CODEC_PNG)
+        """
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self.codec = codec
+        self.payload = payload
+
+
+def negotiate_subprotocol(offered: List[str]) -> Optional[str]:
+    """
+    Elige el subprotocolo a usar a partir de los ofrecidos por el cliente.
+
+    Se prefiere el formato binario. Si el cliente no ofrece ninguno conocido
+    se devuelve None y la conexión usa el formato JSON heredado.
+    """
+    for subprotocol in SUPPORTED_SUBPROTOCOLS:
+        if subprotocol in offered:
+            return subprotocol
+    return None
+
+
+def parse_binary_frame(data: bytes) -> FramePacket:
+    """
+    Interpreta un mensaje binario: cabecera fija seguida de la imagen.
+
+    Raises:
+        FrameProtocolError: Si la cabecera es inválida o no hay imagen
+    """
+    if len(data) <= FRAME_HEADER.size:
+        raise FrameProtocolError("Mensaje binario demasiado corto")
+
+    magic, version, codec, frame_id, timestamp = FRAME_HEADER.unpack_from(data)
+
+    if magic != FRAME_MAGIC:
+        raise FrameProtocolError("Cabecera de frame inválida")
+    if version != FRAME_VERSION:
+        raise FrameProtocolError(f"Versión de protocolo no soportada: {version}")
+    if codec not in CODEC_NAMES:
+        raise FrameProtocolError(f"Códec no soportado: {codec}")
+
+    payload = memoryview(data)[FRAME_HEADER.size:]
+    return FramePacket(payload, frame_id=frame_id,
+                       timestamp=timestamp if timestamp > 0 else None,
+                       codec=codec)
+
+
+def parse_json_frame(frame_data: Dict) -> FramePacket:
+    """
+    Interpreta un mensaje JSON heredado con la imagen como data URL base64.
+
+    Raises:
+        FrameProtocolError: Si el mensaje no es un objeto, falta la imagen,
+            el base64 es inválido, `frame_id` no es un entero o `timestamp`
+            no es un número positivo y finito
+    """
+    if not isinstance(frame_data, dict):
+        raise FrameProtocolError("El mensaje no es un objeto JSON")
+    image = frame_data.get('image')
+    if not isinstance(image, str) or not image:
+        raise FrameProtocolError("El mensaje no contiene 'image'")
+
+    codec = CODEC_JPEG
+    if ',' in image:
+        header, image = image.split(',', 1)
+        if 'image/png' in header:
+            codec = CODEC_PNG
+
+    try:
+        payload = base64.b64decode(image)
+    except (ValueError, TypeError) as e:
+        raise FrameProtocolError(f"Base64 inválido: {e}")
+
+    try:
+        frame_id = int(frame_data.get('frame_id', 0))
+    except (ValueError, TypeError) as e:
+        raise FrameProtocolError(f"frame_id inválido: {e}")
+
+    # El mailbox resta el timestamp al reloj del servidor: solo ms epoch finitos
+    timestamp = frame_data.get('timestamp')
+    if timestamp is not None:
+        try:
+            timestamp = float(timestamp)
+        except (ValueError, TypeError) as e:
+            raise FrameProtocolError(f"timestamp inválido: {e}")
+        if not math.isfinite(timestamp) or timestamp <= 0:
+            raise FrameProtocolError(f"timestamp inválido: {timestamp}")
+
+    return FramePacket(payload,
+                       frame_id=frame_id,
+                       timestamp=timestamp,
+                       codec=codec)
+
+
+def encode_binary_frame(payload: bytes, frame_id: int = 0,
+                        timestamp: Optional[float] = None,
+                        codec: int = CODEC_JPEG) -> bytes:
+    """Construye un mensaje binario (cabecera + imagen). Útil para clientes y pruebas."""
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, codec,
+                               frame_id & 0xFFFFFFFF, timestamp or 0.0)
+    return header + bytes(payload)
+
+
+def decode_image(packet: FramePacket) -> Optional[np.ndarray]:
+    """Decodifica el payload de un frame a una imagen BGR de OpenCV."""
+    nparr = np.frombuffer(packet.payload, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
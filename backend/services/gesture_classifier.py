@@ -1,7 +1,8 @@
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 import logging
-import math
+
+from .landmarks import NUM_LANDMARKS, landmarks_to_array
 
 logger = logging.getLogger(__name__)
 
@@ -52,12 +53,35 @@ class GestureClassifier:
         
         logger.info(f"GestureClassifier inicializado con umbrales: {self.thresholds}")
     
-    def classify(self, landmarks: List[Dict]) -> Dict:
+    # Pares de puntos cuyas distancias se calculan en una sola pasada:
+    # punta → muñeca y base → muñeca de cada dedo, y distancias entre puntas
+    FINGER_TIPS = (THUMB_TIP, INDEX_FINGER_TIP, MIDDLE_FINGER_TIP, RING_FINGER_TIP, PINKY_TIP)
+    FINGER_BASES = (THUMB_CMC, INDEX_FINGER_MCP, MIDDLE_FINGER_MCP, RING_FINGER_MCP, PINKY_MCP)
+    TIP_PAIRS = (
+        (INDEX_FINGER_TIP, MIDDLE_FINGER_TIP),
+        (MIDDLE_FINGER_TIP, RING_FINGER_TIP),
+        (RING_FINGER_TIP, PINKY_TIP),
+        (THUMB_TIP, INDEX_FINGER_TIP)
+    )
+    _PAIR_A = np.array(FINGER_TIPS + FINGER_BASES + tuple(a for a, _ in TIP_PAIRS))
+    _PAIR_B = np.array((WRIST,) * 10 + tuple(b for _, b in TIP_PAIRS))
+    
+    # Gestos en orden de prioridad con su acción asociada
+    GESTURES = (
+        ('index_point', 'move_cursor'),
+        ('fist', 'left_click'),
+        ('thumbs_up', 'right_click'),
+        ('open_hand', 'scroll'),
+        ('pinch', 'drag_drop')
+    )
+    
+    def classify(self, landmarks: Union[np.ndarray, List[Dict]]) -> Dict:
         """
         Clasifica el gesto basándose en los landmarks de la mano.
         
         Args:
-            landmarks: Lista de 21 puntos clave de la mano
+            landmarks: Array (21, 3) de puntos clave de la mano (o, por
+                compatibilidad, lista de 21 diccionarios {'x', 'y', 'z'})
             
         Returns:
             Diccionario con:
@@ -66,163 +90,217 @@ class GestureClassifier:
                 - action: Acción asociada al gesto
                 - details: Información adicional del gesto
         """
-        if not landmarks or len(landmarks) != 21:
+        if landmarks is None or len(landmarks) != NUM_LANDMARKS:
             return {'gesture': 'unknown', 'confidence': 0.0, 'action': 'none'}
         
-        # Convertir a array numpy
-        lm_array = np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks])
+        # Trabajar en float64: los float32 de MediaPipe se convierten sin pérdida
+        lm_array = landmarks_to_array(landmarks)
+        
+        # Todas las distancias y flags en una pasada, compartidos por los 5 gestos
+        features = self._extract_features(lm_array)
+        scores = self._score_gestures(features)
         
         # Verificar cada gesto en orden de prioridad
-        gestures = [
-            ('index_point', self._is_index_point, 'move_cursor'),
-            ('fist', self._is_fist, 'left_click'),
-            ('thumbs_up', self._is_thumbs_up, 'right_click'),
-            ('open_hand', self._is_open_hand, 'scroll'),
-            ('pinch', self._is_pinch, 'drag_drop')
-        ]
-        
-        for gesture_name, detector_func, action in gestures:
-            confidence = detector_func(lm_array)
+        for (gesture_name, action), confidence in zip(self.GESTURES, scores):
             if confidence >= self.thresholds[gesture_name]:
                 return {
                     'gesture': gesture_name,
                     'confidence': confidence,
                     'action': action,
-                    'details': self._get_gesture_details(gesture_name, lm_array)
+                    'details': self._get_gesture_details(gesture_name, lm_array, features)
                 }
         
         # No se detectó ningún gesto con suficiente confianza
         return {'gesture': 'unknown', 'confidence': 0.0, 'action': 'none'}
     
-    def _is_index_point(self, lm: np.ndarray) -> float:
-        """Detecta índice extendido (👆) para mover cursor."""
-        # Índice extendido, otros dedos doblados
-        index_extended = self._is_finger_extended(lm, self.INDEX_FINGER_TIP, self.INDEX_FINGER_MCP)
-        middle_folded = not self._is_finger_extended(lm, self.MIDDLE_FINGER_TIP, self.MIDDLE_FINGER_MCP)
-        ring_folded = not self._is_finger_extended(lm, self.RING_FINGER_TIP, self.RING_FINGER_MCP)
-        pinky_folded = not self._is_finger_extended(lm, self.PINKY_TIP, self.PINKY_MCP)
-        
-        # Verificar que el índice esté claramente más extendido que los otros dedos
-        index_tip_y = lm[self.INDEX_FINGER_TIP][1]
-        middle_tip_y = lm[self.MIDDLE_FINGER_TIP][1]
-        ring_tip_y = lm[self.RING_FINGER_TIP][1]
-        pinky_tip_y = lm[self.PINKY_TIP][1]
-        
-        # El índice debe estar más alto (valor Y menor) que los otros dedos
-        index_highest = (index_tip_y < middle_tip_y and index_tip_y < ring_tip_y and index_tip_y < pinky_tip_y)
-        
-        if index_extended and middle_folded and ring_folded and pinky_folded and index_highest:
-            return 0.95
-        elif index_extended and (middle_folded and ring_folded) and index_highest:
-            return 0.85
-        elif index_extended and index_highest:
-            return 0.75
-        return 0.0
-    
-    def _is_fist(self, lm: np.ndarray) -> float:
-        """Detecta puño cerrado (✊) para clic izquierdo."""
-        # Todos los dedos doblados
-        fingers_folded = [
-            not self._is_finger_extended(lm, self.INDEX_FINGER_TIP, self.INDEX_FINGER_MCP),
-            not self._is_finger_extended(lm, self.MIDDLE_FINGER_TIP, self.MIDDLE_FINGER_MCP),
-            not self._is_finger_extended(lm, self.RING_FINGER_TIP, self.RING_FINGER_MCP),
-            not self._is_finger_extended(lm, self.PINKY_TIP, self.PINKY_MCP)
-        ]
-        
-        folded_count = sum(fingers_folded)
-        if folded_count == 4:
-            return 0.95
-        elif folded_count == 3:
-            return 0.75
-        return 0.0
-    
-    def _is_thumbs_up(self, lm: np.ndarray) -> float:
-        """Detecta pulgar arriba (👍) para clic derecho."""
-        # Pulgar extendido hacia arriba, otros dedos doblados
-        thumb_extended = lm[self.THUMB_TIP][1] < lm[self.THUMB_MCP][1]  # Y más bajo = arriba
-        fingers_folded = [
-            not self._is_finger_extended(lm, self.INDEX_FINGER_TIP, self.INDEX_FINGER_MCP),
-            not self._is_finger_extended(lm, self.MIDDLE_FINGER_TIP, self.MIDDLE_FINGER_MCP),
-            not self._is_finger_extended(lm, self.RING_FINGER_TIP, self.RING_FINGER_MCP),
-            not self._is_finger_extended(lm, self.PINKY_TIP, self.PINKY_MCP)
-        ]
-        
-        if thumb_extended and sum(fingers_folded) >= 3:
-            return 0.90
-        return 0.0
+    def classify_batch(self, landmarks: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Clasifica un lote de manos de forma totalmente vectorizada.
+        
+        Produce exactamente el mismo resultado que llamar a `classify` con
+        cada mano (ver `batch_result`), pero en unas pocas operaciones NumPy
+        sobre todo el lote. Pensado para ajuste de umbrales, reproducción de
+        sesiones grabadas y evaluación offline.
+        
+        Args:
+            landmarks: Array de forma (N, 21, 3)
+            
+        Returns:
+            Diccionario de columnas de longitud N:
+                - gesture_id: Índice en GESTURES, o -1 si es 'unknown' (int8)
+                - confidence: Confianza del gesto (0.0 si es 'unknown')
+                - cursor_x, cursor_y: Punta del índice (NaN si el gesto no la usa)
+                - pinch_x, pinch_y, pinch_distance: Datos de la pinza (NaN si no es pinza)
+        """
+        lm = np.asarray(landmarks, dtype=np.float64)
+        if lm.ndim != 3 or lm.shape[1:] != (NUM_LANDMARKS, 3):
+            raise ValueError(f"Se esperaba un array (N, 21, 3), recibido {lm.shape}")
+        
+        diffs = lm[:, self._PAIR_A] - lm[:, self._PAIR_B]
+        distances = np.sqrt(np.einsum('nij,nij->ni', diffs, diffs))
+        
+        extended = distances[:, :5] > distances[:, 5:10] * 1.1
+        thumb_ext, index_ext, middle_ext, ring_ext, pinky_ext = extended.T
+        tip_y = lm[:, self.FINGER_TIPS, 1]
+        dist_index_middle, dist_middle_ring, dist_ring_pinky, pinch_distance = distances[:, 10:].T
+        
+        folded_count = 4 - extended[:, 1:].sum(axis=1)
+        extended_count = 4 - folded_count
+        
+        index_highest = (tip_y[:, 1] < tip_y[:, 2]) & (tip_y[:, 1] < tip_y[:, 3]) & (tip_y[:, 1] < tip_y[:, 4])
+        index_point = np.select(
+            [index_ext & ~(middle_ext | ring_ext | pinky_ext) & index_highest,
+             index_ext & ~(middle_ext | ring_ext) & index_highest,
+             index_ext & index_highest],
+            [0.95, 0.85, 0.75], 0.0)
+        
+        fist = np.select([folded_count == 4, folded_count == 3], [0.95, 0.75], 0.0)
+        
+        thumb_up = lm[:, self.THUMB_TIP, 1] < lm[:, self.THUMB_MCP, 1]
+        thumbs_up = np.where(thumb_up & (folded_count >= 3), 0.90, 0.0)
+        
+        fingers_separated = (dist_index_middle > 0.03) & (dist_middle_ring > 0.03) & (dist_ring_pinky > 0.03)
+        open_hand = np.select(
+            [(extended_count >= 4) & thumb_ext & fingers_separated,
+             (extended_count >= 3) & fingers_separated],
+            [0.95, 0.80], 0.0)
+        
+        other_fingers_extended = middle_ext & ring_ext & pinky_ext
+        pinch = np.select(
+            [(pinch_distance < 0.05) & other_fingers_extended,
+             (pinch_distance < 0.08) & other_fingers_extended,
+             pinch_distance < 0.05],
+            [0.95, 0.85, 0.75], 0.0)
+        
+        # Primer gesto (en orden de prioridad) que supera su umbral
+        scores = np.stack([index_point, fist, thumbs_up, open_hand, pinch], axis=1)
+        thresholds = np.array([self.thresholds[name] for name, _ in self.GESTURES])
+        passed = scores >= thresholds
+        detected = passed.any(axis=1)
+        first = passed.argmax(axis=1)
+        
+        gesture_id = np.where(detected, first, -1).astype(np.int8)
+        rows = np.arange(len(lm))
+        confidence = np.where(detected, scores[rows, first], 0.0)
+        
+        # Columnas de detalles, NaN donde el gesto no las define
+        has_cursor = (gesture_id == 0) | (gesture_id == 3)
+        is_pinch = gesture_id == 4
+        center = (lm[:, self.THUMB_TIP, :2] + lm[:, self.INDEX_FINGER_TIP, :2]) / 2
+        
+        return {
+            'gesture_id': gesture_id,
+            'confidence': confidence,
+            'cursor_x': np.where(has_cursor, lm[:, self.INDEX_FINGER_TIP, 0], np.nan),
+            'cursor_y': np.where(has_cursor, lm[:, self.INDEX_FINGER_TIP, 1], np.nan),
+            'pinch_x': np.where(is_pinch, center[:, 0], np.nan),
+            'pinch_y': np.where(is_pinch, center[:, 1], np.nan),
+            'pinch_distance': np.where(is_pinch, pinch_distance, np.nan)
+        }
     
-    def _is_open_hand(self, lm: np.ndarray) -> float:
-        """Detecta mano abierta (🖐️) para scroll."""
-        # Todos los dedos extendidos y separados
-        fingers_extended = [
-            self._is_finger_extended(lm, self.INDEX_FINGER_TIP, self.INDEX_FINGER_MCP),
-            self._is_finger_extended(lm, self.MIDDLE_FINGER_TIP, self.MIDDLE_FINGER_MCP),
-            self._is_finger_extended(lm, self.RING_FINGER_TIP, self.RING_FINGER_MCP),
-            self._is_finger_extended(lm, self.PINKY_TIP, self.PINKY_MCP)
-        ]
-        
-        # Verificar que el pulgar también esté extendido
-        thumb_extended = self._is_finger_extended(lm, self.THUMB_TIP, self.THUMB_CMC)
-        
-        # Verificar que los dedos estén separados (distancia entre puntas)
-        index_tip = lm[self.INDEX_FINGER_TIP]
-        middle_tip = lm[self.MIDDLE_FINGER_TIP]
-        ring_tip = lm[self.RING_FINGER_TIP]
-        pinky_tip = lm[self.PINKY_TIP]
-        
-        # Calcular distancias entre dedos adyacentes
-        dist_index_middle = np.linalg.norm(index_tip - middle_tip)
-        dist_middle_ring = np.linalg.norm(middle_tip - ring_tip)
-        dist_ring_pinky = np.linalg.norm(ring_tip - pinky_tip)
-        
-        # Los dedos deben estar separados
-        fingers_separated = (dist_index_middle > 0.03 and dist_middle_ring > 0.03 and dist_ring_pinky > 0.03)
+    def batch_result(self, batch: Dict[str, np.ndarray], index: int) -> Dict:
+        """Reconstruye, para una fila de `classify_batch`, el diccionario que devolvería `classify`."""
+        gesture_id = int(batch['gesture_id'][index])
+        if gesture_id < 0:
+            return {'gesture': 'unknown', 'confidence': 0.0, 'action': 'none'}
         
-        extended_count = sum(fingers_extended)
-        if extended_count >= 4 and thumb_extended and fingers_separated:
-            return 0.95
-        elif extended_count >= 3 and fingers_separated:
-            return 0.80
-        return 0.0
+        gesture_name, action = self.GESTURES[gesture_id]
+        if gesture_name in ('index_point', 'open_hand'):
+            details = {
+                'cursor_x': float(batch['cursor_x'][index]),
+                'cursor_y': float(batch['cursor_y'][index])
+            }
+        elif gesture_name == 'pinch':
+            details = {
+                'pinch_x': float(batch['pinch_x'][index]),
+                'pinch_y': float(batch['pinch_y'][index]),
+                'distance': float(batch['pinch_distance'][index])
+            }
+        else:
+            details = {}
+        
+        return {
+            'gesture': gesture_name,
+            'confidence': float(batch['confidence'][index]),
+            'action': action,
+            'details': details
+        }
     
-    def _is_pinch(self, lm: np.ndarray) -> float:
-        """Detecta pinza (👌) para drag & drop."""
-        # Distancia entre pulgar e índice muy pequeña
-        thumb_tip = lm[self.THUMB_TIP]
-        index_tip = lm[self.INDEX_FINGER_TIP]
-        
-        distance = np.linalg.norm(thumb_tip - index_tip)
-        
-        # Verificar que los otros dedos estén extendidos para diferenciar de puño
-        middle_extended = self._is_finger_extended(lm, self.MIDDLE_FINGER_TIP, self.MIDDLE_FINGER_MCP)
-        ring_extended = self._is_finger_extended(lm, self.RING_FINGER_TIP, self.RING_FINGER_MCP)
-        pinky_extended = self._is_finger_extended(lm, self.PINKY_TIP, self.PINKY_MCP)
-        
-        other_fingers_extended = middle_extended and ring_extended and pinky_extended
-        
-        # Otros dedos deben estar extendidos para ser una pinza clara
-        if distance < 0.05 and other_fingers_extended:  # Muy cerca y dedos extendidos
-            return 0.95
-        elif distance < 0.08 and other_fingers_extended:  # Cerca y dedos extendidos
-            return 0.85
-        elif distance < 0.05:  # Solo muy cerca
-            return 0.75
-        return 0.0
+    def _extract_features(self, lm: np.ndarray) -> Dict:
+        """
+        Calcula en una sola pasada vectorizada las distancias y flags que
+        usan todos los gestos.
+        
+        Returns:
+            Diccionario con:
+                - extended: Dedo extendido (pulgar, índice, medio, anular, meñique)
+                - tip_y: Coordenada Y de las puntas (mismo orden)
+                - thumb_up: Punta del pulgar por encima de su MCP
+                - tip_distances: Distancias índice-medio, medio-anular,
+                  anular-meñique y pulgar-índice
+        """
+        diffs = lm[self._PAIR_A] - lm[self._PAIR_B]
+        distances = np.sqrt(np.einsum('ij,ij->i', diffs, diffs))
+        
+        # Un dedo está extendido si su punta está un 10% más lejos de la muñeca que su base
+        extended = (distances[:5] > distances[5:10] * 1.1).tolist()
+        
+        return {
+            'extended': extended,
+            'tip_y': lm[self.FINGER_TIPS, 1].tolist(),
+            'thumb_up': bool(lm[self.THUMB_TIP][1] < lm[self.THUMB_MCP][1]),  # Y más bajo = arriba
+            'tip_distances': distances[10:].tolist()
+        }
     
-    def _is_finger_extended(self, lm: np.ndarray, tip_idx: int, mcp_idx: int) -> bool:
-        """Verifica si un dedo está extendido comparando tip con MCP."""
-        tip = lm[tip_idx]
-        mcp = lm[mcp_idx]
+    def _score_gestures(self, features: Dict) -> tuple:
+        """Evalúa la confianza de los 5 gestos a partir de las características compartidas."""
+        thumb_ext, index_ext, middle_ext, ring_ext, pinky_ext = features['extended']
+        _, index_y, middle_y, ring_y, pinky_y = features['tip_y']
+        dist_index_middle, dist_middle_ring, dist_ring_pinky, pinch_distance = features['tip_distances']
         
-        # Un dedo está extendido si su punta está más lejos de la muñeca que su base
-        wrist = lm[self.WRIST]
+        folded_count = 4 - (index_ext + middle_ext + ring_ext + pinky_ext)
+        extended_count = 4 - folded_count
+        
+        # 👆 Índice extendido: el índice debe estar más alto (Y menor) que los otros dedos
+        index_highest = index_y < middle_y and index_y < ring_y and index_y < pinky_y
+        if index_ext and not (middle_ext or ring_ext or pinky_ext) and index_highest:
+            index_point = 0.95
+        elif index_ext and not (middle_ext or ring_ext) and index_highest:
+            index_point = 0.85
+        elif index_ext and index_highest:
+            index_point = 0.75
+        else:
+            index_point = 0.0
+        
+        # ✊ Puño cerrado: todos los dedos doblados
+        fist = 0.95 if folded_count == 4 else 0.75 if folded_count == 3 else 0.0
+        
+        # 👍 Pulgar arriba: pulgar hacia arriba, otros dedos doblados
+        thumbs_up = 0.90 if features['thumb_up'] and folded_count >= 3 else 0.0
+        
+        # 🖐️ Mano abierta: dedos extendidos y separados
+        fingers_separated = (dist_index_middle > 0.03 and dist_middle_ring > 0.03 and dist_ring_pinky > 0.03)
+        if extended_count >= 4 and thumb_ext and fingers_separated:
+            open_hand = 0.95
+        elif extended_count >= 3 and fingers_separated:
+            open_hand = 0.80
+        else:
+            open_hand = 0.0
         
-        tip_dist = np.linalg.norm(tip - wrist)
-        mcp_dist = np.linalg.norm(mcp - wrist)
+        # 👌 Pinza: pulgar e índice juntos, otros dedos extendidos para diferenciar de puño
+        other_fingers_extended = middle_ext and ring_ext and pinky_ext
+        if pinch_distance < 0.05 and other_fingers_extended:
+            pinch = 0.95
+        elif pinch_distance < 0.08 and other_fingers_extended:
+            pinch = 0.85
+        elif pinch_distance < 0.05:
+            pinch = 0.75
+        else:
+            pinch = 0.0
         
-        return tip_dist > mcp_dist * 1.1  # 10% más lejos
+        return index_point, fist, thumbs_up, open_hand, pinch
     
-    def _get_gesture_details(self, gesture_name: str, lm: np.ndarray) -> Dict:
+    def _get_gesture_details(self, gesture_name: str, lm: np.ndarray, features: Dict) -> Dict:
         """Obtiene detalles adicionales del gesto para control más preciso."""
         if gesture_name == 'index_point' or gesture_name == 'open_hand':
             # Posición del índice para movimiento de cursor
@@ -239,6 +317,6 @@ class GestureClassifier:
             return {
                 'pinch_x': float(center[0]),
                 'pinch_y': float(center[1]),
-                'distance': float(np.linalg.norm(thumb_tip - index_tip))
+                'distance': features['tip_distances'][3]
             }
         return {}
\ No newline at end of file
@@ -0,0 +1,421 @@
+"""
+Escritura diferida (write-behind) de los registros de gestos.
+
+Los registros se acumulan en un buffer acotado en memoria y una tarea en
+segundo plano los escribe por lotes cuando se llena un lote o pasa el
+intervalo de volcado. Si el buffer está lleno, `put` espera a que haya
+sitio (contrapresión) en lugar de crecer sin límite.
+
+Backends:
+    SqliteLogBackend  SQLite embebido en modo WAL, sin servicios externos
+    MongoLogBackend   Colección de Motor (upsert por id)
+
+Cada lote actualiza también los agregados por minuto y hora
+(gesture_rollups), de los que salen las estadísticas sin recorrer los
+registros.
+"""
+from abc import ABC, abstractmethod
+import asyncio
+import math
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Union
+import logging
+
+from .gesture_rollups import RollupKey, aggregate, rollup_ranges, summarize
+
+logger = logging.getLogger(__name__)
+
+# Columnas de GestureLog, en orden
+LOG_FIELDS = ('id', 'profile_id', 'gesture', 'confidence', 'action', 'timestamp', 'session_id', 'duration_ms')
+
+# Lotes recientes que recuerda cada agregado de MongoDB para no sumar dos veces un reintento
+ROLLUP_LEDGER_SIZE = 64
+
+
+class LogBackend(ABC):
+    """Destino de los lotes de registros y origen de las estadísticas."""
+
+    async def prepare(self):
+        """Crea índices u otras estructuras (una vez, antes del primer lote)."""
+
+    @abstractmethod
+    async def write_batch(self, docs: List[Dict]):
+        """Guarda un lote; una excepción hace que el sink lo reintente."""
+
+    @abstractmethod
+    async def stats(self, profile_id: Optional[str] = None, start: Optional[float] = None,
+                    end: Optional[float] = None) -> Dict:
+        """
+        Conteos por gesto y acción y confianza media en [start, end) (segundos
+        epoch, redondeados al minuto), a partir de los agregados.
+        """
+
+    @abstractmethod
+    async def recent(self, profile_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Últimos registros en orden cronológico."""
+
+    async def close(self):
+        pass
+
+
+class SqliteLogBackend(LogBackend):
+    """
+    Registros en una base SQLite local. WAL permite leer mientras se
+    escribe y `synchronous=NORMAL` evita un fsync por transacción. Cada
+    lote es una transacción; la escritura va en un hilo para no bloquear
+    el event loop.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS gesture_logs (
+                id TEXT PRIMARY KEY,
+                profile_id TEXT,
+                gesture TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                action TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                session_id TEXT,
+                duration_ms REAL,
+                ts REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS gesture_logs_ts ON gesture_logs (ts);
+            CREATE INDEX IF NOT EXISTS gesture_logs_profile_ts ON gesture_logs (profile_id, ts);
+            CREATE TABLE IF NOT EXISTS gesture_rollups (
+                resolution TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                profile_id TEXT NOT NULL,
+                gesture TEXT NOT NULL,
+                action TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                confidence_sum REAL NOT NULL,
+                PRIMARY KEY (resolution, bucket, profile_id, gesture, action)
+            );
+        """)
+        self.connection.commit()
+        logger.info(f"Registros de gestos en SQLite: {self.path}")
+
+    @staticmethod
+    def _row(doc: Dict) -> tuple:
+        timestamp = doc['timestamp']
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return tuple(doc.get(field) for field in LOG_FIELDS[:5]) + (
+            timestamp.isoformat(), doc.get('session_id'), doc.get('duration_ms'), timestamp.timestamp())
+
+    def write_rows(self, docs: List[Dict]):
+        """
+        Inserta un lote y actualiza sus agregados en una transacción (síncrono).
+        Los registros ya guardados (reintentos, repetidos) no se agregan otra vez.
+        """
+        insert = (f"INSERT OR IGNORE INTO gesture_logs ({', '.join(LOG_FIELDS)}, ts) "
+                  f"VALUES ({', '.join('?' * (len(LOG_FIELDS) + 1))})")
+        rows = [self._row(doc) for doc in docs]
+        with self._lock, self.connection:
+            inserted = [doc for doc, row in zip(docs, rows) if self.connection.execute(insert, row).rowcount]
+            increments = [key + tuple(values) for key, values in aggregate(inserted).items()]
+            self.connection.executemany(
+                "INSERT INTO gesture_rollups (resolution, bucket, profile_id, gesture, action, count, confidence_sum) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (resolution, bucket, profile_id, gesture, action) DO UPDATE SET "
+                "count = count + excluded.count, confidence_sum = confidence_sum + excluded.confidence_sum",
+                increments)
+
+    async def write_batch(self, docs: List[Dict]):
+        await asyncio.get_running_loop().run_in_executor(None, self.write_rows, docs)
+
+    def _stats(self, profile_id: Optional[str], start: Optional[float], end: Optional[float]) -> Dict:
+        ranges = rollup_ranges(start, end)
+        if not ranges:
+            return summarize([])
+        clauses, params = [], []
+        for resolution, low, high in ranges:
+            clause = "(resolution = ?"
+            params.append(resolution)
+            if low != -math.inf:
+                clause += " AND bucket >= ?"
+                params.append(int(low))
+            if high != math.inf:
+                clause += " AND bucket < ?"
+                params.append(int(high))
+            clauses.append(clause + ")")
+        sql = f"SELECT gesture, action, SUM(count), SUM(confidence_sum) FROM gesture_rollups WHERE ({' OR '.join(clauses)})"
+        if profile_id is not None:
+            sql += " AND profile_id = ?"
+            params.append(profile_id)
+        return summarize(self.query(sql + " GROUP BY gesture, action", tuple(params)))
+
+    async def stats(self, profile_id: Optional[str] = None, start: Optional[float] = None,
+                    end: Optional[float] = None) -> Dict:
+        return await asyncio.get_running_loop().run_in_executor(None, self._stats, profile_id, start, end)
+
+    def _recent(self, profile_id: Optional[str], limit: int) -> List[Dict]:
+        # Recorre el índice por ts (o por perfil y ts) desde el final
+        where, params = ("WHERE profile_id = ? ", (profile_id,)) if profile_id is not None else ("", ())
+        rows = self.query(f"SELECT {', '.join(LOG_FIELDS)} FROM gesture_logs {where}ORDER BY ts DESC LIMIT ?",
+                          params + (limit,))
+        return [dict(zip(LOG_FIELDS, row)) for row in reversed(rows)]
+
+    async def recent(self, profile_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        return await asyncio.get_running_loop().run_in_executor(None, self._recent, profile_id, limit)
+
+    def query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Consulta de solo lectura (síncrona)."""
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    async def close(self):
+        with self._lock:
+            self.connection.close()
+
+
+class MongoLogBackend(LogBackend):
+    """
+    Registros en una colección de MongoDB (Motor).
+
+    Sin transacciones, un lote puede fallar a medias y el sink lo reintenta
+    entero, así que cada paso es idempotente:
+        - Los registros se insertan con upsert por `id` (índice único): un
+          reintento o un registro repetido no se duplica.
+        - Un registro nuevo guarda en `rollup_batch` el lote que lo insertó
+          hasta que sus agregados se actualizan; solo esos pendientes se agregan.
+        - Cada agregado recuerda en `applied` los últimos lotes sumados y
+          no vuelve a sumar uno que ya incluye.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.rollups = collection.database['gesture_rollups']
+
+    async def prepare(self):
+        await self.collection.create_index('id', unique=True)
+        await self.collection.create_index('timestamp')
+        await self.collection.create_index([('profile_id', 1), ('timestamp', 1)])
+        await self.rollups.create_index([('resolution', 1), ('bucket', 1), ('profile_id', 1),
+                                         ('gesture', 1), ('action', 1)], unique=True)
+
+    async def write_batch(self, docs: List[Dict]):
+        from pymongo import UpdateOne  # Dependencia de Motor
+
+        token = uuid.uuid4().hex
+        ids = [doc['id'] for doc in docs]
+        await self.collection.bulk_write([
+            UpdateOne({'id': doc['id']},
+                      {'$setOnInsert': {**{k: v for k, v in doc.items() if k != 'id'}, 'rollup_batch': token}},
+                      upsert=True)
+            for doc in docs
+        ], ordered=False)
+
+        # Pendientes de este lote, incluidos los insertados por un intento anterior
+        pending = await self.collection.find({'id': {'$in': ids}, 'rollup_batch': {'$exists': True}},
+                                             {'_id': 0}).to_list(None)
+        if not pending:
+            return
+        batches: Dict[str, List[Dict]] = {}
+        for doc in pending:
+            batches.setdefault(doc['rollup_batch'], []).append(doc)
+        await asyncio.gather(*(
+            self._apply_rollup(batch, key, values)
+            for batch, batch_docs in batches.items()
+            for key, values in aggregate(batch_docs).items()
+        ))
+        await self.collection.update_many({'id': {'$in': [doc['id'] for doc in pending]}},
+                                          {'$unset': {'rollup_batch': ''}})
+
+    async def _apply_rollup(self, batch: str, key: RollupKey, values: List[float]):
+        """Suma los incrementos de `batch` a un agregado, salvo que ya los incluya."""
+        from pymongo.errors import DuplicateKeyError
+
+        resolution, bucket, profile_id, gesture, action = key
+        query = {'resolution': resolution, 'bucket': bucket, 'profile_id': profile_id,
+                 'gesture': gesture, 'action': action, 'applied': {'$ne': batch}}
+        update = {'$inc': {'count': values[0], 'confidence_sum': values[1]},
+                  '$push': {'applied': {'$each': [batch], '$slice': -ROLLUP_LEDGER_SIZE}}}
+        try:
+            await self.rollups.update_one(query, update, upsert=True)
+        except DuplicateKeyError:
+            # El agregado existe: ya incluye el lote (no hay nada que hacer) o lo
+            # acaba de crear otra escritura (se suma sin upsert)
+            await self.rollups.update_one(query, update)
+
+    async def stats(self, profile_id: Optional[str] = None, start: Optional[float] = None,
+                    end: Optional[float] = None) -> Dict:
+        ranges = rollup_ranges(start, end)
+        if not ranges:
+            return summarize([])
+        conditions = []
+        for resolution, low, high in ranges:
+            bucket = {}
+            if low != -math.inf:
+                bucket['$gte'] = int(low)
+            if high != math.inf:
+                bucket['$lt'] = int(high)
+            conditions.append({'resolution': resolution, **({'bucket': bucket} if bucket else {})})
+        match = {'$or': conditions}
+        if profile_id is not None:
+            match['profile_id'] = profile_id
+        groups = await self.rollups.aggregate([
+            {'$match': match},
+            {'$group': {'_id': {'gesture': '$gesture', 'action': '$action'},
+                        'count': {'$sum': '$count'}, 'confidence_sum': {'$sum': '$confidence_sum'}}}
+        ]).to_list(None)
+        return summarize((g['_id']['gesture'], g['_id']['action'], g['count'], g['confidence_sum']) for g in groups)
+
+    async def recent(self, profile_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        query = {'profile_id': profile_id} if profile_id is not None else {}
+        cursor = self.collection.find(query, {'_id': 0, 'rollup_batch': 0}).sort('timestamp', -1).limit(limit)
+        logs = await cursor.to_list(limit)
+        return logs[::-1]
+
+
+class GestureLogSink:
+    """
+    Buffer acotado de registros con volcado por lotes en segundo plano.
+
+    Se usa desde el event loop: `start` lanza la tarea de volcado, `put`
+    añade un registro y `close` vuelca lo pendiente y cierra el backend.
+    """
+
+    def __init__(self,
+                 backend: LogBackend,
+                 max_buffer: int = 1000,
+                 batch_size: int = 100,
+                 flush_interval: float = 1.0,
+                 max_retries: int = 3):
+        """
+        Args:
+            backend: Destino de los lotes
+            max_buffer: Registros pendientes como máximo; `put` espera si se alcanza
+            batch_size: Registros por escritura; un lote completo se vuelca enseguida
+            flush_interval: Segundos máximos que un registro espera en el buffer
+            max_retries: Reintentos de un lote fallido antes de descartarlo
+        """
+        self.backend = backend
+        self.max_buffer = max(1, max_buffer)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+
+        self._buffer: Deque[Dict] = deque()
+        self._space = asyncio.Condition()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # Estadísticas
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+        self.backpressure_waits = 0
+        self.last_flush_ms = 0.0
+
+    def start(self):
+        """Lanza la tarea de volcado (desde el event loop)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, doc: Dict):
+        """
+        Añade un registro. Si el buffer está lleno espera a que el volcado
+        libere sitio.
+        """
+        if self._closed:
+            raise RuntimeError("GestureLogSink cerrado")
+        if len(self._buffer) >= self.max_buffer:
+            self.backpressure_waits += 1
+            self._wake.set()
+            async with self._space:
+                await self._space.wait_for(lambda: len(self._buffer) < self.max_buffer or self._closed)
+            if self._closed:
+                raise RuntimeError("GestureLogSink cerrado")
+        self._buffer.append(doc)
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+
+    @property
+    def pending(self) -> int:
+        """Registros en el buffer."""
+        return len(self._buffer)
+
+    async def _run(self):
+        try:
+            await self.backend.prepare()
+        except Exception as e:
+            logger.error(f"Error preparando el backend de registros: {e}")
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Escribe todo lo pendiente en lotes de `batch_size`."""
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            if not await self._write(batch):
+                break
+            async with self._space:
+                self._space.notify_all()
+
+    async def _write(self, batch: List[Dict]) -> bool:
+        start = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.backend.write_batch(batch)
+                self.written += len(batch)
+                self.batches += 1
+                self.last_flush_ms = (time.perf_counter() - start) * 1000
+                return True
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Error escribiendo {len(batch)} registros de gestos (intento {attempt + 1}): {e}")
+                if attempt < self.max_retries and not self._closed:
+                    await asyncio.sleep(min(0.1 * 2 ** attempt, 2.0))
+
+        # Un backend caído no debe bloquear el pipeline con contrapresión indefinida
+        self.dropped += len(batch)
+        async with self._space:
+            self._space.notify_all()
+        return False
+
+    async def close(self):
+        """Detiene el volcado periódico, escribe lo pendiente y cierra el backend."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._task:
+            await self._task
+        await self.flush()
+        async with self._space:
+            self._space.notify_all()
+        await self.backend.close()
+        logger.info(f"GestureLogSink cerrado ({self.written} registros escritos, {self.dropped} descartados)")
+
+    def get_statistics(self) -> Dict:
+        """Contadores del buffer y de las escrituras."""
+        return {
+            'pending': self.pending,
+            'written': self.written,
+            'batches': self.batches,
+            'failures': self.failures,
+            'dropped': self.dropped,
+            'backpressure_waits': self.backpressure_waits,
+            'last_flush_ms': round(self.last_flush_ms, 3)
+        }
@@ -0,0 +1,348 @@
+from typing import TYPE_CHECKING, Dict, List, Optional
+import logging
+import uuid
+
+import numpy as np
+
+from .frame_protocol import FramePacket, decode_image
+from .detector_pool import DetectorPool
+from .gesture_classifier import GestureClassifier
+from .gesture_processor import GestureProcessor
+from .overlay_renderer import OverlayRenderer
+from .landmarks import DetectedHands, HandRecord
+from .session_recording import SessionRecorder
+from .pipeline_metrics import StageMetrics, StageTimer
+from .roi_preprocessor import RoiPreprocessor
+from .keyframe_tracker import KeyframeTracker
+from .multi_hand import MultiHandProcessor
+from .dynamic_gestures import DynamicGestureRecognizer
+from .motion_gate import MotionGate
+
+if TYPE_CHECKING:
+    # pyautogui necesita un servidor gráfico; el pipeline no lo importa en tiempo de ejecución
+    from .system_controller import SystemController
+
+logger = logging.getLogger(__name__)
+
+
+class GesturePipeline:
+    """
+    Pipeline síncrono de una sesión: decodificación → detección →
+    clasificación → suavizado → acción del sistema.
+
+    Todas las etapas son trabajo de CPU bloqueante, por lo que el servidor
+    lo ejecuta fuera del event loop (ver FrameExecutor). Una instancia
+    mantiene solo el estado ligero de una sesión (suavizado, umbrales);
+    el detector de MediaPipe se toma prestado del pool compartido en cada
+    frame. No debe usarse desde varios hilos a la vez.
+    """
+
+    def __init__(self,
+                 detector_pool: DetectorPool,
+                 classifier: GestureClassifier,
+                 processor: GestureProcessor,
+                 system_controller: 'SystemController',
+                 profile_id: Optional[str] = None,
+                 overlay_renderer: Optional[OverlayRenderer] = None,
+                 include_landmarks: bool = False,
+                 recorder: Optional[SessionRecorder] = None,
+                 global_metrics: Optional[StageMetrics] = None,
+                 include_timings: bool = False,
+                 session_id: Optional[str] = None,
+                 roi_preprocessor: Optional[RoiPreprocessor] = None,
+                 keyframe_tracker: Optional[KeyframeTracker] = None,
+                 multi_hand: Optional[MultiHandProcessor] = None,
+                 dynamic_gestures: Optional[DynamicGestureRecognizer] = None,
+                 motion_gate: Optional[MotionGate] = None):
+        """
+        Args:
+            system_controller: SystemController o ActionActuator (misma
+                `execute_action`; el actuador la ejecuta en su propio hilo)
+            overlay_renderer: Si se indica, se adjunta periódicamente la imagen
+                anotada al resultado (clientes de depuración)
+            include_landmarks: Añadir los landmarks de cada mano al resultado
+            recorder: Si se indica, cada frame procesado se graba en disco
+            global_metrics: Histogramas compartidos por todas las sesiones,
+                además de los propios de la sesión (`stage_metrics`)
+            include_timings: Añadir al resultado la duración de cada etapa (ms)
+            session_id: Identificador de la sesión en métricas y logs
+            roi_preprocessor: Si se indica, MediaPipe recibe un recorte alrededor
+                de la mano seguida o el frame reducido en lugar del frame completo
+            keyframe_tracker: Si se indica, MediaPipe solo se ejecuta en frames
+                clave y entre ellos los landmarks se propagan con flujo óptico
+            multi_hand: Si se indica, se clasifican y siguen todas las manos
+                (estado por lateralidad y combos de dos manos); si no, solo la primera
+            dynamic_gestures: Si se indica, la trayectoria de la mano principal
+                (la primera, o la de `multi_hand`) se compara con gestos dinámicos
+                (deslizamientos, círculos) y el gesto reconocido se añade al resultado en `dynamic`
+            motion_gate: Si se indica, los frames sin cambios respecto al último
+                detectado reutilizan sus manos y, sin nadie delante de la cámara,
+                solo se detecta a baja frecuencia
+        """
+        self.detector_pool = detector_pool
+        self.classifier = classifier
+        self.processor = processor
+        self.system_controller = system_controller
+        self.profile_id = profile_id
+        self.overlay_renderer = overlay_renderer
+        self.include_landmarks = include_landmarks
+        self.recorder = recorder
+        self.stage_metrics = StageMetrics()
+        self.global_metrics = global_metrics
+        self.include_timings = include_timings
+        self.session_id = session_id or uuid.uuid4().hex[:8]
+        self.roi_preprocessor = roi_preprocessor
+        self.keyframe_tracker = keyframe_tracker
+        self.multi_hand = multi_hand
+        self.dynamic_gestures = dynamic_gestures
+        self.motion_gate = motion_gate
+        self._dynamic_key: Optional[str] = None  # Mano cuya trayectoria sigue dynamic_gestures
+
+    def process_frame(self, packet: FramePacket) -> Dict:
+        """
+        Procesa un frame completo.
+
+        Args:
+            packet: Frame recibido del cliente
+
+        Returns:
+            Diccionario de resultado listo para enviar al cliente
+        """
+        timer = StageTimer()
+
+        # Decodificar imagen (JPEG/PNG)
+        image = decode_image(packet)
+        timer.mark('decode')
+
+        if image is None:
+            return {"error": "No se pudo decodificar la imagen"}
+
+        return self.process_image(image, packet.frame_id, packet.timestamp, timer)
+
+    def process_image(self, image: np.ndarray, frame_id: int = 0, timestamp: Optional[float] = None,
+                      timer: Optional[StageTimer] = None) -> Dict:
+        """
+        Procesa un frame ya decodificado (BGR), por ejemplo de la captura
+        local del servidor.
+
+        Args:
+            image: Frame BGR; no se modifica ni se conserva tras la llamada
+            frame_id: Identificador del frame
+            timestamp: Momento de captura en ms (epoch) o None
+            timer: Cronómetro ya iniciado (process_frame lo trae con la decodificación)
+
+        Returns:
+            Diccionario de resultado listo para enviar al cliente
+        """
+        timer = timer or StageTimer()
+
+        # Escena sin cambios o vacía: se reutilizan las manos del último frame detectado
+        detect = True
+        if self.motion_gate:
+            detect = self.motion_gate.should_detect(image)
+            timer.mark('gate')
+        if not detect:
+            hands = self.motion_gate.hands
+        else:
+            hands = self._detect(image, timer)
+            if self.motion_gate:
+                self.motion_gate.record(hands)
+
+        # Clasificar gesto de la primera mano, o de todas en una pasada en modo multi-mano
+        gesture_result = None
+        if hands:
+            if self.multi_hand:
+                gesture_results = self.multi_hand.classify(self.classifier, hands)
+                gesture_result = gesture_results[0]
+            else:
+                gesture_result = self.classifier.classify(hands[0].landmarks)
+            timer.mark('classify')
+
+        if self.multi_hand and hands:
+            result = self._process_multi_hand(hands, gesture_results, timer)
+        else:
+            result = self._process_hands(hands, gesture_result, timer)
+        result['frame_id'] = frame_id
+
+        if self.recorder:
+            self.recorder.record(timestamp, frame_id, hands, gesture_result)
+
+        # Los diccionarios por punto solo se construyen si el cliente los pide
+        if self.include_landmarks and hands:
+            result['landmarks'] = [hand.landmarks_as_dicts() for hand in hands]
+
+        # Imagen anotada solo para clientes suscritos y a frecuencia reducida
+        if self.overlay_renderer and self.overlay_renderer.due():
+            result['overlay'] = self.overlay_renderer.render_data_url(image, hands)
+
+        durations = timer.finish()
+        self.observe(durations)
+        if self.include_timings:
+            result['timings'] = {stage: round(seconds * 1000, 3) for stage, seconds in durations.items()}
+
+        return result
+
+    def _detect(self, image: np.ndarray, timer: StageTimer) -> Optional[DetectedHands]:
+        """Manos del frame: propagadas entre frames clave o detectadas con MediaPipe."""
+        # Entre frames clave las manos se propagan sin ocupar un detector
+        hands = self.keyframe_tracker.propagate(image) if self.keyframe_tracker else None
+        if hands is not None:
+            timer.mark('track')
+            return hands
+
+        # Detectar manos (solo landmarks, sin anotar la imagen)
+        with self.detector_pool.lease(self) as detector:
+            if self.roi_preprocessor:
+                hands = self.roi_preprocessor.detect(detector, image)
+            else:
+                hands = detector.detect_landmarks(image)
+        if self.keyframe_tracker:
+            self.keyframe_tracker.keyframe(image, hands)
+        timer.mark('detect')
+        return hands
+
+    def observe(self, durations: Dict[str, float]):
+        """Registra duraciones de etapas (segundos) en los histogramas de la sesión y globales."""
+        self.stage_metrics.observe(durations)
+        if self.global_metrics:
+            self.global_metrics.observe(durations)
+
+    def _process_hands(self, hands: Optional[DetectedHands], gesture_result: Optional[Dict],
+                       timer: Optional[StageTimer] = None) -> Dict:
+        """Suaviza y ejecuta la acción del gesto clasificado de la primera mano."""
+        if not hands:
+            result = {
+                "gesture": "none",
+                "action": "none",
+                "confidence": 0.0,
+                "hands_detected": 0
+            }
+            self._update_dynamic(result, None)
+            return result
+
+        hand = hands[0]
+
+        # Procesar con suavizado
+        processed = self.processor.process(gesture_result)
+        if timer:
+            timer.mark('process')
+
+        # Ejecutar acción del sistema si el gesto es estable
+        self.dispatch_action(processed, hand)
+        if timer:
+            timer.mark('action')
+
+        result = self._hand_result(processed, hand, len(hands))
+        self._update_dynamic(result, hand)
+        return result
+
+    def _process_multi_hand(self, hands: DetectedHands, gesture_results: List[Dict],
+                            timer: Optional[StageTimer] = None) -> Dict:
+        """
+        Suaviza cada mano con su propio estado y ejecuta la acción de la mano
+        principal, o la del combo de dos manos si hay uno activo.
+        """
+        tracked, combo = self.multi_hand.process(hands, gesture_results)
+        if timer:
+            timer.mark('process')
+
+        key, hand, processed = tracked[0]
+        if combo:
+            # El combo sustituye a las acciones individuales (dos pinzas no son un arrastre)
+            if combo['direction']:
+                self.system_controller.execute_action(combo['action'], {'direction': combo['direction']})
+        else:
+            self.dispatch_action(processed, hand, self.multi_hand.processors[key])
+        if timer:
+            timer.mark('action')
+
+        result = self._hand_result(processed, hand, len(hands))
+        # Resumen compacto de cada mano (la principal primero)
+        result['hands'] = [
+            {'handedness': hand_key, 'gesture': hand_processed['gesture'],
+             'confidence': round(hand_processed['confidence'], 3), 'stable': hand_processed['stable']}
+            for hand_key, _, hand_processed in tracked
+        ]
+        if combo:
+            result['combo'] = {'gesture': combo['gesture'], 'scale': round(combo['scale'], 3),
+                               'direction': combo['direction']}
+        # La trayectoria es la de la mano principal, no la primera en el orden de MediaPipe
+        self._update_dynamic(result, hand, key)
+        return result
+
+    def _update_dynamic(self, result: Dict, hand: Optional[HandRecord], key: Optional[str] = None):
+        """
+        Añade el frame de la mano principal al reconocedor de gestos dinámicos
+        y, si termina uno, lo añade al resultado en `dynamic`.
+
+        Args:
+            hand: Mano principal, o None si no hay mano (corta la trayectoria)
+            key: Identidad de la mano principal en modo multi-mano; si cambia,
+                la trayectoria empieza de nuevo
+        """
+        if not self.dynamic_gestures:
+            return
+        if hand is not None and key != self._dynamic_key:
+            # Otra mano pasa a ser la principal: su trayectoria no continúa la anterior
+            self.dynamic_gestures.history.clear()
+            self._dynamic_key = key
+        dynamic = self.dynamic_gestures.update(hand.landmarks if hand is not None else None)
+        if dynamic:
+            # Evento puntual junto al gesto estático (no ejecuta ninguna acción)
+            result['dynamic'] = {'gesture': dynamic['gesture'], 'confidence': round(dynamic['confidence'], 3),
+                                 'duration_ms': round(dynamic['duration_ms'], 1)}
+
+    @staticmethod
+    def _hand_result(processed: Dict, hand: HandRecord, hands_detected: int) -> Dict:
+        return {
+            "gesture": processed['gesture'],
+            "action": processed['action'],
+            "confidence": processed['confidence'],
+            "stable": processed['stable'],
+            "gesture_changed": processed.get('gesture_changed', False),
+            "duration": processed.get('duration', 0.0),
+            "details": processed.get('details', {}),
+            "hands_detected": hands_detected,
+            "handedness": hand.handedness
+        }
+
+    def dispatch_action(self, processed: Dict, hand: HandRecord,
+                        processor: Optional[GestureProcessor] = None):
+        """
+        Ejecuta en el sistema la acción de un gesto procesado, si es estable.
+
+        Args:
+            processed: Resultado de GestureProcessor.process
+            hand: Mano de la que se clasificó el gesto
+            processor: Procesador de esa mano (por defecto, el de la sesión)
+        """
+        processor = processor or self.processor
+        if not processed['stable'] or processed['action'] == 'none':
+            return
+
+        action_details = {}
+
+        # Preparar detalles según el tipo de acción
+        if processed['action'] == 'move_cursor':
+            details = processed.get('details', {})
+            if 'cursor_x' in details and 'cursor_y' in details:
+                # Posición filtrada por el procesador (One Euro / Kalman)
+                action_details['position'] = (details['cursor_x'], details['cursor_y'])
+            else:
+                # Posición de la punta del índice, ya normalizada (0-1) por MediaPipe
+                index_tip = hand.landmarks[GestureClassifier.INDEX_FINGER_TIP]
+                action_details['position'] = (float(index_tip[0]), float(index_tip[1]))
+        elif processed['action'] == 'scroll':
+            # Determinar dirección del scroll basado en la posición de la mano
+            palm_y = float(hand.landmarks[GestureClassifier.WRIST][1])  # Centro de la palma
+            prev_y = processor.get_previous_position()[1] if processor.get_previous_position() else palm_y
+            action_details['direction'] = 'up' if palm_y < prev_y else 'down'
+
+        # Ejecutar la acción correspondiente
+        self.system_controller.execute_action(processed['action'], action_details)
+
+    def close(self):
+        """Libera los recursos de la sesión."""
+        self.detector_pool.release_session(self)
+        if self.recorder:
+            self.recorder.close()
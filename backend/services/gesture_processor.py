@@ -1,9 +1,11 @@
-import numpy as np
-from typing import Dict, List, Optional, Deque
-from collections import deque
+from typing import Dict, Optional
+import copy
 import logging
 import time
 
+from .gesture_stabilizer import GestureStabilizer
+from .position_filters import ExponentialFilter, PositionFilter
+
 logger = logging.getLogger(__name__)
 
 class GestureProcessor:
@@ -13,24 +15,34 @@ class GestureProcessor:
     """
     
     def __init__(self, 
-                 buffer_size: int = 5,
-                 min_consecutive: int = 3,
-                 smoothing_factor: float = 0.5):
+                 window_ms: float = 200.0,
+                 enter_evidence: float = 1.5,
+                 confirm_confidence: float = 0.9,
+                 smoothing_factor: float = 0.5,
+                 position_filter: Optional[PositionFilter] = None):
         """
         Inicializa el procesador.
         
         Args:
-            buffer_size: Tamaño del buffer circular para gestos
-            min_consecutive: Número mínimo de detecciones consecutivas
-            smoothing_factor: Factor de suavizado para posiciones (0-1)
+            window_ms: Ventana temporal de votación del estabilizador
+            enter_evidence: Suma de confianzas necesaria para confirmar un gesto
+            confirm_confidence: Confianza con la que un solo frame confirma el gesto
+            smoothing_factor: Factor de suavizado para posiciones (0-1), si no
+                se indica `position_filter`
+            position_filter: Filtro del cursor y la pinza (ver position_filters);
+                cada tipo de posición usa su propia copia
         """
-        self.buffer_size = buffer_size
-        self.min_consecutive = min_consecutive
         self.smoothing_factor = smoothing_factor
+        position_filter = position_filter or ExponentialFilter(smoothing_factor)
+        self.position_filters: Dict[str, PositionFilter] = {
+            'cursor': position_filter,
+            'pinch': copy.deepcopy(position_filter)
+        }
         
-        # Buffers para suavizado
-        self.gesture_buffer: Deque[Dict] = deque(maxlen=buffer_size)
-        self.position_buffer: Deque[tuple] = deque(maxlen=buffer_size)
+        # Votación incremental con histéresis
+        self.stabilizer = GestureStabilizer(window_ms=window_ms, enter_evidence=enter_evidence,
+                                            confirm_confidence=confirm_confidence)
+        self.latest_by_gesture: Dict[str, Dict] = {}  # Última clasificación de cada gesto
         
         # Estado actual
         self.current_gesture: Optional[str] = None
@@ -43,19 +55,22 @@ class GestureProcessor:
         self.total_gestures_processed: int = 0
         self.gesture_counts: Dict[str, int] = {}
         
-        logger.info(f"GestureProcessor inicializado (buffer={buffer_size}, min_consecutive={min_consecutive})")
+        logger.info(f"GestureProcessor inicializado (ventana={window_ms:.0f} ms, evidencia={enter_evidence})")
     
-    def process(self, gesture_data: Dict) -> Dict:
+    def process(self, gesture_data: Dict, timestamp: Optional[float] = None) -> Dict:
         """
         Procesa un gesto detectado y aplica suavizado temporal.
         
         Args:
             gesture_data: Diccionario con gesture, confidence, action, details
+            timestamp: Instante del frame en segundos (por defecto, time.monotonic());
+                al reproducir grabaciones se pasa el tiempo grabado
             
         Returns:
             Gesto procesado y suavizado con información adicional
         """
         self.total_gestures_processed += 1
+        now = time.monotonic() if timestamp is None else timestamp
         
         # Guardar posición anterior si está disponible en details
         if 'details' in gesture_data and any(k in gesture_data['details'] for k in ['cursor_x', 'cursor_y', 'pinch_x', 'pinch_y']):
@@ -65,13 +80,14 @@ class GestureProcessor:
             elif 'pinch_x' in details and 'pinch_y' in details:
                 self.previous_position = (details['pinch_x'], details['pinch_y'])
         
-        # Añadir al buffer
-        self.gesture_buffer.append(gesture_data)
-        
-        # Obtener gesto más frecuente en el buffer
-        stable_gesture = self._get_stable_gesture()
+        # Actualizar la votación y obtener el gesto estable
+        self.latest_by_gesture[gesture_data['gesture']] = gesture_data
+        stable_name = self.stabilizer.update(gesture_data['gesture'], gesture_data['confidence'], now * 1000)
         
-        if not stable_gesture:
+        if not stable_name:
+            # Sin gesto estable: al volver a confirmarse contará como un cambio
+            self.current_gesture = None
+            self.current_action = None
             return {
                 'gesture': 'unknown',
                 'action': 'none',
@@ -79,32 +95,36 @@ class GestureProcessor:
                 'stable': False
             }
         
+        # El más reciente de ese tipo, con la confianza media de la ventana
+        stable_gesture = self.latest_by_gesture[stable_name]
+        
         # Detectar cambio de gesto
         gesture_changed = stable_gesture['gesture'] != self.current_gesture
         
         if gesture_changed:
             if self.current_gesture:
-                duration = time.time() - self.gesture_start_time
+                duration = now - self.gesture_start_time
                 logger.debug(f"Gesto cambió de {self.current_gesture} a {stable_gesture['gesture']} (duración: {duration:.2f}s)")
             
             self.current_gesture = stable_gesture['gesture']
             self.current_action = stable_gesture['action']
-            self.gesture_start_time = time.time()
+            self.gesture_start_time = now
             
             # Actualizar contadores
             self.gesture_counts[self.current_gesture] = self.gesture_counts.get(self.current_gesture, 0) + 1
         
-        # Suavizar posición si el gesto la incluye
-        smoothed_details = self._smooth_position(stable_gesture.get('details', {}))
+        # Filtrar posición si el gesto la incluye; solo el frame actual aporta una medida nueva
+        fresh = gesture_data['gesture'] == stable_name
+        smoothed_details = self._filter_position(stable_gesture.get('details', {}), now, fresh, gesture_changed)
         
         # Construir respuesta
         result = {
             'gesture': stable_gesture['gesture'],
             'action': stable_gesture['action'],
-            'confidence': stable_gesture['confidence'],
+            'confidence': self.stabilizer.mean_confidence(stable_name),
             'stable': True,
             'gesture_changed': gesture_changed,
-            'duration': time.time() - self.gesture_start_time,
+            'duration': now - self.gesture_start_time,
             'details': smoothed_details
         }
         
@@ -119,89 +139,53 @@ class GestureProcessor:
         """
         return self.previous_position
     
-    def _get_stable_gesture(self) -> Optional[Dict]:
-        """
-        Obtiene el gesto más estable del buffer.
-        Requiere un número mínimo de detecciones consecutivas.
-        """
-        if len(self.gesture_buffer) < self.min_consecutive:
-            return None
-        
-        # Contar frecuencias en el buffer
-        gesture_votes: Dict[str, List[Dict]] = {}
-        
-        for gesture_data in self.gesture_buffer:
-            gesture_name = gesture_data['gesture']
-            if gesture_name not in gesture_votes:
-                gesture_votes[gesture_name] = []
-            gesture_votes[gesture_name].append(gesture_data)
-        
-        # Encontrar el gesto más votado
-        if not gesture_votes:
-            return None
-        
-        most_common_gesture = max(gesture_votes.items(), key=lambda x: len(x[1]))
-        gesture_name, occurrences = most_common_gesture
-        
-        # Verificar que tenga suficientes votos
-        if len(occurrences) < self.min_consecutive:
-            return None
-        
-        # Calcular confianza promedio
-        avg_confidence = np.mean([g['confidence'] for g in occurrences])
-        
-        # Retornar el gesto más reciente de ese tipo con la confianza promedio
-        stable = occurrences[-1].copy()
-        stable['confidence'] = float(avg_confidence)
-        
-        return stable
-    
-    def _smooth_position(self, details: Dict) -> Dict:
+    def _filter_position(self, details: Dict, now: float, fresh: bool = True,
+                         restart: bool = False) -> Dict:
         """
-        Suaviza las coordenadas de posición usando un filtro exponencial.
+        Filtra las coordenadas del cursor o de la pinza.
+
+        Args:
+            details: Detalles del gesto estable
+            now: Instante del frame en segundos
+            fresh: Si los detalles son del frame actual; si no, se repite la
+                última posición filtrada sin alimentar el filtro
+            restart: Reiniciar el filtro (el gesto acaba de confirmarse)
         """
         if not details:
             return details
         
-        # Identificar coordenadas a suavizar
-        position_keys = []
+        # Identificar coordenadas a filtrar
         if 'cursor_x' in details and 'cursor_y' in details:
-            position_keys = ['cursor_x', 'cursor_y']
+            kind, position_keys = 'cursor', ('cursor_x', 'cursor_y')
         elif 'pinch_x' in details and 'pinch_y' in details:
-            position_keys = ['pinch_x', 'pinch_y']
-        
-        if not position_keys:
+            kind, position_keys = 'pinch', ('pinch_x', 'pinch_y')
+        else:
             return details
         
-        current_pos = (details[position_keys[0]], details[position_keys[1]])
-        
-        # Aplicar suavizado exponencial
-        if self.last_position:
-            smoothed_x = (self.smoothing_factor * current_pos[0] + 
-                         (1 - self.smoothing_factor) * self.last_position[0])
-            smoothed_y = (self.smoothing_factor * current_pos[1] + 
-                         (1 - self.smoothing_factor) * self.last_position[1])
-            
-            smoothed_pos = (smoothed_x, smoothed_y)
-        else:
-            smoothed_pos = current_pos
+        position_filter = self.position_filters[kind]
+        if restart:
+            position_filter.reset()
         
-        self.last_position = smoothed_pos
+        if fresh or self.last_position is None:
+            current_pos = (details[position_keys[0]], details[position_keys[1]])
+            self.last_position = position_filter.update(current_pos, now)
         
         # Actualizar detalles
         smoothed_details = details.copy()
-        smoothed_details[position_keys[0]] = float(smoothed_pos[0])
-        smoothed_details[position_keys[1]] = float(smoothed_pos[1])
+        smoothed_details[position_keys[0]] = float(self.last_position[0])
+        smoothed_details[position_keys[1]] = float(self.last_position[1])
         
         return smoothed_details
     
     def reset(self):
         """Reinicia el estado del procesador."""
-        self.gesture_buffer.clear()
-        self.position_buffer.clear()
+        self.stabilizer.reset()
+        self.latest_by_gesture.clear()
         self.current_gesture = None
         self.current_action = None
         self.last_position = None
+        for position_filter in self.position_filters.values():
+            position_filter.reset()
         logger.info("GestureProcessor reiniciado")
     
     def get_statistics(self) -> Dict:
@@ -210,5 +194,5 @@ class GestureProcessor:
             'total_processed': self.total_gestures_processed,
             'gesture_counts': self.gesture_counts,
             'current_gesture': self.current_gesture,
-            'buffer_size': len(self.gesture_buffer)
+            'window_frames': len(self.stabilizer)
         }
\ No newline at end of file
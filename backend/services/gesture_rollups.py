@@ -0,0 +1,95 @@
+"""
+Agregados incrementales de los registros de gestos.
+
+Cada lote de registros actualiza contadores por (resolución, inicio del
+bucket, perfil, gesto, acción) con el número de registros y la suma de
+confianzas, en buckets de minuto y de hora. Las estadísticas de cualquier
+rango se calculan con los buckets de hora completos del rango y los de
+minuto de los extremos, así que su coste depende de la duración del rango
+y no del número de registros.
+"""
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RESOLUTIONS = {'minute': 60, 'hour': 3600}
+
+# (resolución, bucket, perfil, gesto, acción) -> [registros, suma de confianzas]
+RollupKey = Tuple[str, int, str, str, str]
+
+
+def log_time(doc: Dict) -> float:
+    """Instante del registro en segundos epoch (acepta datetime o ISO 8601)."""
+    timestamp = doc['timestamp']
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return timestamp.timestamp()
+
+
+def aggregate(docs: Iterable[Dict]) -> Dict[RollupKey, List[float]]:
+    """
+    Agrupa un lote en incrementos por bucket. El perfil ausente se guarda
+    como '' para que forme parte de la clave.
+    """
+    increments: Dict[RollupKey, List[float]] = {}
+    for doc in docs:
+        ts = log_time(doc)
+        for resolution, seconds in RESOLUTIONS.items():
+            key = (resolution, int(ts // seconds) * seconds, doc.get('profile_id') or '',
+                   doc['gesture'], doc['action'])
+            entry = increments.get(key)
+            if entry is None:
+                increments[key] = [1, doc['confidence']]
+            else:
+                entry[0] += 1
+                entry[1] += doc['confidence']
+    return increments
+
+
+def rollup_ranges(start: Optional[float], end: Optional[float]) -> List[Tuple[str, float, float]]:
+    """
+    Rangos [desde, hasta) de buckets que cubren [start, end) con la menor
+    cantidad de buckets: horas completas en el centro y minutos en los
+    extremos. Los límites se redondean al minuto.
+
+    Returns:
+        Lista de (resolución, inicio mínimo, inicio máximo exclusivo)
+    """
+    low = -math.inf if start is None else math.floor(start / 60) * 60
+    high = math.inf if end is None else math.ceil(end / 60) * 60
+    if low >= high:
+        return []
+
+    hour_low = low if low == -math.inf else math.ceil(low / 3600) * 3600
+    hour_high = high if high == math.inf else math.floor(high / 3600) * 3600
+    if hour_low >= hour_high:
+        return [('minute', low, high)]
+
+    ranges = [('hour', hour_low, hour_high)]
+    if low < hour_low:
+        ranges.append(('minute', low, hour_low))
+    if hour_high < high:
+        ranges.append(('minute', hour_high, high))
+    return ranges
+
+
+def summarize(rows: Iterable[Tuple[str, str, int, float]]) -> Dict:
+    """
+    Resumen a partir de filas (gesto, acción, registros, suma de confianzas).
+    """
+    gesture_counts: Dict[str, int] = {}
+    action_counts: Dict[str, int] = {}
+    confidence_sums: Dict[str, float] = {}
+    total = 0
+    for gesture, action, count, confidence_sum in rows:
+        count = int(count)
+        total += count
+        gesture_counts[gesture] = gesture_counts.get(gesture, 0) + count
+        action_counts[action] = action_counts.get(action, 0) + count
+        confidence_sums[gesture] = confidence_sums.get(gesture, 0.0) + confidence_sum
+    return {
+        'total_gestures': total,
+        'gesture_counts': gesture_counts,
+        'action_counts': action_counts,
+        'mean_confidence': {gesture: confidence_sums[gesture] / gesture_counts[gesture] for gesture in gesture_counts}
+    }
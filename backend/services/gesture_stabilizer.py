@@ -0,0 +1,115 @@
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class GestureStabilizer:
+    """
+    Decide qué gesto es estable a partir de las clasificaciones recientes.
+
+    Mantiene una ventana temporal (en ms) con conteos de votos y sumas de
+    confianza por gesto que se actualizan de forma incremental al entrar y
+    salir cada frame, así que el coste por frame es O(1) amortizado.
+
+    La decisión usa histéresis ponderada por confianza:
+        - Entrada: un gesto pasa a ser el estable cuando la suma de sus
+          confianzas en la ventana alcanza `enter_evidence` (o el frame
+          actual alcanza por sí solo `confirm_confidence`) y su confianza
+          media por frame de la ventana alcanza `enter_share`. Con los
+          valores por defecto, un frame muy seguro (≥ 0.9) confirma al
+          instante, dos seguros (≥ 0.75) bastan y uno débil y aislado no.
+          La condición de `enter_share` impide que un único frame cambie
+          un gesto ya estable en una ventana con varios frames.
+        - Salida: el gesto estable se mantiene hasta que otro cumple la
+          condición de entrada o su confianza media por frame cae por
+          debajo de `exit_share` (frames 'unknown' o de otros gestos).
+    """
+
+    def __init__(self,
+                 window_ms: float = 200.0,
+                 enter_evidence: float = 1.5,
+                 confirm_confidence: float = 0.9,
+                 enter_share: float = 0.4,
+                 exit_share: float = 0.2,
+                 min_frames: int = 2):
+        """
+        Args:
+            window_ms: Duración de la ventana de votación
+            enter_evidence: Suma de confianzas necesaria para confirmar un gesto
+            confirm_confidence: Confianza con la que un solo frame confirma el gesto
+                (> 1 desactiva la confirmación en un frame)
+            enter_share: Confianza media por frame de la ventana para confirmarlo
+            exit_share: Confianza media por frame por debajo de la cual se abandona
+            min_frames: Frames que la ventana conserva aunque sean más antiguos
+                que `window_ms` (a pocos FPS la ventana no se queda vacía)
+        """
+        self.window_ms = window_ms
+        self.enter_evidence = enter_evidence
+        self.confirm_confidence = confirm_confidence
+        self.enter_share = enter_share
+        self.exit_share = exit_share
+        self.min_frames = max(1, min_frames)
+
+        self._window: Deque[Tuple[float, str, float]] = deque()
+        self.votes: Dict[str, int] = {}
+        self.confidence_sums: Dict[str, float] = {}
+        self.current: Optional[str] = None
+
+    def update(self, gesture: str, confidence: float, timestamp_ms: float) -> Optional[str]:
+        """
+        Añade una clasificación y devuelve el gesto estable (None si no hay).
+
+        Args:
+            gesture: Gesto clasificado en el frame ('unknown' si ninguno)
+            confidence: Confianza del clasificador (0-1)
+            timestamp_ms: Instante del frame en ms (reloj monotónico)
+        """
+        self._window.append((timestamp_ms, gesture, confidence))
+        self.votes[gesture] = self.votes.get(gesture, 0) + 1
+        self.confidence_sums[gesture] = self.confidence_sums.get(gesture, 0.0) + confidence
+        self._evict(timestamp_ms - self.window_ms)
+
+        frames = len(self._window)
+
+        # Solo el gesto recién observado puede ganar evidencia en este frame
+        if gesture != self.current and gesture != 'unknown':
+            evidence = self.confidence_sums[gesture]
+            confident = evidence >= self.enter_evidence or confidence >= self.confirm_confidence
+            if confident and evidence >= self.enter_share * frames:
+                self.current = gesture
+                return self.current
+
+        if self.current is not None and self.confidence_sums.get(self.current, 0.0) < self.exit_share * frames:
+            self.current = None
+
+        return self.current
+
+    def _evict(self, cutoff_ms: float):
+        window = self._window
+        while len(window) > self.min_frames and window[0][0] < cutoff_ms:
+            _, gesture, confidence = window.popleft()
+            remaining = self.votes[gesture] - 1
+            if remaining:
+                self.votes[gesture] = remaining
+                self.confidence_sums[gesture] -= confidence
+            else:
+                # Eliminar la entrada evita acumular error de redondeo en la suma
+                del self.votes[gesture]
+                del self.confidence_sums[gesture]
+
+    def mean_confidence(self, gesture: str) -> float:
+        """Confianza media de un gesto en la ventana actual."""
+        votes = self.votes.get(gesture)
+        return self.confidence_sums[gesture] / votes if votes else 0.0
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    def reset(self):
+        """Vacía la ventana y olvida el gesto estable."""
+        self._window.clear()
+        self.votes.clear()
+        self.confidence_sums.clear()
+        self.current = None
@@ -1,9 +1,11 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import logging
 
+from .landmarks import NUM_LANDMARKS, DetectedHands, landmarks_to_array
+
 logger = logging.getLogger(__name__)
 
 class HandDetector:
@@ -39,6 +41,27 @@ class HandDetector:
         
         logger.info(f"HandDetector inicializado con max_hands={max_num_hands}")
     
+    def detect_landmarks(self, image: np.ndarray) -> Optional[DetectedHands]:
+        """
+        Detecta manos y devuelve solo sus puntos clave, sin copiar ni anotar la imagen.
+        
+        Es el modo usado en el pipeline en tiempo real; la visualización se
+        genera aparte y solo cuando se solicita (ver OverlayRenderer).
+        
+        Args:
+            image: Imagen BGR (formato OpenCV)
+            
+        Returns:
+            DetectedHands con los landmarks en un array (manos, 21, 3) float32,
+            o None si no hay manos
+        """
+        results = self._process(image)
+        
+        if not (results.multi_hand_landmarks and results.multi_handedness):
+            return None
+        
+        return self._to_detected_hands(results)
+    
     def detect(self, image: np.ndarray) -> Tuple[Optional[List[Dict]], np.ndarray]:
         """
         Detecta manos en una imagen y extrae puntos clave.
@@ -53,11 +76,7 @@ class HandDetector:
                 - handedness: 'Left' o 'Right'
                 - confidence: Nivel de confianza de la detección
         """
-        # Convertir BGR a RGB
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # Procesar imagen
-        results = self.hands.process(image_rgb)
+        results = self._process(image)
         
         # Crear imagen anotada
         annotated_image = image.copy()
@@ -65,7 +84,7 @@ class HandDetector:
         hands_data = []
         
         if results.multi_hand_landmarks and results.multi_handedness:
-            for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+            for hand_landmarks in results.multi_hand_landmarks:
                 # Dibujar landmarks en la imagen
                 self.mp_drawing.draw_landmarks(
                     annotated_image,
@@ -74,37 +93,48 @@ class HandDetector:
                     self.mp_drawing_styles.get_default_hand_landmarks_style(),
                     self.mp_drawing_styles.get_default_hand_connections_style()
                 )
-                
-                # Extraer información de la mano
-                landmarks = []
-                for landmark in hand_landmarks.landmark:
-                    landmarks.append({
-                        'x': landmark.x,
-                        'y': landmark.y,
-                        'z': landmark.z
-                    })
-                
-                hand_info = {
-                    'landmarks': landmarks,
-                    'handedness': handedness.classification[0].label,
-                    'confidence': handedness.classification[0].score
-                }
-                
-                hands_data.append(hand_info)
+            
+            hands_data = [hand.to_dict() for hand in self._to_detected_hands(results)]
         
         return hands_data if hands_data else None, annotated_image
     
-    def get_landmark_array(self, landmarks: List[Dict]) -> np.ndarray:
+    def _process(self, image: np.ndarray):
+        """Ejecuta el grafo de MediaPipe sobre una imagen BGR."""
+        # Convertir BGR a RGB
+        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        
+        # Procesar imagen
+        return self.hands.process(image_rgb)
+    
+    def _to_detected_hands(self, results) -> DetectedHands:
+        """Copia los landmarks de MediaPipe a un único bloque contiguo float32."""
+        hand_count = len(results.multi_hand_landmarks)
+        landmarks = np.empty((hand_count, NUM_LANDMARKS, 3), dtype=np.float32)
+        handedness = []
+        confidences = []
+        
+        for i, (hand_landmarks, hand_class) in enumerate(zip(results.multi_hand_landmarks, results.multi_handedness)):
+            landmarks[i] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+            handedness.append(hand_class.classification[0].label)
+            confidences.append(hand_class.classification[0].score)
+        
+        return DetectedHands(landmarks, handedness, confidences)
+    
+    def get_landmark_array(self, landmarks: Union[np.ndarray, List[Dict]]) -> np.ndarray:
         """
         Convierte landmarks a un array numpy para procesamiento.
         
         Args:
-            landmarks: Lista de puntos clave
+            landmarks: Array (21, 3) o lista de puntos clave en diccionarios
             
         Returns:
             Array numpy de forma (21, 3) con coordenadas x, y, z
         """
-        return np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks])
+        return landmarks_to_array(landmarks)
+    
+    def reset(self):
+        """Reinicia el grafo descartando el estado de seguimiento entre frames."""
+        self.hands.reset()
     
     def close(self):
         """Libera recursos."""
@@ -0,0 +1,202 @@
+from typing import Dict, Optional
+import logging
+
+import cv2
+import numpy as np
+
+from .landmarks import DetectedHands
+
+logger = logging.getLogger(__name__)
+
+
+class KeyframeTracker:
+    """
+    Ejecuta MediaPipe solo en frames clave y propaga los landmarks entre
+    ellos con flujo óptico disperso (Lucas-Kanade) sobre los 21 puntos.
+
+    El intervalo entre frames clave se adapta:
+        - Crece en uno (hasta `max_interval`) cuando, al llegar el frame
+          clave, los landmarks propagados coinciden con los detectados
+          (deriva menor que `drift_threshold`).
+        - Se reduce a la mitad si la deriva es grande o el movimiento de la
+          mano entre frames supera `motion_threshold`; en ese caso el frame
+          actual se detecta de nuevo en lugar de propagarse.
+        - Vuelve a 1 si MediaPipe no encuentra mano o su confianza es
+          menor que `min_confidence`.
+
+    Tanto la deriva como el movimiento se miden relativos al tamaño de la
+    mano, así que no dependen de la resolución ni de la distancia a la cámara.
+
+    Uso por frame:
+        hands = tracker.propagate(image)
+        if hands is None:              # toca frame clave
+            hands = detector.detect_landmarks(image)
+            tracker.keyframe(image, hands)
+    """
+
+    _LK_PARAMS = dict(winSize=(21, 21), maxLevel=3,
+                      criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+
+    def __init__(self,
+                 max_interval: int = 4,
+                 motion_threshold: float = 0.08,
+                 drift_threshold: float = 0.06,
+                 min_confidence: float = 0.8,
+                 min_tracked_ratio: float = 0.7,
+                 track_size: int = 640):
+        """
+        Args:
+            max_interval: Máximo de frames entre dos detecciones de MediaPipe
+            motion_threshold: Desplazamiento por frame (relativo al tamaño de la
+                mano) a partir del cual se fuerza un frame clave
+            drift_threshold: Error medio propagado vs detectado (relativo al tamaño
+                de la mano) por encima del cual se reduce el intervalo
+            min_confidence: Confianza de MediaPipe mínima para propagar
+            min_tracked_ratio: Fracción mínima de puntos seguidos por el flujo óptico
+            track_size: Lado mayor (px) de la imagen en grises usada por el flujo
+        """
+        self.max_interval = max(1, max_interval)
+        self.motion_threshold = motion_threshold
+        self.drift_threshold = drift_threshold
+        self.min_confidence = min_confidence
+        self.min_tracked_ratio = min_tracked_ratio
+        self.track_size = track_size
+
+        self.interval = 1
+        self._since_keyframe = 0
+        self._hands: Optional[DetectedHands] = None   # últimas manos (coordenadas normalizadas)
+        self._gray: Optional[np.ndarray] = None       # imagen en grises del último frame
+        self._predicted: Optional[np.ndarray] = None  # propagación al frame actual, si se calculó
+        self._current_gray: Optional[np.ndarray] = None
+
+        # Estadísticas
+        self.keyframes = 0
+        self.tracked_frames = 0
+        self.forced_keyframes = 0
+        self.drift_sum = 0.0
+        self.drift_samples = 0
+
+    def propagate(self, image: np.ndarray) -> Optional[DetectedHands]:
+        """
+        Propaga las manos del frame anterior a `image`.
+
+        Returns:
+            Manos propagadas, o None si este frame debe ser un frame clave
+        """
+        self._predicted = None
+        self._current_gray = None
+        if self._hands is None:
+            return None
+
+        gray = self._to_gray(image)
+        self._current_gray = gray
+        if self._gray is None or gray.shape != self._gray.shape:
+            return None
+
+        height, width = gray.shape
+        previous = self._hands.landmarks[..., :2] * (width, height)
+        points, status, _ = cv2.calcOpticalFlowPyrLK(self._gray, gray, previous.reshape(-1, 1, 2).astype(np.float32),
+                                                     None, **self._LK_PARAMS)
+        points = points.reshape(previous.shape)
+        tracked = status.reshape(previous.shape[:2]).astype(bool)
+
+        # Puntos perdidos: desplazamiento mediano de su mano
+        displacement = points - previous
+        for i in range(len(previous)):
+            if not tracked[i].any():
+                return self._force_keyframe()
+            median = np.median(displacement[i][tracked[i]], axis=0)
+            displacement[i][~tracked[i]] = median
+        self._predicted = previous + displacement
+
+        self._since_keyframe += 1
+        if self._since_keyframe >= self.interval:
+            return None
+        if tracked.mean() < self.min_tracked_ratio:
+            return self._force_keyframe()
+
+        motion = np.median(np.linalg.norm(displacement, axis=-1), axis=-1) / self._hand_size(previous)
+        if motion.max() > self.motion_threshold:
+            return self._force_keyframe()
+
+        landmarks = self._hands.landmarks.copy()
+        landmarks[..., :2] = self._predicted / (width, height)
+        hands = DetectedHands(landmarks, [h.handedness for h in self._hands],
+                              [h.confidence for h in self._hands])
+        self._hands = hands
+        self._gray = gray
+        self.tracked_frames += 1
+        return hands
+
+    def keyframe(self, image: np.ndarray, hands: Optional[DetectedHands]):
+        """
+        Registra el resultado de MediaPipe en un frame clave y adapta el intervalo.
+
+        Args:
+            image: Frame procesado
+            hands: Manos detectadas por MediaPipe o None
+        """
+        self.keyframes += 1
+        self._since_keyframe = 0
+        gray = self._current_gray if self._current_gray is not None else self._to_gray(image)
+
+        if not hands or min(h.confidence for h in hands) < self.min_confidence:
+            self.interval = 1
+        elif self._predicted is not None and len(self._predicted) == len(hands):
+            # Deriva de la propagación respecto a la detección en el mismo frame
+            height, width = gray.shape
+            detected = hands.landmarks[..., :2] * (width, height)
+            drift = float(np.max(np.linalg.norm(self._predicted - detected, axis=-1).mean(axis=-1)
+                                 / self._hand_size(detected)))
+            self.drift_sum += drift
+            self.drift_samples += 1
+            if drift > self.drift_threshold:
+                self.interval = max(1, self.interval // 2)
+            else:
+                self.interval = min(self.max_interval, self.interval + 1)
+        else:
+            self.interval = min(self.max_interval, self.interval + 1)
+
+        self._hands = hands
+        self._gray = gray if hands else None
+        self._predicted = None
+        self._current_gray = None
+
+    def _force_keyframe(self) -> None:
+        self.forced_keyframes += 1
+        self.interval = max(1, self.interval // 2)
+        return None
+
+    def _to_gray(self, image: np.ndarray) -> np.ndarray:
+        height, width = image.shape[:2]
+        scale = self.track_size / max(width, height) if self.track_size else 1.0
+        if scale < 1.0:
+            image = cv2.resize(image, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    @staticmethod
+    def _hand_size(points: np.ndarray) -> np.ndarray:
+        """Diagonal de la caja de cada mano (n,) en píxeles."""
+        extent = points.max(axis=1) - points.min(axis=1)
+        return np.maximum(np.linalg.norm(extent, axis=-1), 1.0)
+
+    def reset(self):
+        """Olvida el seguimiento (el siguiente frame será clave)."""
+        self.interval = 1
+        self._since_keyframe = 0
+        self._hands = None
+        self._gray = None
+        self._predicted = None
+        self._current_gray = None
+
+    def get_statistics(self) -> Dict:
+        """Frames clave, frames propagados e intervalo actual."""
+        total = self.keyframes + self.tracked_frames
+        return {
+            'keyframes': self.keyframes,
+            'tracked_frames': self.tracked_frames,
+            'forced_keyframes': self.forced_keyframes,
+            'interval': self.interval,
+            'keyframe_ratio': self.keyframes / total if total else 0.0,
+            'mean_drift': self.drift_sum / self.drift_samples if self.drift_samples else 0.0
+        }
@@ -0,0 +1,75 @@
+"""
+Representación compacta de landmarks de mano compartida por el pipeline.
+
+Los puntos viajan como arrays float32 contiguos de forma (manos, 21, 3);
+los diccionarios {'x', 'y', 'z'} solo se construyen en la frontera JSON.
+"""
+from typing import Dict, List, Union
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+
+def landmarks_to_array(landmarks: Union[np.ndarray, List[Dict]], dtype=np.float64) -> np.ndarray:
+    """
+    Normaliza landmarks a un array (21, 3).
+
+    Acepta arrays (sin copia si ya tienen el tipo pedido) o, por
+    compatibilidad, la lista de diccionarios {'x', 'y', 'z'}.
+    """
+    if isinstance(landmarks, np.ndarray):
+        return np.asarray(landmarks, dtype=dtype)
+    return np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks], dtype=dtype)
+
+
+class HandRecord:
+    """
+    Una mano detectada. `landmarks` es una vista (21, 3) float32 sobre el
+    bloque contiguo de DetectedHands, sin copias ni diccionarios por punto.
+    """
+
+    __slots__ = ('landmarks', 'handedness', 'confidence')
+
+    def __init__(self, landmarks: np.ndarray, handedness: str, confidence: float):
+        self.landmarks = landmarks
+        self.handedness = handedness
+        self.confidence = confidence
+
+    def landmarks_as_dicts(self) -> List[Dict]:
+        """Landmarks en el formato de lista de diccionarios {'x', 'y', 'z'} (para JSON)."""
+        return [{'x': x, 'y': y, 'z': z} for x, y, z in self.landmarks.tolist()]
+
+    def to_dict(self) -> Dict:
+        """Representación en diccionarios, compatible con el formato original de detect()."""
+        return {
+            'landmarks': self.landmarks_as_dicts(),
+            'handedness': self.handedness,
+            'confidence': self.confidence
+        }
+
+
+class DetectedHands:
+    """
+    Resultado de detección de un frame.
+
+    Attributes:
+        landmarks: Array contiguo float32 de forma (manos, 21, 3) con
+            coordenadas normalizadas x, y, z
+        records: Un HandRecord por mano, en el mismo orden
+    """
+
+    __slots__ = ('landmarks', 'records')
+
+    def __init__(self, landmarks: np.ndarray, handedness: List[str], confidences: List[float]):
+        self.landmarks = landmarks
+        self.records = [HandRecord(landmarks[i], handedness[i], confidences[i]) for i in range(len(landmarks))]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int) -> HandRecord:
+        return self.records[index]
+
+    def __iter__(self):
+        return iter(self.records)
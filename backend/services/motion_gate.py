@@ -0,0 +1,149 @@
+from typing import Dict, Optional
+import logging
+import time
+
+import cv2
+import numpy as np
+
+from .landmarks import DetectedHands
+
+logger = logging.getLogger(__name__)
+
+
+class MotionGate:
+    """
+    Filtro previo a la detección que evita ejecutar MediaPipe cuando la
+    escena no ha cambiado o no hay nadie delante de la cámara.
+
+    Cada frame se reduce a una miniatura en grises (`thumbnail_size`; menos
+    de medio milisegundo a 640x480, frente a decenas de MediaPipe) y se
+    compara con la del último frame detectado:
+        - Si ninguna celda cambia más de `motion_threshold` niveles de gris,
+          se omite la detección y se reutilizan las manos de ese frame.
+        - Tras `idle_after` detecciones seguidas sin mano, el gate pasa a
+          modo de sondeo: solo detecta cada `idle_probe_ms`, haya o no
+          movimiento (gente pasando por detrás no mantiene MediaPipe a la
+          frecuencia del cliente). Una mano que vuelve se detecta como
+          mucho `idle_probe_ms` después; al encontrarla se sale del modo.
+        - Un resultado nunca se reutiliza más de `max_staleness_ms`, tampoco
+          en modo de sondeo: pasado ese tiempo se detecta aunque la escena
+          no cambie.
+
+    La referencia es el último frame detectado y no el anterior, así que un
+    movimiento lento acumula diferencia hasta forzar una detección.
+
+    Uso por frame:
+        if gate.should_detect(image):
+            hands = detector.detect_landmarks(image)
+            gate.record(hands)
+        else:
+            hands = gate.hands
+    """
+
+    def __init__(self,
+                 motion_threshold: float = 8.0,
+                 idle_after: int = 15,
+                 idle_probe_ms: float = 250.0,
+                 max_staleness_ms: float = 500.0,
+                 thumbnail_size: tuple = (32, 24)):
+        """
+        Args:
+            motion_threshold: Cambio (niveles de gris, 0-255) de una celda de la
+                miniatura a partir del cual hay movimiento
+            idle_after: Detecciones seguidas sin mano antes del modo de sondeo (0 = nunca)
+            idle_probe_ms: Intervalo entre detecciones en modo de sondeo
+            max_staleness_ms: Antigüedad máxima de un resultado reutilizado
+            thumbnail_size: Ancho y alto de la miniatura
+        """
+        self.motion_threshold = motion_threshold
+        self.idle_after = idle_after
+        self.idle_probe = idle_probe_ms / 1000.0
+        self.max_staleness = max_staleness_ms / 1000.0
+        self.thumbnail_size = tuple(thumbnail_size)
+
+        self.hands: Optional[DetectedHands] = None     # Manos del último frame detectado
+        self._reference: Optional[np.ndarray] = None   # Miniatura del último frame detectado
+        self._thumbnail: Optional[np.ndarray] = None   # Miniatura del frame actual
+        self._detected_at = 0.0
+        self.empty_detections = 0                      # Detecciones seguidas sin mano
+        self.last_motion = 0.0
+
+        # Estadísticas
+        self.frames = 0
+        self.detections = 0
+        self.skipped_static = 0
+        self.skipped_idle = 0
+        self.forced_stale = 0
+
+    @property
+    def idle(self) -> bool:
+        """True en modo de sondeo (nadie delante de la cámara)."""
+        return bool(self.idle_after) and self.empty_detections >= self.idle_after
+
+    def should_detect(self, image: np.ndarray, now: Optional[float] = None) -> bool:
+        """
+        Decide si `image` debe pasar por MediaPipe.
+
+        Args:
+            image: Frame BGR
+            now: Instante en segundos (por defecto, time.monotonic())
+
+        Returns:
+            True si hay que detectar (y luego llamar a `record`); False si
+            se reutilizan las manos de `hands`
+        """
+        now = time.monotonic() if now is None else now
+        self.frames += 1
+        self._thumbnail = cv2.cvtColor(cv2.resize(image, self.thumbnail_size, interpolation=cv2.INTER_AREA),
+                                       cv2.COLOR_BGR2GRAY).astype(np.int16)
+        if self._reference is None or self._reference.shape != self._thumbnail.shape:
+            return True
+
+        age = now - self._detected_at
+        if self.idle:
+            if age >= min(self.idle_probe, self.max_staleness):
+                return True
+            self.skipped_idle += 1
+            return False
+
+        if age >= self.max_staleness:
+            self.forced_stale += 1
+            return True
+
+        self.last_motion = float(np.abs(self._thumbnail - self._reference).max())
+        if self.last_motion > self.motion_threshold:
+            return True
+        self.skipped_static += 1
+        return False
+
+    def record(self, hands: Optional[DetectedHands], now: Optional[float] = None):
+        """Registra el resultado de MediaPipe para el frame pasado a `should_detect`."""
+        self.detections += 1
+        was_idle = self.idle
+        self.hands = hands
+        self._reference = self._thumbnail
+        self._detected_at = time.monotonic() if now is None else now
+        self.empty_detections = 0 if hands else self.empty_detections + 1
+        if self.idle != was_idle:
+            logger.debug(f"MotionGate: {'modo de sondeo' if self.idle else 'mano detectada, fin del sondeo'}")
+
+    def reset(self):
+        """Olvida la referencia (el siguiente frame se detecta)."""
+        self.hands = None
+        self._reference = None
+        self._thumbnail = None
+        self.empty_detections = 0
+
+    def get_statistics(self) -> Dict:
+        """Frames, detecciones, frames omitidos por motivo y fracción omitida."""
+        skipped = self.skipped_static + self.skipped_idle
+        return {
+            'frames': self.frames,
+            'detections': self.detections,
+            'skipped_static': self.skipped_static,
+            'skipped_idle': self.skipped_idle,
+            'forced_stale': self.forced_stale,
+            'skip_ratio': skipped / self.frames if self.frames else 0.0,
+            'idle': self.idle,
+            'last_motion': self.last_motion
+        }
@@ -0,0 +1,171 @@
+from typing import Dict, List, Optional, Tuple
+import copy
+import logging
+import math
+import time
+
+from .gesture_classifier import GestureClassifier
+from .gesture_processor import GestureProcessor
+from .landmarks import DetectedHands, HandRecord
+
+logger = logging.getLogger(__name__)
+
+# Etiqueta alternativa cuando MediaPipe asigna la misma lateralidad a dos manos
+OTHER_HAND = {'Left': 'Right', 'Right': 'Left'}
+
+
+class ZoomCombo:
+    """
+    Zoom con dos manos: ambas en pinza estable y separándose o acercándose.
+
+    Al confirmarse las dos pinzas se toma como referencia la distancia
+    entre sus centros (filtrados). Cada vez que la distancia cambia más de
+    `step` respecto a la referencia se emite un paso de zoom ('in' al
+    separarlas, 'out' al juntarlas) y la referencia pasa a ser la actual.
+    """
+
+    def __init__(self, step: float = 0.15):
+        """
+        Args:
+            step: Cambio relativo de distancia que produce un paso de zoom
+        """
+        self.step = step
+        self.start_distance: Optional[float] = None
+        self.reference: Optional[float] = None
+
+    def update(self, pinches: List[Dict]) -> Optional[Dict]:
+        """
+        Args:
+            pinches: Detalles (pinch_x, pinch_y) de las manos en pinza estable
+
+        Returns:
+            None si el combo no está activo; si lo está, diccionario con
+            gesture, action, scale (distancia actual / inicial) y direction
+            ('in', 'out' o None si este frame no produce un paso)
+        """
+        if len(pinches) < 2:
+            self.reset()
+            return None
+
+        a, b = pinches[0], pinches[1]
+        distance = math.hypot(a['pinch_x'] - b['pinch_x'], a['pinch_y'] - b['pinch_y'])
+        if self.reference is None:
+            self.start_distance = self.reference = max(distance, 1e-6)
+
+        direction = None
+        ratio = distance / self.reference
+        if ratio >= 1 + self.step:
+            direction = 'in'
+        elif ratio <= 1 / (1 + self.step):
+            direction = 'out'
+        if direction:
+            self.reference = max(distance, 1e-6)
+
+        return {
+            'gesture': 'zoom',
+            'action': 'zoom',
+            'scale': distance / self.start_distance,
+            'direction': direction
+        }
+
+    def reset(self):
+        self.start_distance = None
+        self.reference = None
+
+
+class MultiHandProcessor:
+    """
+    Estado temporal de varias manos a la vez.
+
+    Cada mano se identifica por su lateralidad ('Left'/'Right') y tiene su
+    propio GestureProcessor (estabilizador y filtros de posición), copiado
+    del procesador de la sesión. Todas las manos de un frame se clasifican
+    en una sola llamada vectorizada a `classify_batch`, así que el coste
+    por frame crece linealmente con el número de manos.
+
+    Una mano se considera la principal mientras siga presente: sus acciones
+    son las que se ejecutan y sus campos los que devuelve el resultado. Si
+    dos manos forman un combo (zoom), se ejecuta el combo en lugar de las
+    acciones individuales.
+    """
+
+    def __init__(self, processor: GestureProcessor, zoom: Optional[ZoomCombo] = None,
+                 forget_ms: float = 500.0):
+        """
+        Args:
+            processor: Procesador de plantilla (se copia para cada mano)
+            zoom: Detector del combo de zoom (por defecto, uno con sus valores por defecto)
+            forget_ms: Ausencia tras la que se reinicia el estado de una mano
+        """
+        self.template = processor
+        self.zoom = zoom or ZoomCombo()
+        self.forget_ms = forget_ms
+        self.processors: Dict[str, GestureProcessor] = {}
+        self.last_seen: Dict[str, float] = {}
+        self.primary: Optional[str] = None
+
+    def classify(self, classifier: GestureClassifier, hands: DetectedHands) -> List[Dict]:
+        """Clasifica todas las manos del frame en una pasada."""
+        batch = classifier.classify_batch(hands.landmarks)
+        return [classifier.batch_result(batch, i) for i in range(len(hands))]
+
+    def process(self, hands: DetectedHands, gesture_results: List[Dict],
+                timestamp: Optional[float] = None) -> Tuple[List[Tuple[str, HandRecord, Dict]], Optional[Dict]]:
+        """
+        Actualiza el estado de cada mano.
+
+        Args:
+            hands: Manos del frame
+            gesture_results: Clasificación de cada mano, en el mismo orden
+            timestamp: Instante del frame en segundos (por defecto, time.monotonic())
+
+        Returns:
+            (lista de (clave, mano, resultado procesado) con la mano principal
+            primero, combo activo o None)
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        keys = self._keys(hands)
+
+        tracked = []
+        for key, hand, gesture_result in zip(keys, hands, gesture_results):
+            processor = self._processor(key, now)
+            tracked.append((key, hand, processor.process(gesture_result, now)))
+
+        if self.primary not in keys:
+            self.primary = keys[0]
+        tracked.sort(key=lambda item: item[0] != self.primary)
+
+        pinches = [processed['details'] for _, _, processed in tracked
+                   if processed['stable'] and processed['gesture'] == 'pinch' and 'pinch_x' in processed.get('details', {})]
+        return tracked, self.zoom.update(pinches)
+
+    def _keys(self, hands: DetectedHands) -> List[str]:
+        keys: List[str] = []
+        for hand in hands:
+            key = hand.handedness
+            if key in keys:
+                other = OTHER_HAND.get(key)
+                key = other if other and other not in keys else f"{key}_{len(keys)}"
+            keys.append(key)
+        return keys
+
+    def _processor(self, key: str, now: float) -> GestureProcessor:
+        processor = self.processors.get(key)
+        if processor is None:
+            processor = self.processors[key] = copy.deepcopy(self.template)
+        elif (now - self.last_seen[key]) * 1000 > self.forget_ms:
+            # La mano volvió tras una ausencia: su ventana y filtros ya no son válidos
+            processor.reset()
+        self.last_seen[key] = now
+        return processor
+
+    def reset(self):
+        """Olvida todas las manos."""
+        self.processors.clear()
+        self.last_seen.clear()
+        self.primary = None
+        self.zoom.reset()
+
+    def get_statistics(self) -> Dict:
+        """Estadísticas de cada mano seguida."""
+        return {key: processor.get_statistics() for key, processor in self.processors.items()}
@@ -0,0 +1,86 @@
+import base64
+import time
+from typing import Optional
+import logging
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from .landmarks import DetectedHands
+
+logger = logging.getLogger(__name__)
+
+
+class OverlayRenderer:
+    """
+    Genera bajo demanda la imagen anotada con los puntos clave de la mano
+    para clientes de depuración.
+
+    Trabaja a partir de los landmarks ya extraídos, por lo que la detección
+    no necesita copiar ni dibujar sobre cada frame. La frecuencia de
+    renderizado está limitada por `max_fps`.
+    """
+
+    HAND_CONNECTIONS = tuple(mp.solutions.hands.HAND_CONNECTIONS)
+
+    LANDMARK_COLOR = (48, 48, 255)      # BGR
+    CONNECTION_COLOR = (224, 224, 224)
+
+    def __init__(self, max_fps: float = 2.0, jpeg_quality: int = 70):
+        """
+        Args:
+            max_fps: Máximo de imágenes anotadas por segundo
+            jpeg_quality: Calidad JPEG de la imagen enviada (0-100)
+        """
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.jpeg_quality = jpeg_quality
+        self._last_render: float = 0.0
+
+    def due(self) -> bool:
+        """Indica si ya toca generar una nueva imagen anotada."""
+        return time.monotonic() - self._last_render >= self.min_interval
+
+    def draw(self, image: np.ndarray, hands: Optional[DetectedHands]) -> np.ndarray:
+        """
+        Dibuja los landmarks y conexiones de cada mano sobre una copia de la imagen.
+
+        Args:
+            image: Imagen BGR original
+            hands: Manos detectadas por HandDetector.detect_landmarks o None
+
+        Returns:
+            Imagen anotada
+        """
+        annotated = image.copy()
+        if not hands:
+            return annotated
+
+        h, w = annotated.shape[:2]
+        # Coordenadas normalizadas → píxeles para todas las manos a la vez
+        pixels = (hands.landmarks[..., :2] * (w, h)).astype(np.int32).tolist()
+        for hand_pixels in pixels:
+            points = [tuple(point) for point in hand_pixels]
+            for start, end in self.HAND_CONNECTIONS:
+                cv2.line(annotated, points[start], points[end], self.CONNECTION_COLOR, 2)
+            for point in points:
+                cv2.circle(annotated, point, 4, self.LANDMARK_COLOR, -1)
+
+        return annotated
+
+    def render_data_url(self, image: np.ndarray, hands: Optional[DetectedHands]) -> Optional[str]:
+        """
+        Genera la imagen anotada como data URL JPEG.
+
+        Returns:
+            Data URL o None si falla la codificación
+        """
+        self._last_render = time.monotonic()
+
+        annotated = self.draw(image, hands)
+        ok, buffer = cv2.imencode('.jpg', annotated, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            logger.warning("No se pudo codificar la imagen anotada")
+            return None
+
+        return "data:image/jpeg;base64," + base64.b64encode(buffer).decode('ascii')
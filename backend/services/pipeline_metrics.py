@@ -0,0 +1,203 @@
+"""
+Instrumentación ligera del pipeline de gestos.
+
+Cada frame se cronometra con un StageTimer (marcas de `time.perf_counter`,
+reloj monotónico) y las duraciones de cada etapa se acumulan en
+histogramas de buckets fijos, por sesión y globales. El coste por frame
+son unas pocas llamadas al reloj y una búsqueda binaria por etapa.
+
+Etapas:
+    parse     Lectura del mensaje (base64 en el formato JSON heredado)
+    decode    cv2.imdecode
+    gate      Miniatura y comparación con el último frame detectado (MotionGate)
+    detect    MediaPipe (incluye la espera por un detector libre)
+    track     Propagación por flujo óptico entre frames clave (KeyframeTracker)
+    classify  GestureClassifier
+    process   GestureProcessor
+    action    SystemController (pyautogui)
+    total     Frame completo en el hilo de trabajo
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+STAGES = ('parse', 'decode', 'gate', 'detect', 'track', 'classify', 'process', 'action', 'total')
+
+# Límites superiores de los buckets en segundos (de 50 µs a 2.5 s)
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class StageTimer:
+    """
+    Cronómetro de un frame. Cada `mark(etapa)` registra el tiempo
+    transcurrido desde la marca anterior.
+    """
+
+    __slots__ = ('start', '_last', 'durations')
+
+    def __init__(self):
+        self.start = self._last = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+
+    def mark(self, stage: str):
+        """Cierra la etapa `stage` en este instante."""
+        now = time.perf_counter()
+        self.durations[stage] = now - self._last
+        self._last = now
+
+    def finish(self) -> Dict[str, float]:
+        """Añade la etapa `total` y devuelve las duraciones en segundos."""
+        self.durations['total'] = time.perf_counter() - self.start
+        return self.durations
+
+
+class LatencyHistogram:
+    """Histograma acumulativo de duraciones, compatible con el tipo histogram de Prometheus."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # el último bucket es +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimación del cuantil `q` (0-1) por interpolación lineal dentro del bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def cumulative_counts(self) -> List[int]:
+        """Conteos acumulados por bucket (el último corresponde a +Inf)."""
+        total = 0
+        result = []
+        for bucket_count in self.counts:
+            total += bucket_count
+            result.append(total)
+        return result
+
+
+class StageMetrics:
+    """
+    Histogramas de latencia por etapa. Se actualiza desde los hilos de
+    trabajo y desde el event loop, por lo que las operaciones van bajo lock.
+    Las etapas son por defecto las del pipeline (STAGES); otros
+    componentes pueden usar sus propias claves (p. ej. tipos de acción).
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, stages: Tuple[str, ...] = STAGES):
+        self.histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram(buckets) for stage in stages}
+        self._lock = threading.Lock()
+
+    def observe(self, durations: Dict[str, float]):
+        """Registra las duraciones (segundos) de un frame."""
+        with self._lock:
+            for stage, seconds in durations.items():
+                histogram = self.histograms.get(stage)
+                if histogram is not None:
+                    histogram.observe(seconds)
+
+    def get_statistics(self) -> Dict[str, Dict]:
+        """Resumen por etapa: frames, media y p50/p95/p99 estimados (ms)."""
+        with self._lock:
+            summary = {}
+            for stage, histogram in self.histograms.items():
+                if not histogram.count:
+                    continue
+                summary[stage] = {
+                    'count': histogram.count,
+                    'mean_ms': round(histogram.sum / histogram.count * 1000, 3),
+                    **{f"p{int(q * 100)}_ms": round(histogram.quantile(q) * 1000, 3) for q in (0.5, 0.95, 0.99)}
+                }
+            return summary
+
+    def render_histograms(self, name: str, labels: Optional[Dict[str, str]] = None,
+                          stage_label: str = 'stage') -> List[str]:
+        """Líneas de exposición de Prometheus (sin HELP/TYPE) de todas las etapas."""
+        lines = []
+        with self._lock:
+            for stage, histogram in self.histograms.items():
+                if not histogram.count:
+                    continue
+                base = _labels({**(labels or {}), stage_label: stage})
+                bounds = [_format_float(b) for b in histogram.buckets] + ['+Inf']
+                for bound, cumulative in zip(bounds, histogram.cumulative_counts()):
+                    lines.append(f'{name}_bucket{{{base},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{base}}} {_format_float(histogram.sum)}')
+                lines.append(f'{name}_count{{{base}}} {histogram.count}')
+        return lines
+
+
+def _format_float(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    return ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def render_prometheus(global_metrics: StageMetrics,
+                      sessions: Iterable[Tuple[Dict[str, str], StageMetrics]],
+                      gauges: Iterable[Tuple[str, str, str, float, Optional[Dict[str, str]]]],
+                      histograms: Iterable[Tuple[str, str, StageMetrics, str]] = ()) -> str:
+    """
+    Genera el texto de exposición de Prometheus (formato 0.0.4).
+
+    Args:
+        global_metrics: Histogramas globales
+        sessions: (etiquetas, histogramas) de cada sesión activa
+        gauges: (nombre, tipo, ayuda, valor, etiquetas) de métricas escalares;
+            métricas con el mismo nombre deben ir seguidas
+        histograms: (nombre, ayuda, histogramas, etiqueta de la clave) de
+            otros componentes, p. ej. la latencia por acción del actuador
+
+    Returns:
+        Texto listo para servir como text/plain
+    """
+    lines = [
+        '# HELP gesture_stage_duration_seconds Duración de cada etapa del pipeline',
+        '# TYPE gesture_stage_duration_seconds histogram',
+        *global_metrics.render_histograms('gesture_stage_duration_seconds'),
+        '# HELP gesture_session_stage_duration_seconds Duración de cada etapa por sesión activa',
+        '# TYPE gesture_session_stage_duration_seconds histogram',
+    ]
+    for labels, metrics in sessions:
+        lines.extend(metrics.render_histograms('gesture_session_stage_duration_seconds', labels))
+
+    for name, help_text, metrics, stage_label in histograms:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        lines.extend(metrics.render_histograms(name, stage_label=stage_label))
+
+    declared = set()
+    for name, metric_type, help_text, value, labels in gauges:
+        if name not in declared:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            declared.add(name)
+        suffix = f'{{{_labels(labels)}}}' if labels else ''
+        lines.append(f'{name}{suffix} {_format_float(value)}')
+
+    return '\n'.join(lines) + '\n'
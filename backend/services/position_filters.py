@@ -0,0 +1,217 @@
+"""
+Filtros de posición para el cursor y la pinza.
+
+Todos reciben posiciones normalizadas (0-1) con su instante en segundos,
+así que se adaptan a la frecuencia real de frames en lugar de suponer
+una fija:
+
+    ema       Media exponencial con factor fijo (comportamiento original)
+    one_euro  Filtro One Euro (Casiez et al., CHI 2012): paso bajo cuya
+              frecuencia de corte sube con la velocidad; poco temblor en
+              reposo y poco retraso en movimientos rápidos
+    kalman    Kalman de velocidad constante con predicción a corto plazo
+              (`prediction_ms`) para compensar la latencia de red e inferencia
+"""
+from abc import ABC, abstractmethod
+import math
+from typing import Dict, Optional, Tuple, Type
+
+Position = Tuple[float, float]
+
+
+class PositionFilter(ABC):
+    """Interfaz común: `update` filtra una posición; `reset` olvida el estado."""
+
+    @abstractmethod
+    def update(self, position: Position, timestamp: float) -> Position:
+        ...
+
+    @abstractmethod
+    def reset(self):
+        ...
+
+
+class ExponentialFilter(PositionFilter):
+    """Media exponencial: `smoothing_factor` es el peso de la posición nueva."""
+
+    def __init__(self, smoothing_factor: float = 0.5):
+        self.smoothing_factor = smoothing_factor
+        self.value: Optional[Position] = None
+
+    def update(self, position: Position, timestamp: float) -> Position:
+        if self.value is None:
+            self.value = position
+        else:
+            a = self.smoothing_factor
+            self.value = (a * position[0] + (1 - a) * self.value[0],
+                          a * position[1] + (1 - a) * self.value[1])
+        return self.value
+
+    def reset(self):
+        self.value = None
+
+
+class OneEuroFilter(PositionFilter):
+    """
+    Filtro One Euro en 2D. La frecuencia de corte es
+    `min_cutoff + beta * velocidad`, con la velocidad (unidades
+    normalizadas por segundo) estimada a su vez con un paso bajo de corte
+    `d_cutoff`. Ambos ejes usan el mismo corte para no deformar la trayectoria.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 20.0, d_cutoff: float = 1.0):
+        """
+        Args:
+            min_cutoff: Frecuencia de corte en reposo (Hz); menor = menos temblor
+            beta: Aumento del corte con la velocidad; mayor = menos retraso
+            d_cutoff: Frecuencia de corte de la estimación de velocidad (Hz)
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, position: Position, timestamp: float) -> Position:
+        if self.value is None:
+            self.value = position
+            self.timestamp = timestamp
+            return position
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            # Frame repetido o reloj no monotónico: no hay información de velocidad
+            return self.value
+        self.timestamp = timestamp
+
+        x, y = self.value
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.dx = a_d * (position[0] - x) / dt + (1 - a_d) * self.dx
+        self.dy = a_d * (position[1] - y) / dt + (1 - a_d) * self.dy
+
+        a = self._alpha(self.min_cutoff + self.beta * math.hypot(self.dx, self.dy), dt)
+        self.value = (x + a * (position[0] - x), y + a * (position[1] - y))
+        return self.value
+
+    def reset(self):
+        self.value: Optional[Position] = None
+        self.timestamp = 0.0
+        self.dx = 0.0
+        self.dy = 0.0
+
+
+class KalmanFilter(PositionFilter):
+    """
+    Kalman de velocidad constante (estado: posición y velocidad por eje)
+    con aceleración como ruido blanco. Los dos ejes comparten modelo y
+    ruidos, así que la covarianza se calcula una sola vez por frame.
+
+    La salida es la posición estimada extrapolada `prediction_ms` hacia
+    delante con la velocidad estimada.
+    """
+
+    def __init__(self, process_noise: float = 1.0, measurement_noise: float = 1e-5,
+                 prediction_ms: float = 30.0, max_dt: float = 0.5):
+        """
+        Args:
+            process_noise: Densidad espectral de la aceleración (unidades²/s³);
+                mayor = sigue antes los cambios de velocidad
+            measurement_noise: Varianza de la posición medida (unidades²)
+            prediction_ms: Horizonte de predicción de la salida
+            max_dt: Intervalo (s) a partir del cual se reinicia el filtro
+        """
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.prediction_ms = prediction_ms
+        self.max_dt = max_dt
+        self.reset()
+
+    def update(self, position: Position, timestamp: float) -> Position:
+        dt = timestamp - self.timestamp
+        if self.state is None or dt > self.max_dt:
+            # Sin historial (o demasiado antiguo): posición medida y velocidad desconocida
+            self.state = [position[0], 0.0, position[1], 0.0]
+            r = self.measurement_noise
+            self.covariance = [r, 0.0, 0.0, 1.0]
+            self.timestamp = timestamp
+            return position
+        if dt <= 0:
+            return self._output()
+        self.timestamp = timestamp
+
+        # Predicción: P = F P Fᵀ + Q
+        p00, p01, p10, p11 = self.covariance
+        q = self.process_noise
+        p00 += dt * (p10 + p01) + dt * dt * p11 + q * dt ** 3 / 3
+        p01 += dt * p11 + q * dt * dt / 2
+        p10 += dt * p11 + q * dt * dt / 2
+        p11 += q * dt
+
+        # Corrección con la posición medida (H = [1, 0])
+        s = p00 + self.measurement_noise
+        k0, k1 = p00 / s, p10 / s
+        self.covariance = [(1 - k0) * p00, (1 - k0) * p01, p10 - k1 * p00, p11 - k1 * p01]
+
+        state = self.state
+        for axis, measured in ((0, position[0]), (2, position[1])):
+            predicted = state[axis] + dt * state[axis + 1]
+            innovation = measured - predicted
+            state[axis] = predicted + k0 * innovation
+            state[axis + 1] += k1 * innovation
+        return self._output()
+
+    def _output(self) -> Position:
+        horizon = self.prediction_ms / 1000
+        x, vx, y, vy = self.state
+        return (x + vx * horizon, y + vy * horizon)
+
+    def reset(self):
+        self.state: Optional[list] = None
+        self.covariance = [0.0, 0.0, 0.0, 0.0]
+        self.timestamp = 0.0
+
+
+FILTERS: Dict[str, Type[PositionFilter]] = {
+    'ema': ExponentialFilter,
+    'one_euro': OneEuroFilter,
+    'kalman': KalmanFilter
+}
+
+
+def create_position_filter(kind: str = 'one_euro', **params) -> PositionFilter:
+    """
+    Crea un filtro por nombre.
+
+    Args:
+        kind: 'ema', 'one_euro' o 'kalman'
+        **params: Parámetros del constructor del filtro
+
+    Raises:
+        ValueError: Si el tipo no existe
+    """
+    if kind not in FILTERS:
+        raise ValueError(f"Filtro de posición desconocido: {kind} (opciones: {', '.join(FILTERS)})")
+    return FILTERS[kind](**params)
+
+
+def filter_from_settings(settings: Optional[Dict] = None) -> PositionFilter:
+    """
+    Crea el filtro configurado en los `gesture_settings` de un perfil
+    (ver GestureSettings); los campos ausentes toman el valor por defecto.
+    """
+    settings = settings or {}
+    kind = settings.get('position_filter', 'one_euro')
+    if kind == 'ema':
+        return ExponentialFilter(settings.get('smoothing_factor', 0.5))
+    if kind == 'kalman':
+        return KalmanFilter(process_noise=settings.get('filter_process_noise', 1.0),
+                            measurement_noise=settings.get('filter_measurement_noise', 1e-5),
+                            prediction_ms=settings.get('filter_prediction_ms', 30.0))
+    if kind == 'one_euro':
+        return OneEuroFilter(min_cutoff=settings.get('filter_min_cutoff', 1.0),
+                             beta=settings.get('filter_beta', 20.0))
+    return create_position_filter(kind)
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Umbral por gesto en GestureSettings y su valor por defecto
+THRESHOLD_FIELDS = {
+    'index_point': ('index_point_threshold', 0.85),
+    'fist': ('fist_threshold', 0.80),
+    'thumbs_up': ('thumbs_up_threshold', 0.75),
+    'open_hand': ('open_hand_threshold', 0.70),
+    'pinch': ('pinch_threshold', 0.65),
+}
+
+
+class ProfileEntry:
+    """
+    Perfil cacheado con lo que necesita una conexión ya preparado: las
+    marcas de tiempo se convierten una sola vez y los umbrales del
+    clasificador se extraen de `gesture_settings` al cargar.
+    """
+
+    __slots__ = ('profile', 'settings', 'thresholds')
+
+    def __init__(self, profile: Dict):
+        for key in ('created_at', 'updated_at'):
+            if isinstance(profile.get(key), str):
+                profile[key] = datetime.fromisoformat(profile[key])
+        self.profile = profile
+        self.settings: Optional[Dict] = profile.get('gesture_settings')
+        self.thresholds: Optional[Dict[str, float]] = None
+        if self.settings:
+            self.thresholds = {gesture: self.settings.get(field, default)
+                               for gesture, (field, default) in THRESHOLD_FIELDS.items()}
+
+
+class ProfileCache:
+    """
+    Caché en proceso de los perfiles, delante de la colección `profiles`.
+
+    - Entradas con caducidad (`ttl` segundos) y expulsión LRU por encima de
+      `max_entries`. Los perfiles inexistentes también se cachean para que
+      un id desconocido no consulte la base en cada conexión.
+    - Las cargas concurrentes del mismo perfil comparten una sola consulta
+      (una tormenta de reconexiones hace una lectura, no una por conexión).
+    - `update` y `delete` escriben en la base y actualizan o invalidan la
+      entrada en el mismo paso (write-through).
+
+    Sin colección (modo sin base de datos) ningún perfil existe.
+    Se usa solo desde el event loop.
+    """
+
+    def __init__(self, collection=None, ttl: float = 60.0, max_entries: int = 256):
+        """
+        Args:
+            collection: Colección de perfiles de Motor (o None)
+            ttl: Segundos que una entrada es válida
+            max_entries: Perfiles cacheados como máximo
+        """
+        self.collection = collection
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._entries: 'OrderedDict[str, Optional[ProfileEntry]]' = OrderedDict()
+        self._expiry: Dict[str, float] = {}
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._writes = 0  # update/delete/invalidate realizados (descarta cargas obsoletas)
+
+        # Estadísticas
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+
+    async def get(self, profile_id: str) -> Optional[ProfileEntry]:
+        """Perfil cacheado o cargado de la base; None si no existe."""
+        now = time.monotonic()
+        if profile_id in self._entries and self._expiry[profile_id] > now:
+            self.hits += 1
+            self._entries.move_to_end(profile_id)
+            return self._entries[profile_id]
+
+        self.misses += 1
+        pending = self._loading.get(profile_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[profile_id] = future
+        try:
+            entry = await self._load(profile_id)
+        except Exception as e:
+            future.set_exception(e)
+            # Evita el aviso de excepción no recuperada si nadie más esperaba
+            future.exception()
+            raise
+        else:
+            future.set_result(entry)
+            return entry
+        finally:
+            del self._loading[profile_id]
+
+    async def _load(self, profile_id: str) -> Optional[ProfileEntry]:
+        profile = None
+        writes = self._writes
+        if self.collection is not None:
+            self.loads += 1
+            profile = await self.collection.find_one({"id": profile_id}, {"_id": 0})
+        if writes != self._writes:
+            # Hubo una escritura durante la lectura: no cachear un valor que puede ser antiguo
+            if profile_id in self._entries:
+                return self._entries[profile_id]
+            return ProfileEntry(profile) if profile else None
+        return self._store(profile_id, profile)
+
+    def _store(self, profile_id: str, profile: Optional[Dict]) -> Optional[ProfileEntry]:
+        entry = ProfileEntry(profile) if profile else None
+        self._entries[profile_id] = entry
+        self._entries.move_to_end(profile_id)
+        self._expiry[profile_id] = time.monotonic() + self.ttl
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            del self._expiry[evicted]
+            self.evictions += 1
+        return entry
+
+    async def update(self, profile_id: str, update_dict: Dict) -> Optional[ProfileEntry]:
+        """
+        Aplica `$set` en la base y cachea el perfil resultante en un solo
+        viaje (find_one_and_update). Devuelve None si el perfil no existe.
+        """
+        if self.collection is None:
+            return None
+        self._writes += 1
+        # return_document=True equivale a ReturnDocument.AFTER
+        profile = await self.collection.find_one_and_update(
+            {"id": profile_id}, {"$set": update_dict}, projection={"_id": 0}, return_document=True)
+        if profile is None:
+            self.invalidate(profile_id)
+            return None
+        return self._store(profile_id, profile)
+
+    async def delete(self, profile_id: str) -> bool:
+        """Elimina el perfil de la base y de la caché. True si existía."""
+        if self.collection is None:
+            return False
+        self._writes += 1
+        result = await self.collection.delete_one({"id": profile_id})
+        self._store(profile_id, None)
+        return result.deleted_count > 0
+
+    def invalidate(self, profile_id: Optional[str] = None):
+        """Olvida un perfil (o todos si no se indica)."""
+        self._writes += 1
+        if profile_id is None:
+            self._entries.clear()
+            self._expiry.clear()
+        elif profile_id in self._entries:
+            del self._entries[profile_id]
+            del self._expiry[profile_id]
+
+    def get_statistics(self) -> Dict:
+        """Tamaño y aciertos de la caché."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'loads': self.loads,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,159 @@
+from typing import Dict, Optional, Tuple
+import logging
+
+import cv2
+import numpy as np
+
+from .hand_detector import HandDetector
+from .landmarks import DetectedHands
+
+logger = logging.getLogger(__name__)
+
+
+class RoiPreprocessor:
+    """
+    Preprocesado adaptativo de la entrada de MediaPipe para una sesión.
+
+    - Con una mano seguida, se detecta sobre un recorte cuadrado alrededor
+      de la caja de la mano del frame anterior (con margen). El recorte no
+      se mueve mientras la mano quede dentro de su zona interior, de modo
+      que el seguimiento propio de MediaPipe sigue funcionando.
+    - Sin mano, se detecta sobre el frame reducido a `search_size` píxeles
+      en su lado mayor.
+
+    Los landmarks se devuelven siempre en coordenadas normalizadas del frame
+    completo, así que el clasificador y el mapeo del cursor no cambian. Si
+    la mano se pierde en el recorte se repite la búsqueda en el frame
+    reducido en ese mismo frame.
+    """
+
+    def __init__(self,
+                 search_size: int = 480,
+                 padding: float = 0.75,
+                 margin: float = 0.1,
+                 min_crop: int = 96,
+                 max_crop_ratio: float = 0.8):
+        """
+        Args:
+            search_size: Lado mayor (px) del frame reducido sin mano seguida (0 = sin reducir)
+            padding: Margen añadido a cada lado de la caja de la mano, relativo a su tamaño
+            margin: Fracción del recorte junto a sus bordes que obliga a recentrarlo
+            min_crop: Lado mínimo del recorte en píxeles
+            max_crop_ratio: Si el recorte supera esta fracción del lado menor del
+                frame, se usa el frame reducido (recortar no aporta)
+        """
+        self.search_size = search_size
+        self.padding = padding
+        self.margin = margin
+        self.min_crop = min_crop
+        self.max_crop_ratio = max_crop_ratio
+
+        self.roi: Optional[Tuple[int, int, int, int]] = None  # x0, y0, x1, y1 en píxeles del frame
+        self._frame_size: Optional[Tuple[int, int]] = None
+
+        # Estadísticas
+        self.roi_frames = 0
+        self.search_frames = 0
+        self.fallbacks = 0
+        self.input_pixels = 0
+        self.frame_pixels = 0
+
+    def detect(self, detector: HandDetector, image: np.ndarray) -> Optional[DetectedHands]:
+        """
+        Detecta manos usando el recorte o el frame reducido.
+
+        Args:
+            detector: Detector prestado para este frame
+            image: Frame BGR completo
+
+        Returns:
+            Manos con landmarks normalizados respecto al frame completo, o None
+        """
+        height, width = image.shape[:2]
+        if self._frame_size != (width, height):
+            # Cambio de resolución del cliente: el recorte anterior no sirve
+            self.roi = None
+            self._frame_size = (width, height)
+        self.frame_pixels += width * height
+
+        hands = None
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            self.roi_frames += 1
+            self.input_pixels += (x1 - x0) * (y1 - y0)
+            hands = detector.detect_landmarks(image[y0:y1, x0:x1])
+            if hands:
+                self._map_to_frame(hands, x0, y0, x1 - x0, y1 - y0, width, height)
+            else:
+                self.fallbacks += 1
+
+        if not hands:
+            search = self._downscale(image)
+            self.search_frames += 1
+            self.input_pixels += search.shape[0] * search.shape[1]
+            # Escalado uniforme: las coordenadas normalizadas no cambian
+            hands = detector.detect_landmarks(search)
+
+        self._update_roi(hands, width, height)
+        return hands
+
+    def _downscale(self, image: np.ndarray) -> np.ndarray:
+        height, width = image.shape[:2]
+        longest = max(width, height)
+        if not self.search_size or longest <= self.search_size:
+            return image
+        scale = self.search_size / longest
+        return cv2.resize(image, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def _map_to_frame(hands: DetectedHands, x0: int, y0: int, crop_width: int, crop_height: int,
+                      width: int, height: int):
+        """Pasa los landmarks del recorte a coordenadas normalizadas del frame (en el sitio)."""
+        landmarks = hands.landmarks
+        scale_x = crop_width / width
+        landmarks[..., 0] = landmarks[..., 0] * scale_x + x0 / width
+        landmarks[..., 1] = landmarks[..., 1] * (crop_height / height) + y0 / height
+        # z usa la misma escala que x en MediaPipe
+        landmarks[..., 2] *= scale_x
+
+    def _update_roi(self, hands: Optional[DetectedHands], width: int, height: int):
+        """Decide el recorte del siguiente frame a partir de la caja de las manos."""
+        if not hands:
+            self.roi = None
+            return
+
+        xs = hands.landmarks[..., 0] * width
+        ys = hands.landmarks[..., 1] * height
+        left, right = float(xs.min()), float(xs.max())
+        top, bottom = float(ys.min()), float(ys.max())
+
+        # Mantener el recorte mientras la mano siga en su zona interior
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            inset = self.margin * (x1 - x0)
+            if left > x0 + inset and right < x1 - inset and top > y0 + inset and bottom < y1 - inset:
+                return
+
+        side = max(right - left, bottom - top) * (1 + 2 * self.padding)
+        side = int(max(side, self.min_crop))
+        if side > self.max_crop_ratio * min(width, height):
+            self.roi = None
+            return
+
+        # Recorte cuadrado centrado en la mano y desplazado para quedar dentro del frame
+        x0 = int(min(max((left + right) / 2 - side / 2, 0), width - side))
+        y0 = int(min(max((top + bottom) / 2 - side / 2, 0), height - side))
+        self.roi = (x0, y0, x0 + side, y0 + side)
+
+    def reset(self):
+        """Olvida el recorte (la siguiente detección busca en el frame reducido)."""
+        self.roi = None
+
+    def get_statistics(self) -> Dict:
+        """Uso del recorte y fracción de píxeles enviados a MediaPipe."""
+        return {
+            'roi_frames': self.roi_frames,
+            'search_frames': self.search_frames,
+            'fallbacks': self.fallbacks,
+            'pixel_ratio': self.input_pixels / self.frame_pixels if self.frame_pixels else 0.0
+        }
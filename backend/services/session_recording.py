@@ -0,0 +1,294 @@
+"""
+Grabación compacta de sesiones de gestos y reproducción sin cámara.
+
+Una grabación es un directorio con un fichero binario por columna y un
+`meta.json` que describe tipos y formas. Cada columna es un array NumPy
+contiguo que se añade por bloques mientras dura la sesión y se abre con
+`np.memmap`, de modo que leer una sesión larga no carga nada en memoria
+hasta que se accede a los datos.
+
+Columnas (una fila por frame procesado):
+    timestamp        float64  Marca de tiempo del frame en ms
+    frame_id         uint32   Identificador del frame enviado por el cliente
+    num_hands        uint8    Manos detectadas
+    landmarks        float32  (max_hands, 21, 3), NaN en las manos ausentes
+    handedness       int8     (max_hands,) 0 = Left, 1 = Right, -1 = ausente
+    hand_confidence  float32  (max_hands,)
+    gesture_id       int8     Índice en GestureClassifier.GESTURES (-1 = unknown)
+    confidence       float32  Confianza del clasificador
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+import logging
+
+import numpy as np
+
+from .gesture_classifier import GestureClassifier
+from .gesture_processor import GestureProcessor
+from .landmarks import DetectedHands, NUM_LANDMARKS
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+RECORDING_SUFFIX = '.gesrec'
+META_FILE = 'meta.json'
+
+HANDEDNESS_CODES = {'Left': 0, 'Right': 1}
+HANDEDNESS_NAMES = {code: name for name, code in HANDEDNESS_CODES.items()}
+
+_GESTURE_IDS = {name: i for i, (name, _) in enumerate(GestureClassifier.GESTURES)}
+
+
+def _columns(max_hands: int) -> Dict[str, Tuple[np.dtype, Tuple[int, ...]]]:
+    """Tipo y forma por fila de cada columna."""
+    return {
+        'timestamp': (np.dtype('<f8'), ()),
+        'frame_id': (np.dtype('<u4'), ()),
+        'num_hands': (np.dtype('u1'), ()),
+        'landmarks': (np.dtype('<f4'), (max_hands, NUM_LANDMARKS, 3)),
+        'handedness': (np.dtype('i1'), (max_hands,)),
+        'hand_confidence': (np.dtype('<f4'), (max_hands,)),
+        'gesture_id': (np.dtype('i1'), ()),
+        'confidence': (np.dtype('<f4'), ()),
+    }
+
+
+class SessionRecorder:
+    """
+    Añade los frames de una sesión a una grabación en disco.
+
+    Las filas se acumulan en bloques preasignados y se escriben cada
+    `flush_every` frames, así que el coste por frame es una copia en
+    memoria. Los ficheros solo crecen por filas completas: si el proceso
+    termina sin `close`, la grabación sigue siendo legible hasta el último
+    bloque escrito. No es seguro para hilos (una sesión procesa sus frames
+    de uno en uno).
+    """
+
+    def __init__(self, path: Union[str, Path], max_hands: int = 2, flush_every: int = 64,
+                 metadata: Optional[Dict] = None):
+        """
+        Args:
+            path: Directorio de la grabación (se crea; no debe existir)
+            max_hands: Manos guardadas por frame
+            flush_every: Frames acumulados antes de escribir a disco
+            metadata: Datos adicionales para meta.json (perfil, cliente...)
+        """
+        self.path = Path(path)
+        self.max_hands = max(1, max_hands)
+        self.flush_every = max(1, flush_every)
+        self.frames = 0
+        self._columns = _columns(self.max_hands)
+        self._pending = 0
+        self._closed = False
+
+        self.path.mkdir(parents=True)
+        self._buffers = {name: np.empty((self.flush_every,) + shape, dtype=dtype)
+                         for name, (dtype, shape) in self._columns.items()}
+        self._files = {name: open(self.path / f"{name}.bin", 'wb') for name in self._columns}
+
+        self._meta = {
+            'format_version': FORMAT_VERSION,
+            'max_hands': self.max_hands,
+            'gestures': [name for name, _ in GestureClassifier.GESTURES],
+            'columns': {name: {'dtype': dtype.str, 'shape': list(shape)}
+                        for name, (dtype, shape) in self._columns.items()},
+            'created_at': time.time(),
+            'frames': None,
+            'metadata': metadata or {}
+        }
+        self._write_meta()
+
+        logger.info(f"Grabando sesión en {self.path}")
+
+    def record(self, timestamp: Optional[float], frame_id: int, hands: Optional[DetectedHands],
+               gesture_result: Optional[Dict]):
+        """
+        Añade un frame.
+
+        Args:
+            timestamp: Marca de tiempo del cliente en ms (None = hora del servidor)
+            frame_id: Identificador del frame
+            hands: Manos detectadas o None
+            gesture_result: Resultado de GestureClassifier.classify de la primera mano
+        """
+        if self._closed:
+            raise RuntimeError("SessionRecorder cerrado")
+
+        row = self._pending
+        buffers = self._buffers
+        buffers['timestamp'][row] = timestamp if timestamp is not None else time.time() * 1000
+        buffers['frame_id'][row] = frame_id
+
+        count = min(len(hands), self.max_hands) if hands else 0
+        buffers['num_hands'][row] = count
+        buffers['landmarks'][row] = np.nan
+        buffers['handedness'][row] = -1
+        buffers['hand_confidence'][row] = 0.0
+        if count:
+            buffers['landmarks'][row, :count] = hands.landmarks[:count]
+            for i in range(count):
+                buffers['handedness'][row, i] = HANDEDNESS_CODES.get(hands[i].handedness, -1)
+                buffers['hand_confidence'][row, i] = hands[i].confidence
+
+        if gesture_result:
+            buffers['gesture_id'][row] = _GESTURE_IDS.get(gesture_result['gesture'], -1)
+            buffers['confidence'][row] = gesture_result['confidence']
+        else:
+            buffers['gesture_id'][row] = -1
+            buffers['confidence'][row] = 0.0
+
+        self._pending += 1
+        self.frames += 1
+        if self._pending == self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Escribe a disco los frames acumulados."""
+        if not self._pending:
+            return
+        for name, file in self._files.items():
+            file.write(self._buffers[name][:self._pending].tobytes())
+            file.flush()
+        self._pending = 0
+
+    def close(self):
+        """Escribe los frames pendientes y cierra la grabación."""
+        if self._closed:
+            return
+        self.flush()
+        for file in self._files.values():
+            file.close()
+        self._closed = True
+
+        self._meta['frames'] = self.frames
+        self._write_meta()
+        logger.info(f"Grabación cerrada: {self.frames} frames en {self.path}")
+
+    def _write_meta(self):
+        # Escritura atómica para no dejar un meta.json a medias
+        tmp_path = self.path / (META_FILE + '.tmp')
+        tmp_path.write_text(json.dumps(self._meta, indent=2))
+        os.replace(tmp_path, self.path / META_FILE)
+
+    def __enter__(self) -> 'SessionRecorder':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SessionRecording:
+    """
+    Grabación abierta en modo lectura. Cada columna es un `np.memmap`
+    accesible como atributo o con `recording['landmarks']`.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / META_FILE).read_text())
+        if self.meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Versión de grabación no soportada: {self.meta.get('format_version')}")
+
+        self.max_hands = self.meta['max_hands']
+        self.gestures = self.meta['gestures']
+        self._columns: Dict[str, np.ndarray] = {}
+
+        frames = None
+        for name, spec in self.meta['columns'].items():
+            dtype, shape = np.dtype(spec['dtype']), tuple(spec['shape'])
+            file_path = self.path / f"{name}.bin"
+            # Filas completas presentes (una grabación sin cerrar puede tener columnas desiguales)
+            rows = file_path.stat().st_size // (dtype.itemsize * int(np.prod(shape, dtype=np.int64)))
+            frames = rows if frames is None else min(frames, rows)
+            self._columns[name] = (file_path, dtype, shape)
+
+        self.frames = frames or 0
+        for name, (file_path, dtype, shape) in self._columns.items():
+            if self.frames:
+                self._columns[name] = np.memmap(file_path, dtype=dtype, mode='r', shape=(self.frames,) + shape)
+            else:
+                # np.memmap no admite ficheros vacíos
+                self._columns[name] = np.empty((0,) + shape, dtype=dtype)
+
+    def __len__(self) -> int:
+        return self.frames
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get('_columns', {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    @property
+    def metadata(self) -> Dict:
+        """Datos adicionales guardados al grabar."""
+        return self.meta.get('metadata', {})
+
+    def hands(self, index: int) -> Optional[DetectedHands]:
+        """Reconstruye las manos detectadas de un frame (None si no hubo ninguna)."""
+        count = int(self._columns['num_hands'][index])
+        if not count:
+            return None
+        return DetectedHands(
+            np.ascontiguousarray(self._columns['landmarks'][index, :count]),
+            [HANDEDNESS_NAMES.get(int(code), 'Unknown') for code in self._columns['handedness'][index, :count]],
+            [float(c) for c in self._columns['hand_confidence'][index, :count]]
+        )
+
+
+def replay(recording: SessionRecording,
+           classifier: Optional[GestureClassifier] = None,
+           processor: Optional[GestureProcessor] = None) -> Iterator[Dict]:
+    """
+    Reproduce una grabación a través del clasificador y el procesador, igual
+    que GesturePipeline pero sin cámara, MediaPipe ni acciones del sistema.
+
+    La primera mano de todos los frames se clasifica de una vez con
+    `classify_batch`; el procesador se alimenta frame a frame en orden.
+
+    Args:
+        recording: Grabación abierta
+        classifier: Clasificador a evaluar (por defecto, umbrales estándar)
+        processor: Procesador con estado (por defecto, uno nuevo)
+
+    Yields:
+        Por frame: frame_id, timestamp, resultado del clasificador
+        (`classification`, None sin manos), gesto grabado
+        (`recorded_gesture`) y resultado del procesador (`processed`)
+    """
+    classifier = classifier or GestureClassifier()
+    processor = processor or GestureProcessor()
+
+    num_hands = np.asarray(recording['num_hands'])
+    with_hands = np.flatnonzero(num_hands)
+    batch = classifier.classify_batch(recording['landmarks'][with_hands, 0])
+    batch_rows = np.full(len(recording), -1)
+    batch_rows[with_hands] = np.arange(len(with_hands))
+
+    gestures = recording.gestures
+    for i in range(len(recording)):
+        classification = None
+        processed = None
+        recorded_gesture = None
+        if num_hands[i]:
+            classification = classifier.batch_result(batch, batch_rows[i])
+            # El tiempo grabado mantiene las ventanas del estabilizador como en la sesión original
+            processed = processor.process(classification, timestamp=float(recording['timestamp'][i]) / 1000)
+            recorded_id = int(recording['gesture_id'][i])
+            recorded_gesture = gestures[recorded_id] if recorded_id >= 0 else 'unknown'
+
+        yield {
+            'frame_id': int(recording['frame_id'][i]),
+            'timestamp': float(recording['timestamp'][i]),
+            'hands_detected': int(num_hands[i]),
+            'classification': classification,
+            'recorded_gesture': recorded_gesture,
+            'processed': processed
+        }
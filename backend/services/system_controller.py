@@ -7,6 +7,8 @@ logger = logging.getLogger(__name__)
 
 # Configuración de seguridad para pyautogui
 pyautogui.FAILSAFE = True  # Mover el mouse a la esquina superior izquierda detendrá el programa
+# Sin pausa tras cada llamada (por defecto 0.1 s): el ritmo lo marcan los frames
+pyautogui.PAUSE = 0
 
 class SystemController:
     """
@@ -54,6 +56,8 @@ class SystemController:
                 result = self._scroll(details)
             elif action == "drag_drop":
                 result = self._drag_drop(details)
+            elif action == "zoom":
+                result = self._zoom(details)
             else:
                 logger.warning(f"Acción no reconocida: {action}")
         
@@ -111,6 +115,21 @@ class SystemController:
             "message": f"Scroll {direction} realizado"
         }
     
+    def _zoom(self, details: Dict) -> Dict:
+        """Acerca o aleja con Ctrl + rueda (zoom en navegadores y la mayoría de visores)."""
+        direction = details.get('direction', 'in')
+        amount = self.scroll_speed * (1 if direction == 'in' else -1)
+        
+        pyautogui.keyDown('ctrl')
+        try:
+            pyautogui.scroll(amount)
+        finally:
+            pyautogui.keyUp('ctrl')
+        return {
+            "success": True,
+            "message": f"Zoom {direction} realizado"
+        }
+    
     def _drag_drop(self, details: Dict) -> Dict:
         """Inicia o finaliza una operación de arrastrar y soltar."""
         if not self.is_dragging:
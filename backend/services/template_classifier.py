@@ -0,0 +1,353 @@
+"""
+Clasificación de gestos personalizados por comparación con plantillas.
+
+Cada perfil calibra sus propios gestos con muestras de landmarks
+(CalibrationData). Las muestras se normalizan (traslación, escala y
+rotación en el plano de la imagen) y se guardan como vectores de 63
+componentes; un frame se clasifica por votación de sus vecinos más
+cercanos.
+
+La búsqueda es fuerza bruta vectorizada: con las normas de las plantillas
+precalculadas, las distancias de un lote de manos a todas las plantillas
+son un único producto de matrices. Con cientos de plantillas son
+microsegundos por mano; un KD-tree no aporta en 63 dimensiones.
+"""
+from datetime import datetime, timezone
+import asyncio
+import threading
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import logging
+
+import numpy as np
+
+from .gesture_classifier import GestureClassifier
+from .landmarks import NUM_LANDMARKS
+
+logger = logging.getLogger(__name__)
+
+FEATURES = NUM_LANDMARKS * 3
+
+# Acción por defecto de los gestos integrados; los gestos nuevos indican la suya
+DEFAULT_ACTIONS = dict(GestureClassifier.GESTURES)
+
+
+def normalize_landmarks(landmarks: np.ndarray) -> np.ndarray:
+    """
+    Normaliza manos para compararlas con independencia de posición, tamaño
+    y giro: origen en la muñeca, muñeca → base del dedo medio apuntando
+    hacia arriba y longitud de la palma 1.
+
+    Args:
+        landmarks: Array (21, 3) o (N, 21, 3)
+
+    Returns:
+        Vectores float32 (63,) o (N, 63)
+    """
+    lm = np.asarray(landmarks, dtype=np.float32)
+    single = lm.ndim == 2
+    if single:
+        lm = lm[np.newaxis]
+
+    centered = lm - lm[:, GestureClassifier.WRIST:GestureClassifier.WRIST + 1]
+    palm = centered[:, GestureClassifier.MIDDLE_FINGER_MCP, :2]
+    length = np.maximum(np.sqrt((palm ** 2).sum(axis=1)), 1e-6)
+    # Rotación que lleva la palma a (0, -1): Y de imagen crece hacia abajo
+    cos = -palm[:, 1] / length
+    sin = -palm[:, 0] / length
+    x, y = centered[..., 0], centered[..., 1]
+    rotated = np.empty_like(centered)
+    rotated[..., 0] = cos[:, None] * x - sin[:, None] * y
+    rotated[..., 1] = sin[:, None] * x + cos[:, None] * y
+    rotated[..., 2] = centered[..., 2]
+    vectors = (rotated / length[:, None, None]).reshape(len(lm), FEATURES)
+    return vectors[0] if single else vectors
+
+
+class TemplateIndex:
+    """
+    Plantillas normalizadas de un perfil con búsqueda de vecinos.
+
+    Las muestras nuevas se añaden en huecos preasignados (la capacidad se
+    duplica al llenarse) y solo se calculan sus normas, sin reconstruir el
+    índice. Cada `add` publica una instantánea nueva de una sola vez, así
+    que las búsquedas desde los hilos de trabajo no necesitan bloqueo.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._vectors = np.empty((max(1, capacity), FEATURES), dtype=np.float32)
+        self._norms = np.empty(max(1, capacity), dtype=np.float32)
+        self._label_ids = np.empty(max(1, capacity), dtype=np.int32)
+        self.labels: List[str] = []
+        self.actions: Dict[str, str] = {}
+        self._lock = threading.Lock()  # Solo entre escritores
+        # (vectores, normas, etiquetas) de las plantillas publicadas
+        self._snapshot: Tuple[np.ndarray, np.ndarray, np.ndarray] = (
+            self._vectors[:0], self._norms[:0], self._label_ids[:0])
+
+    def __len__(self) -> int:
+        return len(self._snapshot[0])
+
+    def add(self, gesture: str, landmarks: Union[np.ndarray, Sequence], action: Optional[str] = None):
+        """
+        Añade muestras de un gesto.
+
+        Args:
+            gesture: Nombre del gesto
+            landmarks: Muestras (21, 3) o (N, 21, 3)
+            action: Acción del gesto (por defecto, la del gesto integrado
+                del mismo nombre o 'none')
+        """
+        vectors = normalize_landmarks(np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3))
+        with self._lock:
+            if gesture not in self.actions:
+                self.labels.append(gesture)
+            self.actions[gesture] = action or self.actions.get(gesture) or DEFAULT_ACTIONS.get(gesture, 'none')
+            label_id = self.labels.index(gesture)
+
+            count = len(self)
+            needed = count + len(vectors)
+            if needed > len(self._vectors):
+                capacity = max(needed, 2 * len(self._vectors))
+                # Arrays nuevos: la instantánea anterior sigue siendo válida para quien la use
+                self._vectors = np.concatenate([self._vectors[:count], np.empty((capacity - count, FEATURES), np.float32)])
+                self._norms = np.concatenate([self._norms[:count], np.empty(capacity - count, np.float32)])
+                self._label_ids = np.concatenate([self._label_ids[:count], np.empty(capacity - count, np.int32)])
+
+            # Los huecos nuevos están fuera de la instantánea publicada
+            self._vectors[count:needed] = vectors
+            self._norms[count:needed] = (vectors ** 2).sum(axis=1)
+            self._label_ids[count:needed] = label_id
+            self._snapshot = (self._vectors[:needed], self._norms[:needed], self._label_ids[:needed])
+
+    def nearest(self, vectors: np.ndarray, k: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vecinos más cercanos de un lote de vectores normalizados.
+
+        Returns:
+            (distancias (N, k') ordenadas, ids de etiqueta (N, k')), con
+            k' = min(k, plantillas)
+        """
+        templates, norms, label_ids = self._snapshot
+        k = min(k, len(templates))
+        if not k:
+            return np.empty((len(vectors), 0), np.float32), np.empty((len(vectors), 0), np.int32)
+
+        # |a - b|² = |a|² + |b|² - 2 a·b, con un solo producto de matrices
+        squared = (vectors ** 2).sum(axis=1)[:, None] + norms[None, :] - 2.0 * (vectors @ templates.T)
+        if k < len(templates):
+            candidates = np.argpartition(squared, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(len(templates)), squared.shape)
+        candidate_squared = np.take_along_axis(squared, candidates, axis=1)
+        order = np.argsort(candidate_squared, axis=1)
+        neighbours = np.take_along_axis(candidates, order, axis=1)
+        distances = np.sqrt(np.maximum(np.take_along_axis(candidate_squared, order, axis=1), 0.0))
+        return distances, label_ids[neighbours]
+
+    def sample_counts(self) -> Dict[str, int]:
+        """Plantillas por gesto."""
+        label_ids = self._snapshot[2]
+        counts = np.bincount(label_ids, minlength=len(self.labels)) if len(label_ids) else np.zeros(len(self.labels), int)
+        return {label: int(counts[i]) for i, label in enumerate(self.labels)}
+
+
+class TemplateClassifier:
+    """
+    Clasificador por plantillas calibradas, con la misma interfaz que
+    GestureClassifier (`classify`, `classify_batch`, `batch_result`).
+
+    Cada mano vota con sus `k` plantillas más cercanas, con peso
+    1 - distancia / `max_distance` (las más lejanas no votan). El gesto con
+    más peso gana si su confianza (peso medio por vecino) alcanza
+    `min_confidence`; si no, se usa el clasificador de reglas `fallback`.
+    """
+
+    def __init__(self, index: TemplateIndex, fallback: Optional[GestureClassifier] = None,
+                 k: int = 3, max_distance: float = 1.0, min_confidence: float = 0.5):
+        """
+        Args:
+            index: Plantillas del perfil (compartido; admite muestras nuevas en caliente)
+            fallback: Clasificador para manos sin plantilla cercana (None = 'unknown')
+            k: Vecinos que votan
+            max_distance: Distancia normalizada a partir de la cual una plantilla no vota
+            min_confidence: Confianza mínima del gesto ganador
+        """
+        self.index = index
+        self.fallback = fallback
+        self.k = k
+        self.max_distance = max_distance
+        self.min_confidence = min_confidence
+        # Los umbrales de las reglas se mantienen (grabación de sesiones, métricas)
+        self.thresholds = fallback.thresholds if fallback else {}
+
+    def classify(self, landmarks) -> Dict:
+        """Clasifica una mano (array (21, 3) o lista de diccionarios {'x', 'y', 'z'})."""
+        if landmarks is None or len(landmarks) != NUM_LANDMARKS:
+            return {'gesture': 'unknown', 'confidence': 0.0, 'action': 'none'}
+        if not isinstance(landmarks, np.ndarray):
+            landmarks = np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks])
+        return self.batch_result(self.classify_batch(landmarks[np.newaxis]), 0)
+
+    def classify_batch(self, landmarks: np.ndarray) -> Dict:
+        """
+        Clasifica un lote (N, 21, 3).
+
+        Returns:
+            Columnas: template_id (índice en index.labels o -1), confidence,
+            landmarks y, si hay `fallback`, su resultado por lotes
+        """
+        lm = np.asarray(landmarks, dtype=np.float64)
+        if lm.ndim != 3 or lm.shape[1:] != (NUM_LANDMARKS, 3):
+            raise ValueError(f"Se esperaba un array (N, 21, 3), recibido {lm.shape}")
+
+        distances, label_ids = self.index.nearest(normalize_landmarks(lm), self.k)
+        template_id = np.full(len(lm), -1, dtype=np.int32)
+        confidence = np.zeros(len(lm))
+        if distances.shape[1]:
+            weights = np.clip(1.0 - distances / self.max_distance, 0.0, None)
+            scores = np.zeros((len(lm), len(self.index.labels)))
+            rows = np.repeat(np.arange(len(lm)), distances.shape[1])
+            np.add.at(scores, (rows, label_ids.ravel()), weights.ravel())
+            best = scores.argmax(axis=1)
+            confidence = scores[np.arange(len(lm)), best] / distances.shape[1]
+            matched = confidence >= self.min_confidence
+            template_id = np.where(matched, best, -1).astype(np.int32)
+            confidence = np.where(matched, confidence, 0.0)
+
+        batch = {'template_id': template_id, 'confidence': confidence, 'landmarks': lm}
+        if self.fallback is not None and (template_id < 0).any():
+            batch['fallback'] = self.fallback.classify_batch(lm)
+        return batch
+
+    def batch_result(self, batch: Dict, index: int) -> Dict:
+        """Reconstruye el diccionario de `classify` para una fila de `classify_batch`."""
+        template_id = int(batch['template_id'][index])
+        if template_id < 0:
+            if 'fallback' in batch:
+                return self.fallback.batch_result(batch['fallback'], index)
+            return {'gesture': 'unknown', 'confidence': 0.0, 'action': 'none'}
+
+        gesture = self.index.labels[template_id]
+        action = self.index.actions[gesture]
+        return {
+            'gesture': gesture,
+            'confidence': float(batch['confidence'][index]),
+            'action': action,
+            'details': self._details(action, batch['landmarks'][index])
+        }
+
+    @staticmethod
+    def _details(action: str, lm: np.ndarray) -> Dict:
+        """Posiciones que necesita la acción (mismos campos que GestureClassifier)."""
+        if action in ('move_cursor', 'scroll'):
+            index_tip = lm[GestureClassifier.INDEX_FINGER_TIP]
+            return {'cursor_x': float(index_tip[0]), 'cursor_y': float(index_tip[1])}
+        if action == 'drag_drop':
+            thumb_tip = lm[GestureClassifier.THUMB_TIP]
+            index_tip = lm[GestureClassifier.INDEX_FINGER_TIP]
+            center = (thumb_tip + index_tip) / 2
+            return {'pinch_x': float(center[0]), 'pinch_y': float(center[1]),
+                    'distance': float(np.linalg.norm(thumb_tip - index_tip))}
+        return {}
+
+
+class TemplateLibrary:
+    """
+    Índices de plantillas por perfil, cargados de la colección de
+    calibraciones la primera vez que se piden.
+
+    Las muestras nuevas se guardan en la base (si la hay) y se añaden al
+    índice en memoria, que comparten las sesiones activas del perfil: las
+    ven desde el siguiente frame. Se usa solo desde el event loop.
+    """
+
+    def __init__(self, collection=None):
+        """
+        Args:
+            collection: Colección de CalibrationData de Motor (o None: solo en memoria)
+        """
+        self.collection = collection
+        self._indexes: Dict[str, TemplateIndex] = {}
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._calibrations: Dict[str, Dict[str, Dict]] = {}  # perfil -> gesto -> documento
+
+    async def get(self, profile_id: str) -> TemplateIndex:
+        """Índice del perfil (vacío si no tiene calibraciones)."""
+        index = self._indexes.get(profile_id)
+        if index is not None:
+            return index
+        pending = self._loading.get(profile_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[profile_id] = future
+        try:
+            index = TemplateIndex()
+            documents = {}
+            if self.collection is not None:
+                async for doc in self.collection.find({"profile_id": profile_id}, {"_id": 0}):
+                    samples = doc.get('calibration_data', {}).get('landmarks') or []
+                    if samples:
+                        index.add(doc['gesture_name'], samples, doc.get('calibration_data', {}).get('action'))
+                    documents[doc['gesture_name']] = doc
+            self._indexes[profile_id] = index
+            self._calibrations[profile_id] = documents
+            future.set_result(index)
+            return index
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._loading[profile_id]
+
+    async def add_samples(self, profile_id: str, gesture_name: str, samples: Sequence,
+                          action: Optional[str] = None, confidence: Optional[float] = None) -> Dict:
+        """
+        Añade muestras de calibración de un gesto al perfil.
+
+        Returns:
+            Documento CalibrationData actualizado (sin los landmarks)
+        """
+        index = await self.get(profile_id)
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+        index.add(gesture_name, samples, action)
+
+        documents = self._calibrations.setdefault(profile_id, {})
+        previous = documents.get(gesture_name)
+        previous = previous or {}
+        count = previous.get('sample_count', 0)
+        stored = previous.get('calibration_data', {}).get('landmarks', [])
+        average = previous.get('average_confidence', 0.0)
+        if confidence is not None:
+            average = (average * count + confidence * len(samples)) / (count + len(samples))
+
+        # Mismos campos que models.CalibrationData
+        calibration = {
+            'id': previous.get('id') or str(uuid.uuid4()),
+            'profile_id': profile_id,
+            'gesture_name': gesture_name,
+            'sample_count': count + len(samples),
+            'average_confidence': average,
+            'calibration_data': {'action': index.actions[gesture_name], 'landmarks': stored + samples.tolist()},
+            'created_at': previous.get('created_at') or datetime.now(timezone.utc)
+        }
+        documents[gesture_name] = calibration
+
+        if self.collection is not None:
+            await self.collection.update_one({"profile_id": profile_id, "gesture_name": gesture_name},
+                                             {"$set": calibration}, upsert=True)
+        return self._summary(calibration)
+
+    async def calibrations(self, profile_id: str) -> List[Dict]:
+        """Calibraciones del perfil, sin los landmarks."""
+        await self.get(profile_id)
+        return [self._summary(doc) for doc in self._calibrations.get(profile_id, {}).values()]
+
+    @staticmethod
+    def _summary(doc: Dict) -> Dict:
+        summary = {key: value for key, value in doc.items() if key != 'calibration_data'}
+        summary['calibration_data'] = {'action': doc.get('calibration_data', {}).get('action')}
+        return summary
@@ -8,6 +8,27 @@ import { Video, VideoOff, Activity } from 'lucide-react';
 // Definir una URL de backend por defecto en caso de que la variable de entorno no esté disponible
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8000';
 
+// Protocolo binario de frames: cabecera fija de 16 bytes (little-endian)
+// magic 'GF' | versión (u8) | códec (u8) | frame_id (u32) | timestamp ms (f64)
+// seguida de los bytes JPEG. Se negocia mediante Sec-WebSocket-Protocol.
+const BINARY_SUBPROTOCOL = 'gestures.binary.v1';
+const FRAME_HEADER_SIZE = 16;
+const FRAME_VERSION = 1;
+const CODEC_JPEG = 1;
+
+const buildBinaryFrame = (jpegBuffer, frameId, timestamp) => {
+  const message = new Uint8Array(FRAME_HEADER_SIZE + jpegBuffer.byteLength);
+  const view = new DataView(message.buffer);
+  view.setUint8(0, 0x47); // 'G'
+  view.setUint8(1, 0x46); // 'F'
+  view.setUint8(2, FRAME_VERSION);
+  view.setUint8(3, CODEC_JPEG);
+  view.setUint32(4, frameId >>> 0, true);
+  view.setFloat64(8, timestamp, true);
+  message.set(new Uint8Array(jpegBuffer), FRAME_HEADER_SIZE);
+  return message.buffer;
+};
+
 const GestureCamera = ({ profileId, onGestureDetected }) => {
   const webcamRef = useRef(null);
   const socketRef = useRef(null);
@@ -19,6 +40,7 @@ const GestureCamera = ({ profileId, onGestureDetected }) => {
   const [connectionStatus, setConnectionStatus] = useState('disconnected');
   const [errorMessage, setErrorMessage] = useState(null);
   const frameCountRef = useRef(0);
+  const frameIdRef = useRef(0);
   const lastTimeRef = useRef(Date.now());
 
   // Configuración de webcam
@@ -39,12 +61,13 @@ const GestureCamera = ({ profileId, onGestureDetected }) => {
         
         console.log('Conectando a WebSocket:', wsUrl);
        
-        // Usar WebSocket nativo para conexión directa
-        const ws = new WebSocket(wsUrl);
+        // Usar WebSocket nativo para conexión directa, ofreciendo el protocolo binario
+        const ws = new WebSocket(wsUrl, [BINARY_SUBPROTOCOL]);
+        ws.binaryType = 'arraybuffer';
         socketRef.current = ws;
         
         ws.onopen = () => {
-        console.log('✅ WebSocket conectado exitosamente');
+        console.log('✅ WebSocket conectado exitosamente. Protocolo:', ws.protocol || 'json');
         setConnectionStatus('connected');
         setErrorMessage(null);
       };
@@ -100,19 +123,35 @@ const GestureCamera = ({ profileId, onGestureDetected }) => {
       return;
     }
 
-    const imageSrc = webcamRef.current.getScreenshot();
-    
-    if (!imageSrc) {
-      console.warn('⚠️ No se pudo capturar frame de la cámara');
-      return;
-    }
+    const socket = socketRef.current;
+    const frameId = ++frameIdRef.current;
+    const timestamp = Date.now();
 
     try {
-      const startTime = Date.now();
-      
-      socketRef.current.send(JSON.stringify({
-        image: imageSrc
-      }));
+      if (socket.protocol === BINARY_SUBPROTOCOL) {
+        // Enviar los bytes JPEG directamente, sin base64
+        const canvas = webcamRef.current.getCanvas();
+        if (!canvas) {
+          console.warn('⚠️ No se pudo capturar frame de la cámara');
+          return;
+        }
+        canvas.toBlob(async (blob) => {
+          if (!blob || socket.readyState !== WebSocket.OPEN) return;
+          const jpegBuffer = await blob.arrayBuffer();
+          socket.send(buildBinaryFrame(jpegBuffer, frameId, timestamp));
+        }, 'image/jpeg', 0.92);
+      } else {
+        const imageSrc = webcamRef.current.getScreenshot();
+        if (!imageSrc) {
+          console.warn('⚠️ No se pudo capturar frame de la cámara');
+          return;
+        }
+        socket.send(JSON.stringify({
+          image: imageSrc,
+          frame_id: frameId,
+          timestamp
+        }));
+      }
 
       console.log('📤 Frame enviado al servidor');
 
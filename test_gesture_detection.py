@@ -5,7 +5,8 @@ Crea una imagen de prueba con MediaPipe y la procesa.
 """
 
 import sys
-sys.path.insert(0, '/app/backend')
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'backend'))
 
 import cv2
 import numpy as np
@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+from pathlib import Path
+import sys
+
+import pytest
+
+# Los servicios del backend se importan como paquetes de primer nivel (services, models)
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from .legacy_classifier import LegacyGestureClassifier
+
+
+class ScriptedPool:
+    """
+    Pool de detectores que devuelve manos preparadas en lugar de ejecutar
+    MediaPipe: una entrada del guion por detección, repitiendo la última
+    cuando se acaba. `calls` cuenta las detecciones.
+    """
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.calls = 0
+
+    @contextmanager
+    def lease(self, session):
+        yield self
+
+    def detect_landmarks(self, image):
+        hands = self.frames[min(self.calls, len(self.frames) - 1)]
+        self.calls += 1
+        return hands
+
+    def release_session(self, session):
+        pass
+
+
+@pytest.fixture
+def scripted_pool():
+    """Fábrica de ScriptedPool: `scripted_pool([manos_frame_0, manos_frame_1, ...])`."""
+    return ScriptedPool
+
+
+@pytest.fixture
+def legacy_classifier():
+    """Clase del clasificador original (sin vectorizar) para las pruebas de equivalencia."""
+    return LegacyGestureClassifier
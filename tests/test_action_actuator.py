@@ -0,0 +1,92 @@
+import threading
+
+from services.action_actuator import ActionActuator
+from services.pipeline_metrics import StageMetrics, render_prometheus
+
+
+class SlowController:
+    """Registra las acciones; la primera se bloquea hasta que el test la libera."""
+
+    def __init__(self):
+        self.actions = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def execute_action(self, action, details=None):
+        self.started.set()
+        self.release.wait(2.0)
+        self.actions.append((action, details))
+        return {"success": action != 'unknown'}
+
+
+def test_actions_run_in_order_without_blocking_caller():
+    controller = SlowController()
+    actuator = ActionActuator(controller)
+
+    result = actuator.execute_action('left_click')
+    assert result['queued']
+    assert controller.started.wait(1.0)
+    # El llamante no espera a que termine la acción en curso
+    actuator.execute_action('scroll', {'direction': 'up'})
+    assert controller.actions == []
+
+    controller.release.set()
+    assert actuator.wait_idle(1.0)
+    assert controller.actions == [('left_click', None), ('scroll', {'direction': 'up'})]
+
+    stats = actuator.get_statistics()
+    assert stats['executed'] == 2
+    assert stats['execution']['left_click']['count'] == 1
+    actuator.close()
+
+
+def test_consecutive_moves_are_coalesced():
+    controller = SlowController()
+    actuator = ActionActuator(controller)
+    actuator.execute_action('left_click')
+    assert controller.started.wait(1.0)
+
+    for i in range(5):
+        actuator.execute_action('move_cursor', {'position': (i / 10, 0.5)})
+    actuator.execute_action('right_click')
+    actuator.execute_action('move_cursor', {'position': (0.9, 0.9)})
+    assert actuator.pending == 3
+
+    controller.release.set()
+    assert actuator.wait_idle(1.0)
+    assert controller.actions == [('left_click', None),
+                                  ('move_cursor', {'position': (0.4, 0.5)}),
+                                  ('right_click', None),
+                                  ('move_cursor', {'position': (0.9, 0.9)})]
+    assert actuator.coalesced == 4
+    actuator.close()
+
+
+def test_full_queue_drops_and_close_discards_pending():
+    controller = SlowController()
+    actuator = ActionActuator(controller, max_queue=2)
+    actuator.execute_action('left_click')
+    assert controller.started.wait(1.0)
+
+    assert actuator.execute_action('scroll')['queued']
+    assert actuator.execute_action('right_click')['queued']
+    assert not actuator.execute_action('drag_drop')['success']
+    assert actuator.dropped == 1
+
+    controller.release.set()
+    actuator.close()
+    assert actuator.pending == 0
+    assert not actuator.execute_action('left_click')['queued']
+
+
+def test_histograms_render_with_action_label():
+    controller = SlowController()
+    controller.release.set()
+    actuator = ActionActuator(controller)
+    actuator.execute_action('move_cursor', {'position': (0.1, 0.1)})
+    assert actuator.wait_idle(1.0)
+    actuator.close()
+
+    text = render_prometheus(StageMetrics(), [], [], actuator.histograms())
+    assert '# TYPE gesture_action_duration_seconds histogram' in text
+    assert 'gesture_action_duration_seconds_count{action="move_cursor"} 1' in text
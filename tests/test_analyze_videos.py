@@ -0,0 +1,54 @@
+import cv2
+import pytest
+
+from benchmarks.analyze_videos import plan_chunks, run
+from benchmarks.sample_frames import render_hand_image
+from benchmarks.synthetic_hands import canonical_hand
+from services.session_recording import SessionRecording
+
+GESTURES = (['open_hand'] * 15 + ['index_point'] * 15 + ['thumbs_up'] * 15) * 2
+
+
+@pytest.fixture(scope='module')
+def video(tmp_path_factory):
+    path = tmp_path_factory.mktemp('videos') / 'session.avi'
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30, (640, 480))
+    for gesture in GESTURES:
+        writer.write(render_hand_image(canonical_hand(gesture)))
+    writer.release()
+    return str(path)
+
+
+def _timeline(results):
+    return [(s['gesture'], s['start_s'], s['end_s'], s['frames']) for s in results['timeline']]
+
+
+def test_plan_chunks_covers_every_frame(video):
+    chunks, fps = plan_chunks([video, video], 40, overlap=5)
+
+    assert fps == [30.0, 30.0]
+    assert [c[2:] for c in chunks[:3]] == [(0, 40, 0), (40, 80, 5), (80, None, 5)]
+    assert [c[0] for c in chunks] == [0, 0, 0, 1, 1, 1]
+
+
+def test_timeline_does_not_depend_on_chunking(video, tmp_path):
+    whole = run([video], workers=0, chunk_frames=1000)
+    chunked = run([video], workers=0, chunk_frames=13, record_dir=str(tmp_path))
+
+    assert _timeline(chunked) == _timeline(whole)
+    assert [s['gesture'] for s in whole['timeline']] == ['open_hand', 'index_point', 'thumbs_up'] * 2
+    assert chunked['throughput']['frames'] == len(GESTURES)
+    assert chunked['throughput']['chunks'] == 7
+
+    # La grabación permite repetir el análisis con otros umbrales sin MediaPipe
+    recording = SessionRecording(tmp_path / 'session.gesrec')
+    assert len(recording) == len(GESTURES)
+    assert (recording['num_hands'] == 1).all()
+
+
+def test_process_pool_stitches_chunks_in_order(video):
+    results = run([video], workers=2, chunk_frames=20)
+
+    assert _timeline(results) == _timeline(run([video], workers=0, chunk_frames=20))
+    assert results['throughput']['workers'] == 2
+    assert sum(results['throughput']['frames_per_worker']) == len(GESTURES)
@@ -0,0 +1,33 @@
+from benchmarks.bench_pipeline import STAGES, compare, run, summarize
+
+
+def test_summarize_percentiles():
+    stats = summarize([float(i) for i in range(1, 101)])
+
+    assert stats['count'] == 100
+    assert stats['p50_ms'] == 50.5
+    assert stats['p99_ms'] == 99.01
+    assert stats['fps'] == round(1000 / 50.5, 1)
+    assert summarize([]) == {'count': 0}
+
+
+def test_small_run_reports_every_stage():
+    results = run(resolutions=[(320, 240)], frames=8, warmup=2)
+
+    frames = results['frames']['320x240']
+    assert frames['frames'] == 8
+    assert frames['frames_with_hands'] > 0
+    assert set(frames['stages']) == set(STAGES) | {'total'}
+    assert frames['stages']['detect']['count'] == 8
+    assert results['landmarks']['stages']['classify']['count'] == 80
+    assert len(compare(results, results)) > 1
+
+
+def test_run_measures_the_configured_pipeline():
+    results = run(resolutions=[(320, 240)], frames=6, warmup=1, motion_gate=True, max_hands=2, dynamic=True)
+
+    frames = results['frames']['320x240']
+    assert frames['stages']['gate']['count'] == 6
+    assert frames['motion_gate']['frames'] == 6
+    assert 'gestures' in frames['dynamic']
+    assert results['config']['max_hands'] == 2
@@ -0,0 +1,156 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from benchmarks.bench_pipeline import DryRunController
+from benchmarks.sample_frames import render_hand_image
+from benchmarks.synthetic_hands import canonical_hand
+from services.camera_capture import CameraCapture, FrameRing, parse_source
+from services.detector_pool import DetectorPool
+from services.gesture_classifier import GestureClassifier
+from services.gesture_pipeline import GesturePipeline
+from services.gesture_processor import GestureProcessor
+
+
+def _write_video(path, gestures, width=640, height=480):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30, (width, height))
+    for gesture in gestures:
+        writer.write(render_hand_image(canonical_hand(gesture), width, height))
+    writer.release()
+    return path
+
+
+def test_ring_never_overwrites_the_leased_frame():
+    ring = FrameRing(3, (2, 2))
+    for i in range(2):
+        ring.writable()[...] = i
+        ring.commit(i, 0.0)
+    frame, frame_id, _ = ring.acquire(timeout=0)
+    assert frame_id == 1 and ring.dropped == 1
+
+    # El productor da varias vueltas mientras el frame está prestado
+    for i in range(2, 10):
+        ring.writable()[...] = i
+        ring.commit(i, 0.0)
+    assert (frame == 1).all()
+    assert ring.acquire(timeout=0)[1] == 9
+    ring.close()
+    assert ring.acquire(timeout=0) is None
+
+
+def test_blocking_ring_hands_over_every_frame():
+    ring = FrameRing(3, (1,))
+    seen = []
+
+    def consume():
+        while (leased := ring.acquire()) is not None:
+            seen.append(int(leased[0][0]))
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    for i in range(50):
+        ring.writable(block=True)[0] = i
+        ring.commit(i, 0.0)
+    ring.close()
+    consumer.join(2)
+
+    assert seen == list(range(50))
+    assert ring.dropped == 0
+
+
+def test_parse_source():
+    assert parse_source('0') == 0
+    assert parse_source(' 2 ') == 2
+    assert parse_source('/videos/demo.avi') == '/videos/demo.avi'
+
+
+class RecordingPipeline:
+    """Guarda una copia de cada frame recibido (el frame prestado se reutiliza)."""
+
+    def __init__(self):
+        self.frames = []
+        self.closed = False
+
+    def process_image(self, image, frame_id=0, timestamp=None):
+        self.frames.append(image.copy())
+        return {'frame_id': frame_id}
+
+    def close(self):
+        self.closed = True
+
+
+def test_video_frames_arrive_intact_and_in_order(tmp_path):
+    gestures = ['fist', 'open_hand', 'index_point', 'thumbs_up'] * 5
+    path = _write_video(tmp_path / 'hand.avi', gestures)
+    pipeline = RecordingPipeline()
+
+    capture = CameraCapture(str(path), pipeline, slots=3)
+    capture.start()
+    assert capture.wait(timeout=10)
+    capture.stop()
+
+    reader = cv2.VideoCapture(str(path))
+    expected = [reader.read()[1] for _ in gestures]
+    assert len(pipeline.frames) == len(gestures)
+    assert all(np.array_equal(a, b) for a, b in zip(pipeline.frames, expected))
+    assert capture.get_statistics()['dropped'] == 0
+    assert pipeline.closed
+
+
+class BlockingPipeline(RecordingPipeline):
+    """Se queda dentro de `process_image` hasta que se abre `gate`."""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    def process_image(self, image, frame_id=0, timestamp=None):
+        self.entered.set()
+        self.gate.wait(10)
+        return super().process_image(image, frame_id, timestamp)
+
+
+def test_stop_defers_release_while_a_thread_is_busy(tmp_path):
+    path = _write_video(tmp_path / 'hand.avi', ['fist'] * 4)
+    pipeline = BlockingPipeline()
+    capture = CameraCapture(str(path), pipeline)
+    capture.start()
+    assert pipeline.entered.wait(10)
+
+    capture.stop(timeout=0.05)
+    # El hilo de procesamiento sigue usando el pipeline: nada se ha liberado
+    assert not pipeline.closed and capture.capture.isOpened()
+
+    pipeline.gate.set()
+    assert capture.wait(timeout=10)
+    capture._capture_thread.join(10)
+    assert pipeline.closed and not capture.capture.isOpened()
+
+
+def test_video_file_runs_through_the_pipeline(tmp_path):
+    gestures = ['open_hand'] * 8
+    path = _write_video(tmp_path / 'hand.avi', gestures)
+    pool = DetectorPool(size=1, max_num_hands=1)
+    controller = DryRunController()
+    pipeline = GesturePipeline(pool, GestureClassifier(), GestureProcessor(), controller)
+    results = []
+
+    capture = CameraCapture(str(path), pipeline, on_result=results.append)
+    capture.start()
+    assert capture.wait(timeout=30)
+    stats = capture.get_statistics()
+    capture.stop()
+    pool.close()
+
+    assert stats['captured'] == stats['processed'] == len(gestures)
+    assert [r['frame_id'] for r in results] == list(range(len(gestures)))
+    assert results[-1]['gesture'] == 'open_hand'
+    assert controller.actions['scroll'] >= 1
+
+
+def test_missing_source_raises(tmp_path):
+    with pytest.raises(RuntimeError):
+        CameraCapture(str(tmp_path / 'missing.avi'), pipeline=None)
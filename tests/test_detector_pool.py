@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from services.detector_pool import DetectorPool
+
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = DetectorPool(size=2, max_num_hands=1)
+    pool.warm_up(width=64, height=48)
+    yield pool
+    pool.close()
+
+
+def test_session_keeps_its_detector(pool):
+    with pool.lease('a') as first:
+        pass
+    with pool.lease('b'):
+        with pool.lease('a') as second:
+            pass
+
+    assert first is second
+    assert pool.affinity_hits >= 1
+
+
+def test_detector_is_reset_when_it_changes_session(pool):
+    with pool.lease('c'), pool.lease('d'):
+        pass
+    resets = pool.resets
+
+    # Ambos detectores pertenecían a otra sesión: 'e' recibe uno reiniciado
+    with pool.lease('e'):
+        pass
+
+    assert pool.resets == resets + 1
+
+
+def test_lease_times_out_when_exhausted(pool):
+    leased = threading.Event()
+    release = threading.Event()
+
+    def hold(key):
+        with pool.lease(key):
+            leased.set()
+            release.wait()
+
+    holders = [threading.Thread(target=hold, args=(key,)) for key in ('x', 'y')]
+    for holder in holders:
+        holder.start()
+    while pool.available:
+        leased.wait(0.01)
+
+    with pytest.raises(TimeoutError):
+        with pool.lease('z', timeout=0.05):
+            pass
+
+    release.set()
+    for holder in holders:
+        holder.join()
+    assert pool.available == pool.size
@@ -0,0 +1,122 @@
+import numpy as np
+
+from benchmarks.bench_pipeline import DryRunController
+from benchmarks.synthetic_hands import canonical_hand
+from services.dynamic_gestures import DynamicGestureRecognizer, LandmarkHistory
+from services.gesture_classifier import GestureClassifier
+from services.gesture_pipeline import GesturePipeline
+from services.gesture_processor import GestureProcessor
+from services.landmarks import DetectedHands
+from services.multi_hand import MultiHandProcessor
+
+
+def _trajectory(path, frames, fps=30.0, start=0.0, seed=0, noise=0.002):
+    """Mano abierta cuyo centro sigue `path(t)` con t en [0, 1]: [(landmarks, instante), ...]."""
+    rng = np.random.default_rng(seed)
+    hand = canonical_hand('open_hand')
+    return [(hand + [*path(i / (frames - 1)), 0.0] + rng.normal(0.0, noise, hand.shape), start + i / fps)
+            for i in range(frames)]
+
+
+def _recognize(recognizer, frames):
+    return [r for r in (recognizer.update(landmarks, timestamp) for landmarks, timestamp in frames) if r]
+
+
+def _circle(sign, phase=0.0, radius=0.12):
+    return lambda t: (radius * np.cos(phase + sign * 2 * np.pi * t), radius * np.sin(phase + sign * 2 * np.pi * t))
+
+
+def test_swipes_in_each_direction_at_different_speeds():
+    swipes = {
+        'swipe_right': lambda t: (0.4 * t - 0.2, 0.0),
+        'swipe_left': lambda t: (0.2 - 0.4 * t, 0.02 * t),
+        'swipe_down': lambda t: (0.0, 0.35 * t - 0.2),
+        'swipe_up': lambda t: (0.01 * t, 0.15 - 0.35 * t),
+    }
+    for frames in (10, 20):
+        for gesture, path in swipes.items():
+            results = _recognize(DynamicGestureRecognizer(), _trajectory(path, frames))
+            assert [r['gesture'] for r in results] == [gesture]
+            assert results[0]['confidence'] > 0.9
+            assert results[0]['travel'] >= 1.5
+
+
+def test_circles_from_any_starting_point():
+    for phase in (0.0, 1.0, 2.5):
+        for gesture, sign in (('circle_cw', 1.0), ('circle_ccw', -1.0)):
+            results = _recognize(DynamicGestureRecognizer(), _trajectory(_circle(sign, phase), 28))
+            # El arco inicial no se confunde con un deslizamiento
+            assert [r['gesture'] for r in results] == [gesture]
+
+
+def test_still_hands_short_moves_and_gaps_produce_nothing():
+    recognizer = DynamicGestureRecognizer()
+    assert _recognize(recognizer, _trajectory(lambda t: (0.0, 0.0), 60)) == []
+    assert _recognize(recognizer, _trajectory(lambda t: (0.15 * t, 0.0), 10, start=2.0)) == []
+
+    # Un frame sin mano corta la trayectoria: dos mitades de un deslizamiento no suman uno
+    frames = _trajectory(lambda t: (0.4 * t, 0.0), 12, start=4.0)
+    assert _recognize(recognizer, frames[:6]) == []
+    assert recognizer.update(None) is None
+    assert _recognize(recognizer, frames[6:]) == []
+    assert recognizer.get_statistics()['gestures'] == {}
+
+
+def test_cooldown_gives_one_event_per_movement():
+    recognizer = DynamicGestureRecognizer(cooldown_ms=400)
+    there = _trajectory(lambda t: (0.4 * t - 0.2, 0.0), 10)
+    back = _trajectory(lambda t: (0.2 - 0.4 * t, 0.0), 10, start=1.0)
+
+    results = _recognize(recognizer, there + there[-1:] * 3 + back)
+
+    assert [r['gesture'] for r in results] == ['swipe_right', 'swipe_left']
+    assert recognizer.get_statistics()['gestures'] == {'swipe_right': 1, 'swipe_left': 1}
+
+
+def test_history_ring_keeps_arc_length_across_wraparound():
+    history = LandmarkHistory(capacity=8)
+    hand = canonical_hand('open_hand')
+    for i in range(20):
+        history.push(hand + [0.01 * i, 0.0, 0.0], i / 30)
+
+    indices = history.window(0.0)
+    assert len(history) == len(indices) == 8
+    assert np.allclose(np.diff(history.timestamps[indices]), 1 / 30)
+    assert np.allclose(np.diff(history.arc_lengths[indices]), 0.01)
+    assert len(history.window(19 / 30 - 0.05)) == 2
+
+
+def test_pipeline_reports_dynamic_gesture_alongside_static(scripted_pool):
+    hands = [DetectedHands(landmarks[np.newaxis].astype(np.float32), ['Right'], [0.9])
+             for landmarks, _ in _trajectory(lambda t: (0.2 - 0.4 * t, 0.0), 10)]
+    pipeline = GesturePipeline(scripted_pool(hands + [None]), GestureClassifier(), GestureProcessor(),
+                               DryRunController(), dynamic_gestures=DynamicGestureRecognizer())
+    image = np.zeros((48, 64, 3), np.uint8)
+
+    results = [pipeline.process_image(image, frame_id) for frame_id in range(len(hands) + 1)]
+
+    dynamic = [(r['frame_id'], r['dynamic']['gesture']) for r in results if 'dynamic' in r]
+    assert len(dynamic) == 1 and dynamic[0][1] == 'swipe_left'
+    assert results[dynamic[0][0]]['gesture'] in ('open_hand', 'unknown')
+    assert results[-1]['hands_detected'] == 0
+
+
+def test_pipeline_follows_primary_hand_when_detection_order_swaps(scripted_pool):
+    static = canonical_hand('open_hand').astype(np.float32) + [0.0, 0.3, 0.0]
+    hands = []
+    for i, (landmarks, _) in enumerate(_trajectory(lambda t: (0.4 * t - 0.2, 0.0), 12)):
+        pair = [landmarks.astype(np.float32), static]
+        # MediaPipe no garantiza el orden: la mano que se mueve alterna entre primera y segunda
+        if i % 2:
+            hands.append(DetectedHands(np.stack(pair[::-1]), ['Left', 'Right'], [0.9, 0.9]))
+        else:
+            hands.append(DetectedHands(np.stack(pair), ['Right', 'Left'], [0.9, 0.9]))
+    pipeline = GesturePipeline(scripted_pool(hands), GestureClassifier(), GestureProcessor(), DryRunController(),
+                               multi_hand=MultiHandProcessor(GestureProcessor()),
+                               dynamic_gestures=DynamicGestureRecognizer())
+    image = np.zeros((48, 64, 3), np.uint8)
+
+    results = [pipeline.process_image(image, frame_id) for frame_id in range(len(hands))]
+
+    assert [r['dynamic']['gesture'] for r in results if 'dynamic' in r] == ['swipe_right']
+    assert all(r['handedness'] == 'Right' for r in results)
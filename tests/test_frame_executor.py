@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+
+from services.frame_executor import FrameExecutor
+
+
+def test_preserves_order_per_session():
+    executor = FrameExecutor(max_workers=4)
+    seen = []
+
+    def work(index, delay):
+        time.sleep(delay)
+        seen.append(index)
+        return index
+
+    async def run():
+        # Los primeros trabajos tardan más: sin orden por sesión terminarían al final
+        return await asyncio.gather(*[
+            executor.submit('session', work, i, 0.02 * (5 - i)) for i in range(5)
+        ])
+
+    results = asyncio.run(run())
+    executor.shutdown()
+
+    assert results == [0, 1, 2, 3, 4]
+    assert seen == [0, 1, 2, 3, 4]
+    assert executor.get_statistics()['completed'] == 5
+
+
+def test_runs_off_the_event_loop_thread():
+    executor = FrameExecutor(max_workers=2)
+
+    async def run():
+        return await executor.submit('session', threading.get_ident)
+
+    loop_thread = threading.get_ident()
+    worker_thread = asyncio.run(run())
+    executor.shutdown()
+
+    assert worker_thread != loop_thread
+
+
+def test_queue_depth_counts_waiting_jobs():
+    executor = FrameExecutor(max_workers=1, max_queue=2)
+    depths = []
+
+    async def run():
+        tasks = [asyncio.ensure_future(executor.submit(i, time.sleep, 0.05)) for i in range(4)]
+        await asyncio.sleep(0.01)
+        depths.append(executor.queue_depth)
+        await asyncio.gather(*tasks)
+        depths.append(executor.queue_depth)
+
+    asyncio.run(run())
+    executor.shutdown()
+
+    assert depths[0] == 3
+    assert depths[1] == 0
@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+from services.frame_mailbox import FrameMailbox
+from services.frame_protocol import FramePacket
+
+
+def test_latest_frame_wins():
+    mailbox = FrameMailbox()
+
+    async def run():
+        for i in range(5):
+            mailbox.put(FramePacket(b'', frame_id=i))
+        return await mailbox.get()
+
+    packet = asyncio.run(run())
+
+    assert packet.frame_id == 4
+    assert mailbox.dropped_superseded == 4
+    assert mailbox.processed == 1
+
+
+def test_drops_frames_delayed_beyond_budget():
+    mailbox = FrameMailbox(max_age_ms=100)
+    now_ms = time.time() * 1000
+
+    async def run():
+        # Primer frame: fija el retardo de referencia de la sesión
+        mailbox.put(FramePacket(b'', frame_id=0, timestamp=now_ms))
+        first = await mailbox.get()
+        # Frame con 1 s de retraso extra respecto al de referencia
+        mailbox.put(FramePacket(b'', frame_id=1, timestamp=now_ms - 1000))
+        get_task = asyncio.ensure_future(mailbox.get())
+        await asyncio.sleep(0.01)
+        mailbox.put(FramePacket(b'', frame_id=2, timestamp=time.time() * 1000))
+        return first, await get_task
+
+    first, second = asyncio.run(run())
+
+    assert (first.frame_id, second.frame_id) == (0, 2)
+    assert mailbox.dropped_stale == 1
+
+
+def test_close_wakes_waiting_consumer():
+    mailbox = FrameMailbox()
+
+    async def run():
+        get_task = asyncio.ensure_future(mailbox.get())
+        await asyncio.sleep(0)
+        mailbox.close()
+        return await get_task
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,81 @@
+import base64
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from services.frame_protocol import (
+    BINARY_SUBPROTOCOL,
+    CODEC_PNG,
+    FRAME_HEADER,
+    FrameProtocolError,
+    decode_image,
+    encode_binary_frame,
+    negotiate_subprotocol,
+    parse_binary_frame,
+    parse_json_frame,
+)
+
+
+def _jpeg_bytes():
+    image = np.full((48, 64, 3), 127, dtype=np.uint8)
+    _, buffer = cv2.imencode('.jpg', image)
+    return buffer.tobytes()
+
+
+def test_binary_roundtrip():
+    jpeg = _jpeg_bytes()
+    message = encode_binary_frame(jpeg, frame_id=7, timestamp=1234.5)
+
+    packet = parse_binary_frame(message)
+
+    assert len(message) == FRAME_HEADER.size + len(jpeg)
+    assert packet.frame_id == 7
+    assert packet.timestamp == 1234.5
+    assert bytes(packet.payload) == jpeg
+    assert decode_image(packet).shape == (48, 64, 3)
+
+
+def test_binary_rejects_bad_header():
+    jpeg = _jpeg_bytes()
+    with pytest.raises(FrameProtocolError):
+        parse_binary_frame(b'XX' + encode_binary_frame(jpeg)[2:])
+    with pytest.raises(FrameProtocolError):
+        parse_binary_frame(encode_binary_frame(jpeg, codec=9))
+    with pytest.raises(FrameProtocolError):
+        parse_binary_frame(b'GF')
+
+
+def test_json_data_url_matches_binary_payload():
+    jpeg = _jpeg_bytes()
+    data_url = "data:image/png;base64," + base64.b64encode(jpeg).decode()
+
+    packet = parse_json_frame({'image': data_url, 'frame_id': 3})
+
+    assert bytes(packet.payload) == jpeg
+    assert packet.frame_id == 3
+    assert packet.codec == CODEC_PNG
+    assert packet.timestamp is None
+
+
+def test_json_rejects_malformed_messages_with_protocol_error():
+    # JSON válido pero con forma incorrecta: error del mensaje, no de la sesión
+    for message in ('[1, 2]', '"texto"', '{"frame_id": null, "image": "aGk="}',
+                    '{"frame_id": "abc", "image": "aGk="}'):
+        with pytest.raises(FrameProtocolError):
+            parse_json_frame(json.loads(message))
+
+
+def test_json_timestamp_must_be_finite_positive_number():
+    assert parse_json_frame({'image': 'aGk=', 'timestamp': '1700000000000.5'}).timestamp == 1700000000000.5
+    assert parse_json_frame({'image': 'aGk=', 'timestamp': None}).timestamp is None
+    for timestamp in ('abc', [1], 'nan', float('inf'), 0, -5):
+        with pytest.raises(FrameProtocolError):
+            parse_json_frame({'image': 'aGk=', 'frame_id': 1, 'timestamp': timestamp})
+
+
+def test_negotiate_prefers_binary():
+    assert negotiate_subprotocol(['gestures.json.v1', BINARY_SUBPROTOCOL]) == BINARY_SUBPROTOCOL
+    assert negotiate_subprotocol(['chat']) is None
+    assert negotiate_subprotocol([]) is None
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_hands import GESTURE_NAMES, canonical_hand, random_hands, to_landmark_dicts
+from services.gesture_classifier import GestureClassifier
+
+LOW_THRESHOLDS = {'index_point': 0.7, 'fist': 0.7, 'thumbs_up': 0.7, 'open_hand': 0.7, 'pinch': 0.7}
+
+
+@pytest.mark.parametrize('gesture', GESTURE_NAMES)
+def test_canonical_poses(gesture):
+    result = GestureClassifier().classify(to_landmark_dicts(canonical_hand(gesture)))
+
+    assert result['gesture'] == gesture
+
+
+@pytest.mark.parametrize('thresholds', [None, LOW_THRESHOLDS])
+def test_matches_legacy_implementation(legacy_classifier, thresholds):
+    legacy = legacy_classifier(confidence_thresholds=thresholds)
+    classifier = GestureClassifier(confidence_thresholds=thresholds)
+
+    for hand in random_hands(3000, seed=11, noise=0.015):
+        landmarks = to_landmark_dicts(hand)
+        assert classifier.classify(landmarks) == legacy.classify(landmarks)
+
+
+def test_float32_array_matches_dicts():
+    classifier = GestureClassifier()
+
+    for hand in random_hands(500, seed=5).astype(np.float32):
+        assert classifier.classify(hand) == classifier.classify(to_landmark_dicts(hand))
+
+
+def test_rejects_incomplete_hand():
+    result = GestureClassifier().classify(to_landmark_dicts(canonical_hand('fist'))[:20])
+
+    assert result == {'gesture': 'unknown', 'confidence': 0.0, 'action': 'none'}
+
+
+@pytest.mark.parametrize('thresholds', [None, LOW_THRESHOLDS])
+def test_classify_batch_matches_classify(thresholds):
+    classifier = GestureClassifier(confidence_thresholds=thresholds)
+    hands = random_hands(3000, seed=3, noise=0.015)
+
+    batch = classifier.classify_batch(hands)
+
+    assert batch['gesture_id'].shape == (len(hands),)
+    for i, hand in enumerate(hands):
+        assert classifier.batch_result(batch, i) == classifier.classify(hand)
+
+
+def test_classify_batch_rejects_bad_shape():
+    with pytest.raises(ValueError):
+        GestureClassifier().classify_batch(np.zeros((4, 20, 3)))
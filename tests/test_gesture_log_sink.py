@@ -0,0 +1,118 @@
+import asyncio
+from datetime import datetime, timezone
+
+from models import GestureLog
+from services.gesture_log_sink import GestureLogSink, LogBackend, SqliteLogBackend
+
+
+def _doc(i, profile_id='p1'):
+    doc = GestureLog(profile_id=profile_id, gesture='fist', confidence=0.5 + i / 1000,
+                     action='left_click').model_dump()
+    doc['timestamp'] = doc['timestamp'].isoformat()
+    return doc
+
+
+class RecordingBackend(LogBackend):
+    def __init__(self, fail=0):
+        self.batches = []
+        self.fail = fail
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def write_batch(self, docs):
+        await self.gate.wait()
+        if self.fail:
+            self.fail -= 1
+            raise IOError("backend caído")
+        self.batches.append(list(docs))
+
+    async def stats(self, profile_id=None, start=None, end=None):
+        return {}
+
+    async def recent(self, profile_id=None, limit=20):
+        return [doc for batch in self.batches for doc in batch][-limit:]
+
+
+def test_flush_by_size_and_interval():
+    async def scenario():
+        backend = RecordingBackend()
+        sink = GestureLogSink(backend, batch_size=10, flush_interval=0.2)
+        sink.start()
+        for i in range(10):
+            await sink.put(_doc(i))
+        await asyncio.sleep(0.01)
+        # Un lote completo sale sin esperar al intervalo
+        assert [len(b) for b in backend.batches] == [10]
+        for i in range(5):
+            await sink.put(_doc(10 + i))
+        await asyncio.sleep(0.01)
+        assert [len(b) for b in backend.batches] == [10]
+        await asyncio.sleep(0.3)
+        assert [len(b) for b in backend.batches] == [10, 5]
+        await sink.close()
+        return sink
+
+    sink = asyncio.run(scenario())
+    assert sink.written == 15
+    assert sink.pending == 0
+
+
+def test_backpressure_when_buffer_full():
+    async def scenario():
+        backend = RecordingBackend()
+        backend.gate.clear()
+        sink = GestureLogSink(backend, max_buffer=4, batch_size=2, flush_interval=10)
+        sink.start()
+        for i in range(4):
+            await sink.put(_doc(i))
+        # El backend está bloqueado: el quinto registro espera
+        blocked = asyncio.create_task(sink.put(_doc(4)))
+        await asyncio.sleep(0.02)
+        assert not blocked.done()
+        backend.gate.set()
+        await asyncio.wait_for(blocked, 1.0)
+        await sink.close()
+        return sink, backend
+
+    sink, backend = asyncio.run(scenario())
+    assert sink.backpressure_waits == 1
+    assert sum(len(b) for b in backend.batches) == 5
+
+
+def test_failed_batches_are_retried_then_dropped():
+    async def scenario():
+        sink = GestureLogSink(RecordingBackend(fail=1), batch_size=3, max_retries=2)
+        for i in range(3):
+            await sink.put(_doc(i))
+        await sink.flush()
+        assert sink.written == 3 and sink.failures == 1
+
+        sink.backend.fail = 10
+        await sink.put(_doc(3))
+        await sink.close()
+        return sink
+
+    sink = asyncio.run(scenario())
+    assert sink.dropped == 1
+
+
+def test_sqlite_backend_flushes_on_close(tmp_path):
+    path = tmp_path / 'logs' / 'gestures.db'
+
+    async def scenario():
+        sink = GestureLogSink(SqliteLogBackend(path), batch_size=50, flush_interval=60)
+        sink.start()
+        for i in range(120):
+            await sink.put(_doc(i, profile_id='p2' if i % 3 else 'p1'))
+        await sink.close()
+
+    asyncio.run(scenario())
+
+    reader = SqliteLogBackend(path)
+    assert reader.query("PRAGMA journal_mode")[0][0] == 'wal'
+    assert reader.query("SELECT COUNT(*) FROM gesture_logs")[0][0] == 120
+    assert reader.query("SELECT COUNT(*) FROM gesture_logs WHERE profile_id = 'p1'")[0][0] == 40
+    ts, timestamp = reader.query("SELECT ts, timestamp FROM gesture_logs LIMIT 1")[0]
+    assert abs(datetime.fromisoformat(timestamp).timestamp() - ts) < 1e-6
+    assert datetime.fromisoformat(timestamp).tzinfo == timezone.utc
+    asyncio.run(reader.close())
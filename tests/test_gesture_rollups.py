@@ -0,0 +1,102 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+
+from services.gesture_log_sink import SqliteLogBackend
+from services.gesture_rollups import aggregate, rollup_ranges
+
+BASE = datetime(2026, 3, 2, 10, 0, tzinfo=timezone.utc).timestamp()
+GESTURES = [('index_point', 'move_cursor'), ('fist', 'left_click'), ('pinch', 'drag_drop')]
+
+
+def _logs(count, seed=0):
+    rng = random.Random(seed)
+    logs = []
+    for i in range(count):
+        gesture, action = rng.choice(GESTURES)
+        ts = BASE + rng.uniform(0, 5 * 3600)
+        logs.append({'id': f"log-{i}", 'profile_id': rng.choice(['a', 'b', None]), 'gesture': gesture,
+                     'action': action, 'confidence': round(rng.uniform(0.6, 1.0), 3),
+                     'timestamp': datetime.fromtimestamp(ts, timezone.utc).isoformat(),
+                     'session_id': None, 'duration_ms': None})
+    return logs
+
+
+def _brute_force(logs, profile_id, start, end):
+    counts = {}
+    for log in logs:
+        ts = datetime.fromisoformat(log['timestamp']).timestamp()
+        if profile_id is not None and log['profile_id'] != profile_id:
+            continue
+        if (start is None or ts >= start) and (end is None or ts < end):
+            counts[log['gesture']] = counts.get(log['gesture'], 0) + 1
+    return counts
+
+
+def test_rollup_ranges_use_hours_inside_and_minutes_at_edges():
+    assert rollup_ranges(None, None) == [('hour', float('-inf'), float('inf'))]
+    assert rollup_ranges(BASE + 90, BASE + 600) == [('minute', BASE + 60, BASE + 600)]
+    assert rollup_ranges(BASE + 1800, BASE + 3 * 3600 + 120) == [
+        ('hour', BASE + 3600, BASE + 3 * 3600),
+        ('minute', BASE + 1800, BASE + 3600),
+        ('minute', BASE + 3 * 3600, BASE + 3 * 3600 + 120),
+    ]
+    assert rollup_ranges(BASE + 600, BASE) == []
+
+
+def test_aggregate_counts_each_resolution():
+    increments = aggregate(_logs(50))
+    for resolution in ('minute', 'hour'):
+        assert sum(v[0] for k, v in increments.items() if k[0] == resolution) == 50
+
+
+def test_stats_match_raw_logs_for_any_minute_range(tmp_path):
+    logs = _logs(1500)
+    backend = SqliteLogBackend(tmp_path / 'logs.db')
+    for i in range(0, len(logs), 100):
+        backend.write_rows(logs[i:i + 100])
+
+    # Más de 1000 registros: el total es exacto
+    everything = asyncio.run(backend.stats())
+    assert everything['total_gestures'] == 1500
+
+    rng = random.Random(1)
+    for _ in range(20):
+        start = BASE + rng.randrange(0, 300) * 60
+        end = start + rng.randrange(1, 200) * 60
+        profile_id = rng.choice(['a', 'b', None])
+        stats = asyncio.run(backend.stats(profile_id, start, end))
+        assert stats['gesture_counts'] == _brute_force(logs, profile_id, start, end)
+
+    stats = asyncio.run(backend.stats('a'))
+    expected = [log['confidence'] for log in logs if log['profile_id'] == 'a' and log['gesture'] == 'fist']
+    assert abs(stats['mean_confidence']['fist'] - sum(expected) / len(expected)) < 1e-9
+    asyncio.run(backend.close())
+
+
+def test_replayed_logs_are_not_counted_twice(tmp_path):
+    logs = _logs(300)
+    backend = SqliteLogBackend(tmp_path / 'logs.db')
+    backend.write_rows(logs[:200])
+    # Reintento de un lote ya escrito y lote que se solapa con el anterior
+    backend.write_rows(logs[100:200])
+    backend.write_rows(logs[150:300])
+
+    stats = asyncio.run(backend.stats())
+    assert stats['total_gestures'] == backend.query("SELECT COUNT(*) FROM gesture_logs")[0][0] == 300
+    assert stats['gesture_counts'] == _brute_force(logs, None, None, None)
+    asyncio.run(backend.close())
+
+
+def test_recent_logs_come_in_time_order(tmp_path):
+    logs = _logs(200)
+    backend = SqliteLogBackend(tmp_path / 'logs.db')
+    backend.write_rows(logs)
+
+    recent = asyncio.run(backend.recent('b', 20))
+    expected = sorted((log for log in logs if log['profile_id'] == 'b'), key=lambda log: log['timestamp'])[-20:]
+    assert [log['id'] for log in recent] == [log['id'] for log in expected]
+
+    plan = backend.query("EXPLAIN QUERY PLAN SELECT id FROM gesture_logs ORDER BY ts DESC LIMIT 20")
+    assert any('gesture_logs_ts' in row[-1] for row in plan)
+    asyncio.run(backend.close())
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from services.gesture_processor import GestureProcessor
+from services.gesture_stabilizer import GestureStabilizer
+
+
+def _feed(stabilizer, frames, start_ms=0.0, interval_ms=100.0):
+    """Alimenta (gesto, confianza) a intervalos regulares y devuelve el estado tras cada frame."""
+    return [stabilizer.update(gesture, confidence, start_ms + i * interval_ms)
+            for i, (gesture, confidence) in enumerate(frames)]
+
+
+def test_very_confident_gesture_confirmed_in_one_frame():
+    states = _feed(GestureStabilizer(), [('fist', 0.95), ('fist', 0.95)])
+
+    assert states == ['fist', 'fist']
+
+
+def test_confident_gesture_confirmed_in_two_frames():
+    states = _feed(GestureStabilizer(), [('fist', 0.8), ('fist', 0.8)])
+
+    assert states == [None, 'fist']
+    assert _feed(GestureStabilizer(confirm_confidence=1.1), [('fist', 0.95)] * 2) == [None, 'fist']
+
+
+def test_weak_gesture_needs_more_evidence():
+    states = _feed(GestureStabilizer(), [('pinch', 0.65)] * 3)
+
+    assert states == [None, None, 'pinch']
+
+
+def test_single_frame_flicker_does_not_switch():
+    frames = [('open_hand', 0.95)] * 4 + [('fist', 0.95)] + [('open_hand', 0.95)] * 2
+
+    states = _feed(GestureStabilizer(), frames, interval_ms=33.0)
+
+    assert states[1:] == ['open_hand'] * 6
+
+
+def test_switch_at_high_frame_rate_is_time_based():
+    frames = [('open_hand', 0.95)] * 10 + [('fist', 0.95)] * 3
+
+    states = _feed(GestureStabilizer(window_ms=200), frames, interval_ms=33.0)
+
+    # La ventana de 200 ms contiene 7 frames: con 3 seguros de 'fist' se alcanza la entrada
+    assert states[-2] == 'open_hand'
+    assert states[-1] == 'fist'
+
+
+def test_exit_after_unknown_frames():
+    stabilizer = GestureStabilizer()
+    states = _feed(stabilizer, [('fist', 0.95)] * 3 + [('unknown', 0.0)] * 3)
+
+    assert states[2] == 'fist'
+    assert states[-1] is None
+
+
+def test_running_sums_match_window():
+    rng = random.Random(1)
+    stabilizer = GestureStabilizer(window_ms=150)
+    history = []
+    now = 0.0
+    for _ in range(2000):
+        now += rng.uniform(5, 80)
+        gesture = rng.choice(['fist', 'pinch', 'unknown'])
+        confidence = 0.0 if gesture == 'unknown' else rng.uniform(0.6, 1.0)
+        stabilizer.update(gesture, confidence, now)
+        history.append((now, gesture, confidence))
+
+        window = history[-len(stabilizer):]
+        assert window[0][0] >= now - 150 or len(window) <= stabilizer.min_frames
+        for name in ('fist', 'pinch', 'unknown'):
+            expected = [c for _, g, c in window if g == name]
+            assert stabilizer.votes.get(name, 0) == len(expected)
+            assert stabilizer.confidence_sums.get(name, 0.0) == pytest.approx(sum(expected))
+
+
+def test_processor_reports_change_and_mean_confidence():
+    processor = GestureProcessor()
+    fist = {'gesture': 'fist', 'confidence': 0.85, 'action': 'left_click', 'details': {}}
+
+    first = processor.process(fist, timestamp=0.0)
+    second = processor.process(dict(fist, confidence=0.85), timestamp=0.1)
+    third = processor.process(fist, timestamp=0.2)
+
+    assert first['stable'] is False
+    assert second['stable'] and second['gesture_changed']
+    assert second['confidence'] == pytest.approx(0.85)
+    assert third['stable'] and not third['gesture_changed']
+    assert third['duration'] == pytest.approx(0.1)
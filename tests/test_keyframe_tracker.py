@@ -0,0 +1,97 @@
+import numpy as np
+
+from benchmarks.sample_frames import render_hand_image
+from benchmarks.synthetic_hands import canonical_hand, synthetic_sequence
+from services.hand_detector import HandDetector
+from services.landmarks import DetectedHands
+from services.keyframe_tracker import KeyframeTracker
+
+
+def _hands(hand, confidence=0.95):
+    return DetectedHands(hand.astype(np.float32)[None], ['Right'], [confidence])
+
+
+def _shifted(hand, dx):
+    return hand + [dx, 0.0, 0.0]
+
+
+def test_first_frame_is_keyframe_and_translation_is_tracked():
+    hand = canonical_hand('open_hand')
+    tracker = KeyframeTracker(max_interval=4)
+
+    assert tracker.propagate(render_hand_image(hand)) is None
+    tracker.keyframe(render_hand_image(hand), _hands(hand))
+
+    # Aún con intervalo 2 el segundo frame se propaga
+    moved = _shifted(hand, 0.01)
+    hands = tracker.propagate(render_hand_image(moved))
+    assert hands is not None
+    assert hands[0].handedness == 'Right'
+    np.testing.assert_allclose(hands.landmarks[0, :, 0].mean(), moved[:, 0].mean(), atol=0.005)
+    # z se conserva del frame clave
+    np.testing.assert_allclose(hands.landmarks[0, :, 2], hand[:, 2], atol=1e-6)
+    assert tracker.get_statistics()['tracked_frames'] == 1
+
+
+def test_interval_grows_while_propagation_matches_detection():
+    hand = canonical_hand('index_point')
+    tracker = KeyframeTracker(max_interval=3)
+    image = render_hand_image(hand)
+
+    detections = 0
+    for _ in range(20):
+        if tracker.propagate(image) is None:
+            detections += 1
+            tracker.keyframe(image, _hands(hand))
+
+    assert tracker.interval == 3
+    assert detections <= 8
+    assert tracker.get_statistics()['mean_drift'] < 0.01
+
+
+def test_no_hand_or_low_confidence_detects_every_frame():
+    hand = canonical_hand('fist')
+    image = render_hand_image(hand)
+    tracker = KeyframeTracker()
+
+    tracker.keyframe(image, None)
+    assert tracker.interval == 1
+    assert tracker.propagate(image) is None
+
+    tracker.keyframe(image, _hands(hand, confidence=0.5))
+    assert tracker.interval == 1
+    assert tracker.propagate(image) is None
+
+
+def test_fast_motion_forces_keyframe():
+    hand = canonical_hand('open_hand')
+    tracker = KeyframeTracker(max_interval=4, motion_threshold=0.05)
+    image = render_hand_image(hand)
+    for _ in range(6):
+        if tracker.propagate(image) is None:
+            tracker.keyframe(image, _hands(hand))
+    assert tracker.interval == 4
+
+    assert tracker.propagate(render_hand_image(_shifted(hand, 0.06))) is None
+    assert tracker.get_statistics()['forced_keyframes'] == 1
+    assert tracker.interval == 2
+
+
+def test_keyframes_match_every_frame_detection_with_mediapipe():
+    sequence = synthetic_sequence(60, seed=3)
+    detector = HandDetector(max_num_hands=1)
+    tracker = KeyframeTracker()
+
+    errors = []
+    for hand in sequence:
+        image = render_hand_image(hand)
+        hands = tracker.propagate(image)
+        if hands is None:
+            hands = detector.detect_landmarks(image)
+            tracker.keyframe(image, hands)
+        assert hands is not None
+        errors.append(np.abs(hands.landmarks[0, :, :2] - hand[:, :2]).mean())
+    detector.close()
+
+    assert tracker.get_statistics()['keyframes'] <= 40
+    assert np.mean(errors) < 0.03
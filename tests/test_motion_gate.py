@@ -0,0 +1,118 @@
+import numpy as np
+
+from benchmarks.bench_pipeline import DryRunController
+from benchmarks.sample_frames import render_hand_image
+from benchmarks.synthetic_hands import canonical_hand
+from services.gesture_classifier import GestureClassifier
+from services.gesture_pipeline import GesturePipeline
+from services.gesture_processor import GestureProcessor
+from services.landmarks import DetectedHands
+from services.motion_gate import MotionGate
+
+
+def _hands(gesture='open_hand'):
+    return DetectedHands(canonical_hand(gesture).astype(np.float32)[None], ['Right'], [0.95])
+
+
+def _empty_scene(passerby_x=None, seed=0):
+    """Fondo con ruido de sensor y, opcionalmente, una figura que pasa por detrás."""
+    rng = np.random.default_rng(seed)
+    frame = (40 + rng.integers(-2, 3, (480, 640, 3))).astype(np.uint8)
+    if passerby_x is not None:
+        frame[100:480, passerby_x:passerby_x + 120] = 160
+    return frame
+
+
+def test_unchanged_frames_reuse_the_last_detection():
+    gate = MotionGate(max_staleness_ms=1000)
+    still = render_hand_image(canonical_hand('open_hand'))
+    hands = _hands()
+
+    assert gate.should_detect(still, now=0.0)
+    gate.record(hands, now=0.0)
+    for i in range(1, 10):
+        assert not gate.should_detect(still.copy(), now=i * 0.033)
+    assert gate.hands is hands
+
+    moved = render_hand_image(canonical_hand('open_hand') + [0.1, 0.0, 0.0])
+    assert gate.should_detect(moved, now=0.4)
+    stats = gate.get_statistics()
+    assert stats['skipped_static'] == 9
+    assert abs(stats['skip_ratio'] - 9 / 11) < 1e-9
+
+
+def test_sensor_noise_is_not_motion():
+    gate = MotionGate()
+    gate.should_detect(_empty_scene(seed=0), now=0.0)
+    gate.record(None, now=0.0)
+
+    # El ruido por píxel se promedia en la miniatura
+    assert not gate.should_detect(_empty_scene(seed=1), now=0.033)
+    assert gate.should_detect(_empty_scene(passerby_x=300, seed=2), now=0.066)
+
+
+def test_slow_motion_accumulates_against_the_last_detected_frame():
+    gate = MotionGate(max_staleness_ms=10000)
+    hand = canonical_hand('open_hand')
+    gate.should_detect(render_hand_image(hand), now=0.0)
+    gate.record(_hands(), now=0.0)
+
+    decisions = [gate.should_detect(render_hand_image(hand + [0.002 * i, 0.0, 0.0]), now=i * 0.033)
+                 for i in range(1, 30)]
+
+    # Cada paso es imperceptible, pero la suma acaba forzando una detección
+    assert not decisions[0]
+    assert any(decisions)
+
+
+def test_max_staleness_bounds_reuse():
+    gate = MotionGate(max_staleness_ms=200)
+    still = render_hand_image(canonical_hand('thumbs_up'))
+    gate.should_detect(still, now=0.0)
+    gate.record(_hands('thumbs_up'), now=0.0)
+
+    assert not gate.should_detect(still, now=0.15)
+    assert gate.should_detect(still, now=0.2)
+    assert gate.get_statistics()['forced_stale'] == 1
+
+
+def test_empty_scene_falls_back_to_idle_probes_and_recovers():
+    gate = MotionGate(idle_after=3, idle_probe_ms=250, max_staleness_ms=1000)
+    now, detections = 0.0, []
+    for i in range(60):
+        # Escena vacía pero con movimiento en cada frame (alguien pasando por detrás)
+        frame = _empty_scene(passerby_x=8 * i, seed=i)
+        if gate.should_detect(frame, now=now):
+            detections.append(now)
+            gate.record(None, now=now)
+        now += 1 / 30
+
+    assert gate.idle
+    # Tres detecciones a la frecuencia del cliente y después una cada 250 ms
+    assert np.allclose(np.diff(detections[3:]), 0.2667, atol=0.01)
+    stats = gate.get_statistics()
+    assert stats['skipped_idle'] == 60 - len(detections)
+    assert stats['skip_ratio'] > 0.8
+
+    # La mano aparece: se detecta en el siguiente sondeo y se sale del modo
+    hand_frame = render_hand_image(canonical_hand('open_hand'))
+    while not gate.should_detect(hand_frame, now=now):
+        now += 1 / 30
+    assert now - detections[-1] <= 0.25 + 1 / 30
+    gate.record(_hands(), now=now)
+    assert not gate.idle
+
+
+def test_pipeline_skips_detection_on_static_frames(scripted_pool):
+    pool = scripted_pool([_hands('index_point')])
+    pipeline = GesturePipeline(pool, GestureClassifier(), GestureProcessor(), DryRunController(),
+                               motion_gate=MotionGate(max_staleness_ms=60000), include_timings=True)
+    frame = render_hand_image(canonical_hand('index_point'))
+
+    results = [pipeline.process_image(frame, frame_id) for frame_id in range(10)]
+
+    assert pool.calls == 1
+    assert all(r['hands_detected'] == 1 for r in results)
+    assert results[-1]['gesture'] == 'index_point' and results[-1]['stable']
+    assert 'gate' in results[-1]['timings'] and 'detect' not in results[-1]['timings']
+    assert pipeline.motion_gate.get_statistics()['skip_ratio'] == 0.9
@@ -0,0 +1,91 @@
+import numpy as np
+
+from benchmarks.bench_pipeline import DryRunController
+from benchmarks.synthetic_hands import canonical_hand
+from services.gesture_classifier import GestureClassifier
+from services.gesture_pipeline import GesturePipeline
+from services.gesture_processor import GestureProcessor
+from services.landmarks import DetectedHands
+from services.position_filters import ExponentialFilter
+from services.multi_hand import MultiHandProcessor, ZoomCombo
+
+
+def _hands(poses, handedness=('Right', 'Left')):
+    """Manos sintéticas desplazadas en X: [(gesto, desplazamiento), ...]."""
+    landmarks = np.stack([canonical_hand(gesture) + [dx, 0.0, 0.0] for gesture, dx in poses]).astype(np.float32)
+    return DetectedHands(landmarks, list(handedness[:len(poses)]), [0.9] * len(poses))
+
+
+def _pipeline(controller):
+    # EMA: la posición filtrada no depende del tiempo real entre llamadas
+    processor = GestureProcessor(position_filter=ExponentialFilter(0.5))
+    return GesturePipeline(None, GestureClassifier(), processor, controller,
+                           multi_hand=MultiHandProcessor(processor, ZoomCombo(step=0.15)))
+
+
+def test_each_hand_keeps_its_own_state():
+    classifier = GestureClassifier()
+    multi = MultiHandProcessor(GestureProcessor())
+    hands = _hands([('fist', -0.2), ('index_point', 0.2)])
+
+    for i in range(4):
+        tracked, combo = multi.process(hands, multi.classify(classifier, hands), timestamp=i * 0.033)
+
+    assert combo is None
+    assert {key: processed['gesture'] for key, _, processed in tracked} == {'Right': 'fist', 'Left': 'index_point'}
+    assert all(processed['stable'] for _, _, processed in tracked)
+    assert set(multi.processors) == {'Right', 'Left'}
+
+    # La primera mano vista sigue siendo la principal aunque cambie el orden
+    swapped = DetectedHands(hands.landmarks[::-1].copy(), ['Left', 'Right'], [0.9, 0.9])
+    tracked, _ = multi.process(swapped, multi.classify(classifier, swapped), timestamp=0.2)
+    assert tracked[0][0] == 'Right'
+    assert tracked[0][2]['gesture'] == 'fist'
+
+
+def test_batched_classification_matches_per_hand():
+    classifier = GestureClassifier()
+    hands = _hands([('pinch', -0.2), ('thumbs_up', 0.2)])
+
+    batched = MultiHandProcessor(GestureProcessor()).classify(classifier, hands)
+
+    assert batched == [classifier.classify(hand.landmarks) for hand in hands]
+
+
+def test_duplicate_handedness_gets_distinct_keys():
+    multi = MultiHandProcessor(GestureProcessor())
+    hands = _hands([('fist', -0.2), ('fist', 0.2)], handedness=('Right', 'Right'))
+
+    tracked, _ = multi.process(hands, multi.classify(GestureClassifier(), hands))
+
+    assert [key for key, _, _ in tracked] == ['Right', 'Left']
+
+
+def test_two_hand_pinch_zooms_instead_of_dragging():
+    controller = DryRunController()
+    pipeline = _pipeline(controller)
+    results = []
+    for spread in [0.2, 0.2, 0.2, 0.25, 0.3, 0.35, 0.1]:
+        hands = _hands([('pinch', -spread), ('pinch', spread)])
+        gesture_results = pipeline.multi_hand.classify(pipeline.classifier, hands)
+        results.append(pipeline._process_multi_hand(hands, gesture_results))
+
+    # Las pinzas (confianza 0.95) se confirman en el primer frame y el combo empieza en él
+    assert results[0]['combo'] == results[1]['combo'] == {'gesture': 'zoom', 'scale': 1.0, 'direction': None}
+    assert results[5]['combo']['scale'] > 1.5
+    assert [r['combo']['direction'] for r in results[3:]] == [None, 'in', 'in', 'out']
+    assert controller.actions == {'zoom': 3}
+    assert results[-1]['hands'][0] == {'handedness': 'Right', 'gesture': 'pinch', 'confidence': 0.95, 'stable': True}
+
+
+def test_single_hand_dispatches_its_action():
+    controller = DryRunController()
+    pipeline = _pipeline(controller)
+    for _ in range(3):
+        hands = _hands([('index_point', 0.0)])
+        result = pipeline._process_multi_hand(hands, pipeline.multi_hand.classify(pipeline.classifier, hands))
+
+    assert result['gesture'] == 'index_point'
+    assert result['hands_detected'] == 1
+    assert 'combo' not in result
+    assert controller.actions['move_cursor'] >= 1
@@ -0,0 +1,31 @@
+import numpy as np
+
+from services.landmarks import DetectedHands
+from services.overlay_renderer import OverlayRenderer
+
+
+def _hands():
+    landmarks = np.zeros((1, 21, 3), dtype=np.float32)
+    landmarks[0, :, 0] = 0.3 + 0.02 * np.arange(21)
+    landmarks[0, :, 1] = 0.6 - 0.02 * np.arange(21)
+    return DetectedHands(landmarks, ['Right'], [0.9])
+
+
+def test_draw_does_not_modify_input():
+    image = np.zeros((120, 160, 3), dtype=np.uint8)
+
+    annotated = OverlayRenderer().draw(image, _hands())
+
+    assert not image.any()
+    assert annotated.any()
+
+
+def test_rate_limited_data_url():
+    renderer = OverlayRenderer(max_fps=1)
+    image = np.zeros((120, 160, 3), dtype=np.uint8)
+
+    assert renderer.due()
+    data_url = renderer.render_data_url(image, None)
+
+    assert data_url.startswith('data:image/jpeg;base64,')
+    assert not renderer.due()
@@ -0,0 +1,51 @@
+from services.pipeline_metrics import LatencyHistogram, StageMetrics, StageTimer, render_prometheus
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = LatencyHistogram(buckets=(0.001, 0.01, 0.1))
+    for seconds in (0.0005, 0.001, 0.005, 0.05, 1.0):
+        histogram.observe(seconds)
+
+    # Los límites son inclusivos (le), como en Prometheus
+    assert histogram.cumulative_counts() == [2, 3, 4, 5]
+    assert histogram.count == 5
+    assert abs(histogram.sum - 1.0565) < 1e-12
+
+
+def test_histogram_quantile_interpolates_within_bucket():
+    histogram = LatencyHistogram(buckets=(0.01, 0.02))
+    for _ in range(10):
+        histogram.observe(0.015)
+
+    assert histogram.quantile(0.5) == 0.015
+    assert LatencyHistogram().quantile(0.5) is None
+
+
+def test_stage_timer_marks_consecutive_stages():
+    timer = StageTimer()
+    timer.mark('decode')
+    timer.mark('detect')
+    durations = timer.finish()
+
+    assert list(durations) == ['decode', 'detect', 'total']
+    assert durations['total'] >= durations['decode'] + durations['detect']
+
+
+def test_prometheus_exposition():
+    global_metrics = StageMetrics()
+    session_metrics = StageMetrics()
+    for metrics in (global_metrics, session_metrics):
+        metrics.observe({'detect': 0.02, 'total': 0.03, 'unknown_stage': 1.0})
+
+    text = render_prometheus(global_metrics, [({'session': 'abc'}, session_metrics)], [
+        ('gesture_frames_dropped_total', 'counter', 'Descartados', 3, {'reason': 'stale'}),
+        ('gesture_frames_dropped_total', 'counter', 'Descartados', 1, {'reason': 'superseded'}),
+    ])
+    lines = text.splitlines()
+
+    assert 'gesture_stage_duration_seconds_bucket{stage="detect",le="0.025"} 1' in lines
+    assert 'gesture_stage_duration_seconds_bucket{stage="detect",le="+Inf"} 1' in lines
+    assert 'gesture_session_stage_duration_seconds_count{session="abc",stage="total"} 1' in lines
+    assert 'gesture_frames_dropped_total{reason="stale"} 3' in lines
+    assert lines.count('# TYPE gesture_frames_dropped_total counter') == 1
+    assert 'unknown_stage' not in text
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from models.profile import GestureSettings
+from services.gesture_processor import GestureProcessor
+from services.position_filters import (ExponentialFilter, KalmanFilter, OneEuroFilter, PositionFilter,
+                                       create_position_filter, filter_from_settings)
+
+
+def _run(position_filter, positions, fps=15.0):
+    return np.array([position_filter.update((float(x), float(y)), i / fps) for i, (x, y) in enumerate(positions)])
+
+
+def _still(frames=45, noise=0.003, seed=0):
+    return 0.5 + np.random.default_rng(seed).normal(0.0, noise, (frames, 2))
+
+
+def _ramp(frames=45, speed=0.5, fps=15.0):
+    t = np.arange(frames) / fps
+    return np.stack([0.2 + speed * t, np.full(frames, 0.5)], axis=1)
+
+
+def test_exponential_matches_original_smoothing():
+    position_filter = ExponentialFilter(0.3)
+    assert position_filter.update((1.0, 0.0), 0.0) == (1.0, 0.0)
+    x, y = position_filter.update((0.0, 1.0), 0.1)
+    assert x == pytest.approx(0.7)
+    assert y == pytest.approx(0.3)
+
+
+def test_one_euro_reduces_jitter_and_lags_less_than_ema():
+    still = _still()
+    raw_jitter = still[15:, 0].std()
+    assert _run(OneEuroFilter(), still)[15:, 0].std() < 0.6 * raw_jitter
+
+    ramp = _ramp()
+    ema_lag = np.abs(_run(ExponentialFilter(0.5), ramp) - ramp)[15:, 0].mean()
+    euro_lag = np.abs(_run(OneEuroFilter(), ramp) - ramp)[15:, 0].mean()
+    assert euro_lag < 0.5 * ema_lag
+
+
+def test_kalman_predicts_constant_velocity():
+    ramp = _ramp(speed=0.5)
+    out = _run(KalmanFilter(prediction_ms=100), ramp)
+    # Tras converger, la salida va 100 ms por delante de la medida
+    np.testing.assert_allclose(out[-10:, 0], ramp[-10:, 0] + 0.05, atol=2e-3)
+    np.testing.assert_allclose(out[-10:, 1], 0.5, atol=1e-6)
+
+    without_prediction = _run(KalmanFilter(prediction_ms=0), ramp)
+    np.testing.assert_allclose(without_prediction[-10:, 0], ramp[-10:, 0], atol=2e-3)
+
+
+def test_repeated_timestamp_and_long_gap():
+    position_filter = KalmanFilter(max_dt=0.5)
+    position_filter.update((0.2, 0.2), 0.0)
+    assert position_filter.update((0.9, 0.9), 0.0) == pytest.approx((0.2, 0.2))
+    # Tras una pausa larga se reinicia en la posición medida
+    assert position_filter.update((0.8, 0.1), 2.0) == (0.8, 0.1)
+
+    euro = OneEuroFilter()
+    euro.update((0.2, 0.2), 1.0)
+    assert euro.update((0.9, 0.9), 1.0) == (0.2, 0.2)
+
+
+def test_factories():
+    assert isinstance(create_position_filter('kalman', prediction_ms=10), KalmanFilter)
+    with pytest.raises(ValueError):
+        create_position_filter('median')
+
+    assert isinstance(filter_from_settings(None), OneEuroFilter)
+    settings = GestureSettings(position_filter='kalman', filter_prediction_ms=50).model_dump()
+    position_filter = filter_from_settings(settings)
+    assert isinstance(position_filter, KalmanFilter)
+    assert position_filter.prediction_ms == 50
+    ema = filter_from_settings({'position_filter': 'ema', 'smoothing_factor': 0.2})
+    assert ema.smoothing_factor == 0.2
+
+
+def test_incomplete_filter_cannot_be_instantiated():
+    class UpdateOnly(PositionFilter):
+        def update(self, position, timestamp):
+            return position
+
+    with pytest.raises(TypeError):
+        UpdateOnly()
+
+
+def _cursor(x, confidence=0.9):
+    return {'gesture': 'index_point', 'action': 'move_cursor', 'confidence': confidence,
+            'details': {'cursor_x': x, 'cursor_y': 0.5}}
+
+
+def test_processor_filters_only_fresh_positions():
+    processor = GestureProcessor(position_filter=KalmanFilter(prediction_ms=0))
+    for i in range(5):
+        result = processor.process(_cursor(0.1 + 0.01 * i), timestamp=i / 30)
+    assert result['stable']
+    last = result['details']['cursor_x']
+
+    # Un frame de otro gesto mantiene el cursor sin alimentar el filtro
+    other = processor.process({'gesture': 'unknown', 'action': 'none', 'confidence': 0.0, 'details': {}},
+                              timestamp=5 / 30)
+    assert other['details']['cursor_x'] == last
+    assert processor.position_filters['pinch'].state is None
@@ -0,0 +1,107 @@
+import asyncio
+from types import SimpleNamespace
+
+from services.profile_cache import ProfileCache
+
+
+class FakeProfiles:
+    """Colección mínima con la interfaz asíncrona de Motor usada por la caché."""
+
+    def __init__(self, profiles, delay=0.0):
+        self.profiles = {p['id']: dict(p) for p in profiles}
+        self.delay = delay
+        self.calls = {'find_one': 0, 'find_one_and_update': 0, 'delete_one': 0}
+
+    async def find_one(self, query, projection=None):
+        self.calls['find_one'] += 1
+        await asyncio.sleep(self.delay)
+        profile = self.profiles.get(query['id'])
+        return dict(profile) if profile else None
+
+    async def find_one_and_update(self, query, update, projection=None, return_document=False):
+        self.calls['find_one_and_update'] += 1
+        profile = self.profiles.get(query['id'])
+        if profile is None:
+            return None
+        profile.update(update['$set'])
+        return dict(profile)
+
+    async def delete_one(self, query):
+        self.calls['delete_one'] += 1
+        return SimpleNamespace(deleted_count=1 if self.profiles.pop(query['id'], None) else 0)
+
+
+def _profile(profile_id, fist=0.9):
+    return {'id': profile_id, 'name': profile_id, 'created_at': '2026-01-05T10:00:00+00:00',
+            'gesture_settings': {'fist_threshold': fist, 'position_filter': 'kalman'}}
+
+
+def test_reconnect_storm_loads_once_with_prebuilt_thresholds():
+    async def scenario():
+        profiles = FakeProfiles([_profile('p1')], delay=0.01)
+        cache = ProfileCache(profiles)
+        entries = await asyncio.gather(*(cache.get('p1') for _ in range(50)))
+        return profiles, cache, entries
+
+    profiles, cache, entries = asyncio.run(scenario())
+    assert profiles.calls['find_one'] == 1
+    entry = entries[0]
+    assert all(e is entry for e in entries)
+    assert entry.thresholds['fist'] == 0.9
+    assert entry.thresholds['pinch'] == 0.65
+    assert entry.settings['position_filter'] == 'kalman'
+    assert entry.profile['created_at'].year == 2026
+
+
+def test_ttl_lru_and_negative_entries():
+    async def scenario():
+        profiles = FakeProfiles([_profile(f"p{i}") for i in range(3)])
+        cache = ProfileCache(profiles, ttl=0.05, max_entries=2)
+        await cache.get('p0')
+        await cache.get('p1')
+        await cache.get('p0')          # p0 pasa a ser el más reciente
+        await cache.get('p2')          # expulsa p1
+        assert cache.evictions == 1
+        await cache.get('p0')
+        assert profiles.calls['find_one'] == 3
+
+        assert await cache.get('missing') is None
+        assert await cache.get('missing') is None
+        assert profiles.calls['find_one'] == 4
+
+        await asyncio.sleep(0.06)
+        await cache.get('p0')
+        return profiles
+
+    profiles = asyncio.run(scenario())
+    assert profiles.calls['find_one'] == 5
+
+
+def test_update_and_delete_write_through():
+    async def scenario():
+        profiles = FakeProfiles([_profile('p1')])
+        cache = ProfileCache(profiles)
+        await cache.get('p1')
+
+        entry = await cache.update('p1', {'gesture_settings': {'fist_threshold': 0.7},
+                                          'updated_at': '2026-02-01T00:00:00+00:00'})
+        assert entry.thresholds['fist'] == 0.7
+        assert (await cache.get('p1')) is entry
+        assert await cache.update('missing', {'name': 'x'}) is None
+
+        assert await cache.delete('p1')
+        assert await cache.get('p1') is None
+        assert not await cache.delete('p1')
+        return profiles
+
+    profiles = asyncio.run(scenario())
+    assert profiles.calls['find_one'] == 1
+    assert profiles.calls['find_one_and_update'] == 2
+
+
+def test_without_store_no_profile_exists():
+    async def scenario():
+        cache = ProfileCache(None)
+        return await cache.get('p1'), await cache.update('p1', {}), await cache.delete('p1')
+
+    assert asyncio.run(scenario()) == (None, None, False)
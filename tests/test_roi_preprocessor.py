@@ -0,0 +1,87 @@
+import numpy as np
+
+from benchmarks.sample_frames import render_hand_image
+from benchmarks.synthetic_hands import canonical_hand, synthetic_sequence
+from services.hand_detector import HandDetector
+from services.landmarks import DetectedHands
+from services.roi_preprocessor import RoiPreprocessor
+
+WIDTH, HEIGHT = 1280, 720
+
+
+class FakeDetector:
+    """Devuelve una mano fija (coordenadas del frame) expresada respecto a la imagen recibida."""
+
+    def __init__(self, hand, roi_source):
+        self.hand = hand
+        self.roi_source = roi_source
+        self.inputs = []
+        self.fail_crops = False
+
+    def detect_landmarks(self, image):
+        self.inputs.append(image.shape[:2])
+        roi = self.roi_source.roi
+        landmarks = self.hand.astype(np.float32).copy()
+        if image.shape[:2] != (HEIGHT, WIDTH) and roi and image.shape[:2] == (roi[3] - roi[1], roi[2] - roi[0]):
+            if self.fail_crops:
+                return None
+            x0, y0, x1, y1 = roi
+            landmarks[:, 0] = (landmarks[:, 0] * WIDTH - x0) / (x1 - x0)
+            landmarks[:, 1] = (landmarks[:, 1] * HEIGHT - y0) / (y1 - y0)
+            landmarks[:, 2] *= WIDTH / (x1 - x0)
+        return DetectedHands(landmarks[None], ['Right'], [0.9])
+
+
+def _small_hand():
+    # Mano pequeña en el frame para que el recorte compense
+    return (canonical_hand('open_hand') - [0.5, 0.6, 0.0]) * [0.4, 0.4, 1.0] + [0.6, 0.5, 0.0]
+
+
+def test_search_then_crop_maps_back_to_frame():
+    hand = _small_hand()
+    preprocessor = RoiPreprocessor(search_size=480)
+    detector = FakeDetector(hand, preprocessor)
+    image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+
+    first = preprocessor.detect(detector, image)
+    assert detector.inputs[0] == (270, 480)
+    np.testing.assert_allclose(first.landmarks[0], hand, atol=1e-6)
+    assert preprocessor.roi is not None
+
+    second = preprocessor.detect(detector, image)
+    x0, y0, x1, y1 = preprocessor.roi
+    assert detector.inputs[1] == (y1 - y0, x1 - x0)
+    np.testing.assert_allclose(second.landmarks[0], hand, atol=1e-5)
+    # Los registros por mano son vistas del mismo bloque
+    np.testing.assert_allclose(second[0].landmarks, hand, atol=1e-5)
+    assert preprocessor.get_statistics()['roi_frames'] == 1
+
+
+def test_lost_hand_in_crop_falls_back_to_search():
+    preprocessor = RoiPreprocessor(search_size=480)
+    detector = FakeDetector(_small_hand(), preprocessor)
+    image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    preprocessor.detect(detector, image)
+
+    detector.fail_crops = True
+    hands = preprocessor.detect(detector, image)
+
+    assert hands is not None
+    assert detector.inputs[-1] == (270, 480)
+    assert preprocessor.get_statistics()['fallbacks'] == 1
+
+
+def test_crop_matches_ground_truth_with_mediapipe():
+    sequence = synthetic_sequence(30, seed=5)
+    detector = HandDetector(max_num_hands=1)
+    preprocessor = RoiPreprocessor(padding=0.3, max_crop_ratio=1.0)
+
+    errors = []
+    for hand in sequence:
+        hands = preprocessor.detect(detector, render_hand_image(hand, 1920, 1080))
+        assert hands is not None
+        errors.append(np.abs(hands.landmarks[0, :, :2] - hand[:, :2]).mean())
+    detector.close()
+
+    assert preprocessor.get_statistics()['roi_frames'] >= 25
+    assert np.mean(errors) < 0.03
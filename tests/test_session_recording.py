@@ -0,0 +1,61 @@
+import numpy as np
+
+from benchmarks.synthetic_hands import synthetic_sequence
+from services.gesture_classifier import GestureClassifier
+from services.landmarks import DetectedHands
+from services.session_recording import SessionRecorder, SessionRecording, replay
+
+
+def _record(path, hands, flush_every=16):
+    """Graba una secuencia con huecos sin mano cada 10 frames."""
+    classifier = GestureClassifier()
+    with SessionRecorder(path, flush_every=flush_every, metadata={'profile_id': 'p1'}) as recorder:
+        for i, hand in enumerate(hands):
+            detected = None if i % 10 == 9 else DetectedHands(hand[None].astype(np.float32), ['Right'], [0.9])
+            result = classifier.classify(detected[0].landmarks) if detected else None
+            recorder.record(1000.0 + i * 33.3, i, detected, result)
+
+
+def test_round_trip(tmp_path):
+    hands = synthetic_sequence(100, seed=2)
+    path = tmp_path / 'session.gesrec'
+    _record(path, hands)
+
+    recording = SessionRecording(path)
+
+    assert len(recording) == 100
+    assert recording.metadata == {'profile_id': 'p1'}
+    assert isinstance(recording.landmarks, np.memmap)
+    assert recording.frame_id.tolist() == list(range(100))
+    assert recording.num_hands[9] == 0 and recording.handedness[9, 0] == -1
+    np.testing.assert_array_equal(recording.landmarks[0, 0], hands[0].astype(np.float32))
+    assert np.isnan(recording.landmarks[0, 1]).all()
+
+    detected = recording.hands(0)
+    assert detected[0].handedness == 'Right'
+    assert recording.hands(9) is None
+
+
+def test_unclosed_recording_is_readable(tmp_path):
+    path = tmp_path / 'partial.gesrec'
+    recorder = SessionRecorder(path, flush_every=8)
+    for i in range(20):
+        recorder.record(float(i), i, None, None)
+
+    # Solo los bloques completos llegaron a disco
+    assert len(SessionRecording(path)) == 16
+    recorder.close()
+    assert len(SessionRecording(path)) == 20
+
+
+def test_replay_matches_recorded_classification(tmp_path):
+    path = tmp_path / 'session.gesrec'
+    _record(path, synthetic_sequence(200, seed=4))
+
+    frames = list(replay(SessionRecording(path)))
+
+    assert len(frames) == 200
+    with_hands = [f for f in frames if f['classification']]
+    assert len(with_hands) == 180
+    assert all(f['classification']['gesture'] == f['recorded_gesture'] for f in with_hands)
+    assert any(f['processed']['stable'] for f in with_hands)
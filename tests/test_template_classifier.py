@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_hands import GESTURE_NAMES, canonical_hand
+from services.gesture_classifier import GestureClassifier
+from services.template_classifier import (
+    TemplateClassifier,
+    TemplateIndex,
+    TemplateLibrary,
+    normalize_landmarks,
+)
+
+
+def _victory():
+    """Índice y medio extendidos: un gesto que las reglas no conocen."""
+    hand = canonical_hand('index_point')
+    hand[9:13] = canonical_hand('open_hand')[9:13]
+    return hand
+
+
+def _samples(hand, count, seed=0, noise=0.004):
+    rng = np.random.default_rng(seed)
+    return hand + rng.normal(0.0, noise, (count,) + hand.shape)
+
+
+def _rotate(hand, angle, scale=1.0, shift=(0.0, 0.0)):
+    cos, sin = np.cos(angle), np.sin(angle)
+    rotated = hand.copy()
+    centered = hand[:, :2] - hand[0, :2]
+    rotated[:, 0] = hand[0, 0] + scale * (cos * centered[:, 0] - sin * centered[:, 1]) + shift[0]
+    rotated[:, 1] = hand[0, 1] + scale * (sin * centered[:, 0] + cos * centered[:, 1]) + shift[1]
+    rotated[:, 2] = hand[:, 2] * scale
+    return rotated
+
+
+def _calibrated_index(per_gesture=20):
+    index = TemplateIndex(capacity=4)
+    index.add('victory', _samples(_victory(), per_gesture), action='right_click')
+    for i, gesture in enumerate(GESTURE_NAMES):
+        index.add(gesture, _samples(canonical_hand(gesture), per_gesture, seed=i + 1))
+    return index
+
+
+def test_normalization_ignores_position_size_and_roll():
+    hand = canonical_hand('thumbs_up')
+    moved = _rotate(hand, 0.6, scale=1.4, shift=(0.1, -0.2))
+
+    assert np.allclose(normalize_landmarks(moved), normalize_landmarks(hand), atol=1e-5)
+    batch = normalize_landmarks(np.stack([hand, moved]))
+    assert batch.shape == (2, 63)
+    # La palma queda vertical con longitud 1
+    palm = normalize_landmarks(hand).reshape(21, 3)[GestureClassifier.MIDDLE_FINGER_MCP]
+    assert np.allclose(palm[:2], (0.0, -1.0), atol=1e-6)
+
+
+def test_classifies_calibrated_gestures_with_their_actions():
+    classifier = TemplateClassifier(_calibrated_index(), GestureClassifier())
+
+    result = classifier.classify(_rotate(_victory(), -0.4, scale=0.8))
+    assert result['gesture'] == 'victory'
+    assert result['action'] == 'right_click'
+    assert result['confidence'] > 0.5
+
+    result = classifier.classify(canonical_hand('index_point'))
+    assert (result['gesture'], result['action']) == ('index_point', 'move_cursor')
+    assert result['details']['cursor_x'] == canonical_hand('index_point')[8, 0]
+
+
+def test_samples_added_later_are_used_without_rebuilding():
+    index = TemplateIndex(capacity=2)
+    classifier = TemplateClassifier(index, fallback=None)
+    assert classifier.classify(_victory())['gesture'] == 'unknown'
+
+    index.add('open_hand', _samples(canonical_hand('open_hand'), 5))
+    snapshot = index._snapshot
+    assert classifier.classify(_victory())['gesture'] == 'unknown'
+
+    index.add('victory', _samples(_victory(), 5), action='left_click')
+    assert classifier.classify(_victory())['gesture'] == 'victory'
+    assert index.sample_counts() == {'open_hand': 5, 'victory': 5}
+    # La instantánea anterior sigue intacta para quien la estuviera usando
+    assert len(snapshot[0]) == 5 and (snapshot[2] == 0).all()
+
+
+def test_hands_far_from_every_template_fall_back_to_rules():
+    index = TemplateIndex()
+    index.add('victory', _samples(_victory(), 10))
+    classifier = TemplateClassifier(index, GestureClassifier())
+
+    hands = np.stack([_victory(), canonical_hand('open_hand'), canonical_hand('thumbs_up')])
+    batch = classifier.classify_batch(hands)
+    results = [classifier.batch_result(batch, i) for i in range(len(hands))]
+
+    assert [r['gesture'] for r in results] == ['victory', 'open_hand', 'thumbs_up']
+    assert results[1] == GestureClassifier().classify(hands[1])
+    assert [classifier.classify(hand)['gesture'] for hand in hands] == [r['gesture'] for r in results]
+
+
+def test_frame_cost_with_hundreds_of_templates():
+    classifier = TemplateClassifier(_calibrated_index(per_gesture=100), GestureClassifier())
+    assert len(classifier.index) == 600
+    hand = canonical_hand('pinch')
+    classifier.classify(hand)
+
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = classifier.classify(hand)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / runs
+
+    assert result['gesture'] == 'pinch'
+    assert elapsed_ms < 1.0
+
+
+def test_library_persists_samples_and_reloads_index():
+    class FakeCalibrations:
+        def __init__(self):
+            self.docs = {}
+
+        async def update_one(self, query, update, upsert=False):
+            self.docs[(query['profile_id'], query['gesture_name'])] = dict(update['$set'])
+
+        async def find(self, query, projection=None):
+            for (profile_id, _), doc in list(self.docs.items()):
+                if profile_id == query['profile_id']:
+                    yield dict(doc)
+
+    async def scenario():
+        collection = FakeCalibrations()
+        library = TemplateLibrary(collection)
+        index = await library.get('p1')
+        await library.add_samples('p1', 'victory', _samples(_victory(), 3).tolist(), 'left_click', 0.9)
+        summary = await library.add_samples('p1', 'victory', _samples(_victory(), 2, seed=5).tolist(), confidence=0.8)
+
+        reloaded = await TemplateLibrary(collection).get('p1')
+        return index, summary, reloaded, await library.calibrations('p1')
+
+    index, summary, reloaded, calibrations = asyncio.run(scenario())
+    assert len(index) == 5
+    assert summary['sample_count'] == 5
+    assert abs(summary['average_confidence'] - 0.86) < 1e-9
+    assert summary['calibration_data'] == {'action': 'left_click'}
+    assert reloaded.sample_counts() == {'victory': 5}
+    assert reloaded.actions == {'victory': 'left_click'}
+    assert [c['gesture_name'] for c in calibrations] == ['victory']